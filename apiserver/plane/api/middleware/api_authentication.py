@@ -1,13 +1,23 @@
+# Python imports
+import json
+
 # Django imports
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 
 # Third party imports
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
+from sentry_sdk import capture_exception
 
 # Module imports
-from plane.db.models import APIToken
+from plane.db.models import APIToken, User
+from plane.db.models.api import API_TOKEN_LAST_USED_KEY, api_token_cache_key
+from plane.settings.redis import redis_instance
+
+# Token lookups are cached briefly, revoking or editing a token drops the
+# cached entry right away
+API_TOKEN_CACHE_TIMEOUT = 60
 
 
 class APIKeyAuthentication(authentication.BaseAuthentication):
@@ -22,23 +32,89 @@ class APIKeyAuthentication(authentication.BaseAuthentication):
     def get_api_token(self, request):
         return request.headers.get(self.auth_header_name)
 
-    def validate_api_token(self, token):
+    def get_token_details(self, token):
+        """Token id, user id, active flag and expiry of a token"""
+        key = api_token_cache_key(token)
+        ri = None
         try:
-            api_token = APIToken.objects.get(
-                Q(
-                    Q(expired_at__gt=timezone.now())
-                    | Q(expired_at__isnull=True)
-                ),
-                token=token,
-                is_active=True,
+            ri = redis_instance()
+            cached = ri.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            capture_exception(e)
+
+        api_token = (
+            APIToken.objects.filter(token=token)
+            .values(
+                "id",
+                "user_id",
+                "workspace_id",
+                "is_active",
+                "expired_at",
+                "rate_limit",
+                "workspace_rate_limit",
             )
-        except APIToken.DoesNotExist:
+            .first()
+        )
+        if api_token is None:
+            return None
+
+        details = {
+            "id": str(api_token["id"]),
+            "user_id": str(api_token["user_id"]),
+            "workspace_id": (
+                str(api_token["workspace_id"])
+                if api_token["workspace_id"]
+                else None
+            ),
+            "is_active": api_token["is_active"],
+            "expired_at": (
+                api_token["expired_at"].isoformat()
+                if api_token["expired_at"]
+                else None
+            ),
+            "rate_limit": api_token["rate_limit"],
+            "workspace_rate_limit": api_token["workspace_rate_limit"],
+        }
+        if ri is not None:
+            try:
+                ri.set(key, json.dumps(details), ex=API_TOKEN_CACHE_TIMEOUT)
+            except Exception as e:
+                capture_exception(e)
+        return details
+
+    def record_last_used(self, details, now):
+        """Defer the last used write to the periodic flush"""
+        try:
+            redis_instance().hset(
+                API_TOKEN_LAST_USED_KEY, details["id"], now.isoformat()
+            )
+        except Exception as e:
+            capture_exception(e)
+            APIToken.objects.filter(pk=details["id"]).update(last_used=now)
+
+    def validate_api_token(self, token):
+        details = self.get_token_details(token)
+        now = timezone.now()
+        if (
+            details is None
+            or not details["is_active"]
+            or (
+                details["expired_at"] is not None
+                and parse_datetime(details["expired_at"]) <= now
+            )
+        ):
+            raise AuthenticationFailed("Given API token is not valid")
+
+        try:
+            user = User.objects.get(pk=details["user_id"])
+        except User.DoesNotExist:
             raise AuthenticationFailed("Given API token is not valid")
 
         # save api token last used
-        api_token.last_used = timezone.now()
-        api_token.save(update_fields=["last_used"])
-        return (api_token.user, api_token.token)
+        self.record_last_used(details, now)
+        return (user, token, details)
 
     def authenticate(self, request):
         token = self.get_api_token(request=request)
@@ -46,5 +122,7 @@ class APIKeyAuthentication(authentication.BaseAuthentication):
             return None
 
         # Validate the API token
-        user, token = self.validate_api_token(token)
+        user, token, details = self.validate_api_token(token)
+        # Rate limits of the token are read by the api key throttle
+        request.api_token = details
         return user, token
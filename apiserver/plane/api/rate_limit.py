@@ -1,9 +1,61 @@
-from rest_framework.throttling import SimpleRateThrottle
+# Python imports
+import hashlib
+import time
 
+# Django imports
+from django.conf import settings
 
-class ApiKeyRateThrottle(SimpleRateThrottle):
+# Third party imports
+from rest_framework.throttling import BaseThrottle
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.settings.redis import redis_instance
+
+# Sliding window counter over the current and the previous fixed windows,
+# checked and incremented atomically for the token and its workspace
+#
+# KEYS: token current, token previous, workspace current, workspace previous
+# ARGV: token limit, workspace limit (0 to skip), previous window weight,
+#       key expiry
+# Returns: allowed, remaining requests, limit that was closest to exhaustion
+SLIDING_WINDOW_SCRIPT = """
+local weight = tonumber(ARGV[3])
+local function used(current, previous)
+    return tonumber(redis.call("GET", current) or "0")
+        + tonumber(redis.call("GET", previous) or "0") * weight
+end
+
+local token_limit = tonumber(ARGV[1])
+local workspace_limit = tonumber(ARGV[2])
+local remaining = token_limit - used(KEYS[1], KEYS[2])
+local limit = token_limit
+if workspace_limit > 0 then
+    local workspace_remaining = workspace_limit - used(KEYS[3], KEYS[4])
+    if workspace_remaining < remaining then
+        remaining = workspace_remaining
+        limit = workspace_limit
+    end
+end
+
+if remaining < 1 then
+    return {0, 0, limit}
+end
+
+redis.call("INCR", KEYS[1])
+redis.call("EXPIRE", KEYS[1], ARGV[4])
+if workspace_limit > 0 then
+    redis.call("INCR", KEYS[3])
+    redis.call("EXPIRE", KEYS[3], ARGV[4])
+end
+return {1, math.floor(remaining - 1), limit}
+"""
+
+
+class ApiKeyRateThrottle(BaseThrottle):
     scope = "api_key"
-    rate = "60/minute"
+    duration = 60
+    script = None
 
     def get_cache_key(self, request, view):
         # Retrieve the API key from the request header
@@ -11,32 +63,58 @@ class ApiKeyRateThrottle(SimpleRateThrottle):
         if not api_key:
             return None  # Allow the request if there's no API key
 
-        # Use the API key as part of the cache key
-        return f"{self.scope}:{api_key}"
+        # Use the hashed API key as part of the cache key
+        return f"{self.scope}:{hashlib.sha256(api_key.encode()).hexdigest()}"
 
-    def allow_request(self, request, view):
-        allowed = super().allow_request(request, view)
+    def get_script(self):
+        # Registered once per process, executed with EVALSHA afterwards
+        if ApiKeyRateThrottle.script is None:
+            ApiKeyRateThrottle.script = redis_instance().register_script(
+                SLIDING_WINDOW_SCRIPT
+            )
+        return ApiKeyRateThrottle.script
 
-        if allowed:
-            now = self.timer()
-            # Calculate the remaining limit and reset time
-            history = self.cache.get(self.key, [])
-
-            # Remove old histories
-            while history and history[-1] <= now - self.duration:
-                history.pop()
+    def allow_request(self, request, view):
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
 
-            # Calculate the requests
-            num_requests = len(history)
+        details = getattr(request, "api_token", None) or {}
+        token_limit = details.get("rate_limit") or settings.API_KEY_RATE_LIMIT
+        workspace_limit = (
+            details.get("workspace_rate_limit")
+            or settings.API_KEY_WORKSPACE_RATE_LIMIT
+        )
+        workspace_key = f"{self.scope}:workspace:{details.get('workspace_id')}"
+        if not details.get("workspace_id"):
+            workspace_limit = 0
 
-            # Check available requests
-            available = self.num_requests - num_requests
+        now = time.time()
+        window = int(now // self.duration)
+        weight = 1 - (now % self.duration) / self.duration
+        # Unix timestamp for when the current window ends
+        self.reset_time = (window + 1) * self.duration
 
-            # Unix timestamp for when the rate limit will reset
-            reset_time = int(now + self.duration)
+        try:
+            allowed, remaining, limit = self.get_script()(
+                keys=[
+                    f"{key}:{window}",
+                    f"{key}:{window - 1}",
+                    f"{workspace_key}:{window}",
+                    f"{workspace_key}:{window - 1}",
+                ],
+                args=[token_limit, workspace_limit, weight, self.duration * 2],
+            )
+        except Exception as e:
+            # Do not reject requests while redis is unavailable
+            capture_exception(e)
+            return True
 
-            # Add headers
-            request.META["X-RateLimit-Remaining"] = max(0, available)
-            request.META["X-RateLimit-Reset"] = reset_time
+        # Add headers
+        request.META["X-RateLimit-Limit"] = limit
+        request.META["X-RateLimit-Remaining"] = max(0, remaining)
+        request.META["X-RateLimit-Reset"] = self.reset_time
+        return bool(allowed)
 
-        return allowed
+    def wait(self):
+        return max(self.reset_time - time.time(), 0)
@@ -154,6 +154,10 @@ class BaseAPIView(TimezoneMixin, APIView, BasePaginator):
         )
 
         # Add custom headers if they exist in the request META
+        ratelimit_limit = request.META.get("X-RateLimit-Limit")
+        if ratelimit_limit is not None:
+            response["X-RateLimit-Limit"] = ratelimit_limit
+
         ratelimit_remaining = request.META.get("X-RateLimit-Remaining")
         if ratelimit_remaining is not None:
             response["X-RateLimit-Remaining"] = ratelimit_remaining
@@ -2,7 +2,7 @@
 import json
 
 # Django imports
-from django.db.models import Q, Count, Sum, Prefetch, F, OuterRef, Func
+from django.db.models import Q, Count, Sum, Prefetch, F
 from django.utils import timezone
 from django.core import serializers
 
@@ -16,15 +16,18 @@ from plane.db.models import (
     Cycle,
     Issue,
     CycleIssue,
-    IssueLink,
-    IssueAttachment,
 )
+from plane.db.models.analytic import (
+    invalidate_burndown,
+    refresh_issue_analytics,
+)
+from plane.db.models.issue import bump_issue_version
 from plane.app.permissions import ProjectEntityPermission
 from plane.api.serializers import (
     CycleSerializer,
     CycleIssueSerializer,
 )
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 
 
 class CycleAPIEndpoint(WebhookMixin, BaseAPIView):
@@ -343,7 +346,7 @@ class CycleAPIEndpoint(WebhookMixin, BaseAPIView):
             workspace__slug=slug, project_id=project_id, pk=pk
         )
 
-        issue_activity.delay(
+        queue_issue_activity(
             type="cycle.activity.deleted",
             requested_data=json.dumps(
                 {
@@ -381,12 +384,7 @@ class CycleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
     def get_queryset(self):
         return (
             CycleIssue.objects.annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("issue_id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
+                sub_issues_count=F("issue__sub_issues_count")
             )
             .filter(workspace__slug=self.kwargs.get("slug"))
             .filter(project_id=self.kwargs.get("project_id"))
@@ -405,14 +403,6 @@ class CycleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
         order_by = request.GET.get("order_by", "created_at")
         issues = (
             Issue.issue_objects.filter(issue_cycle__cycle_id=cycle_id)
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .annotate(bridge_id=F("issue_cycle__id"))
             .filter(project_id=project_id)
             .filter(workspace__slug=slug)
@@ -423,20 +413,6 @@ class CycleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
             .prefetch_related("assignees")
             .prefetch_related("labels")
             .order_by(order_by)
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         )
 
         return self.paginate(
@@ -524,9 +500,19 @@ class CycleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
             ["cycle"],
             batch_size=10,
         )
+        # bulk_create and bulk_update skip the issue version signals
+        bump_issue_version([project_id])
+        # The cycles the issues were moved out of
+        invalidate_burndown(
+            "cycle",
+            [
+                cycle_issue["old_cycle_id"]
+                for cycle_issue in update_cycle_issue_activity
+            ],
+        )
 
         # Capture Issue Activity
-        issue_activity.delay(
+        queue_issue_activity(
             type="cycle.activity.created",
             requested_data=json.dumps({"cycles_list": str(issues)}),
             actor_id=str(self.request.user.id),
@@ -558,7 +544,7 @@ class CycleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
         )
         issue_id = cycle_issue.issue_id
         cycle_issue.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="cycle.activity.deleted",
             requested_data=json.dumps(
                 {
@@ -624,5 +610,11 @@ class TransferCycleIssueAPIEndpoint(BaseAPIView):
         cycle_issues = CycleIssue.objects.bulk_update(
             updated_cycles, ["cycle_id"], batch_size=100
         )
+        # The bulk update sends no signals
+        bump_issue_version([project_id])
+        refresh_issue_analytics(
+            [cycle_issue.issue_id for cycle_issue in updated_cycles]
+        )
+        invalidate_burndown("cycle", [cycle_id, new_cycle_id])
 
         return Response({"message": "Success"}, status=status.HTTP_200_OK)
@@ -22,7 +22,7 @@ from plane.db.models import (
     Project,
     Inbox,
 )
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 
 
 class InboxIssueAPIEndpoint(BaseAPIView):
@@ -153,7 +153,7 @@ class InboxIssueAPIEndpoint(BaseAPIView):
         )
 
         # Create an Issue Activity
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue.activity.created",
             requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
             actor_id=str(request.user.id),
@@ -247,7 +247,7 @@ class InboxIssueAPIEndpoint(BaseAPIView):
                 # Log all the updates
                 requested_data = json.dumps(issue_data, cls=DjangoJSONEncoder)
                 if issue is not None:
-                    issue_activity.delay(
+                    queue_issue_activity(
                         type="issue.activity.updated",
                         requested_data=requested_data,
                         actor_id=str(request.user.id),
@@ -5,8 +5,6 @@ from itertools import chain
 # Django imports
 from django.db import IntegrityError
 from django.db.models import (
-    OuterRef,
-    Func,
     Q,
     F,
     Case,
@@ -32,7 +30,6 @@ from plane.app.permissions import (
 )
 from plane.db.models import (
     Issue,
-    IssueAttachment,
     IssueLink,
     Project,
     Label,
@@ -40,7 +37,8 @@ from plane.db.models import (
     IssueComment,
     IssueActivity,
 )
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.db.models.issue import issue_version_key
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 from plane.api.serializers import (
     IssueSerializer,
     LabelSerializer,
@@ -66,15 +64,9 @@ class IssueAPIEndpoint(WebhookMixin, BaseAPIView):
 
     def get_queryset(self):
         return (
-            Issue.issue_objects.annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
+            Issue.issue_objects.filter(
+                project_id=self.kwargs.get("project_id")
             )
-            .filter(project_id=self.kwargs.get("project_id"))
             .filter(workspace__slug=self.kwargs.get("slug"))
             .select_related("project")
             .select_related("workspace")
@@ -87,14 +79,9 @@ class IssueAPIEndpoint(WebhookMixin, BaseAPIView):
 
     def get(self, request, slug, project_id, pk=None):
         if pk:
-            issue = Issue.issue_objects.annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            ).get(workspace__slug=slug, project_id=project_id, pk=pk)
+            issue = Issue.issue_objects.get(
+                workspace__slug=slug, project_id=project_id, pk=pk
+            )
             return Response(
                 IssueSerializer(
                     issue,
@@ -120,20 +107,6 @@ class IssueAPIEndpoint(WebhookMixin, BaseAPIView):
             self.get_queryset()
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
             .annotate(module_id=F("issue_module__module_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         )
 
         # Priority Ordering
@@ -199,6 +172,7 @@ class IssueAPIEndpoint(WebhookMixin, BaseAPIView):
         return self.paginate(
             request=request,
             queryset=(issue_queryset),
+            count_version_keys=[issue_version_key(project_id)],
             on_results=lambda issues: IssueSerializer(
                 issues,
                 many=True,
@@ -247,7 +221,7 @@ class IssueAPIEndpoint(WebhookMixin, BaseAPIView):
             serializer.save()
 
             # Track the issue
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue.activity.created",
                 requested_data=json.dumps(
                     self.request.data, cls=DjangoJSONEncoder
@@ -301,7 +275,7 @@ class IssueAPIEndpoint(WebhookMixin, BaseAPIView):
                 )
 
             serializer.save()
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue.activity.updated",
                 requested_data=requested_data,
                 actor_id=str(request.user.id),
@@ -323,7 +297,7 @@ class IssueAPIEndpoint(WebhookMixin, BaseAPIView):
             IssueSerializer(issue).data, cls=DjangoJSONEncoder
         )
         issue.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue.activity.deleted",
             requested_data=json.dumps({"issue_id": str(pk)}),
             actor_id=str(request.user.id),
@@ -519,7 +493,7 @@ class IssueLinkAPIEndpoint(BaseAPIView):
                 project_id=project_id,
                 issue_id=issue_id,
             )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="link.activity.created",
                 requested_data=json.dumps(
                     serializer.data, cls=DjangoJSONEncoder
@@ -550,7 +524,7 @@ class IssueLinkAPIEndpoint(BaseAPIView):
         )
         if serializer.is_valid():
             serializer.save()
-            issue_activity.delay(
+            queue_issue_activity(
                 type="link.activity.updated",
                 requested_data=requested_data,
                 actor_id=str(request.user.id),
@@ -573,7 +547,7 @@ class IssueLinkAPIEndpoint(BaseAPIView):
             IssueLinkSerializer(issue_link).data,
             cls=DjangoJSONEncoder,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="link.activity.deleted",
             requested_data=json.dumps({"link_id": str(pk)}),
             actor_id=str(request.user.id),
@@ -654,7 +628,7 @@ class IssueCommentAPIEndpoint(WebhookMixin, BaseAPIView):
                 issue_id=issue_id,
                 actor=request.user,
             )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="comment.activity.created",
                 requested_data=json.dumps(
                     serializer.data, cls=DjangoJSONEncoder
@@ -685,7 +659,7 @@ class IssueCommentAPIEndpoint(WebhookMixin, BaseAPIView):
         )
         if serializer.is_valid():
             serializer.save()
-            issue_activity.delay(
+            queue_issue_activity(
                 type="comment.activity.updated",
                 requested_data=requested_data,
                 actor_id=str(request.user.id),
@@ -709,7 +683,7 @@ class IssueCommentAPIEndpoint(WebhookMixin, BaseAPIView):
             cls=DjangoJSONEncoder,
         )
         issue_comment.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="comment.activity.deleted",
             requested_data=json.dumps({"comment_id": str(pk)}),
             actor_id=str(request.user.id),
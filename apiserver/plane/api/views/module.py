@@ -2,7 +2,7 @@
 import json
 
 # Django imports
-from django.db.models import Count, Prefetch, Q, F, Func, OuterRef
+from django.db.models import Count, Prefetch, Q, F
 from django.utils import timezone
 from django.core import serializers
 
@@ -19,15 +19,14 @@ from plane.db.models import (
     ModuleLink,
     Issue,
     ModuleIssue,
-    IssueAttachment,
-    IssueLink,
 )
+from plane.db.models.issue import bump_issue_version, issue_version_key
 from plane.api.serializers import (
     ModuleSerializer,
     ModuleIssueSerializer,
     IssueSerializer,
 )
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 
 
 class ModuleAPIEndpoint(WebhookMixin, BaseAPIView):
@@ -225,7 +224,7 @@ class ModuleAPIEndpoint(WebhookMixin, BaseAPIView):
                 "issue", flat=True
             )
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="module.activity.deleted",
             requested_data=json.dumps(
                 {
@@ -263,12 +262,7 @@ class ModuleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
     def get_queryset(self):
         return (
             ModuleIssue.objects.annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("issue")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
+                sub_issues_count=F("issue__sub_issues_count")
             )
             .filter(workspace__slug=self.kwargs.get("slug"))
             .filter(project_id=self.kwargs.get("project_id"))
@@ -288,14 +282,6 @@ class ModuleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
         order_by = request.GET.get("order_by", "created_at")
         issues = (
             Issue.issue_objects.filter(issue_module__module_id=module_id)
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .annotate(bridge_id=F("issue_module__id"))
             .filter(project_id=project_id)
             .filter(workspace__slug=slug)
@@ -306,24 +292,11 @@ class ModuleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
             .prefetch_related("assignees")
             .prefetch_related("labels")
             .order_by(order_by)
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         )
         return self.paginate(
             request=request,
             queryset=(issues),
+            count_version_keys=[issue_version_key(project_id)],
             on_results=lambda issues: IssueSerializer(
                 issues,
                 many=True,
@@ -394,9 +367,11 @@ class ModuleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
             ["module"],
             batch_size=10,
         )
+        # bulk_create and bulk_update skip the issue version signals
+        bump_issue_version([project_id])
 
         # Capture Issue Activity
-        issue_activity.delay(
+        queue_issue_activity(
             type="module.activity.created",
             requested_data=json.dumps({"modules_list": str(issues)}),
             actor_id=str(self.request.user.id),
@@ -426,7 +401,7 @@ class ModuleIssueAPIEndpoint(WebhookMixin, BaseAPIView):
             issue_id=issue_id,
         )
         module_issue.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="module.activity.deleted",
             requested_data=json.dumps(
                 {
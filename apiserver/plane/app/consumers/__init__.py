@@ -0,0 +1 @@
+from .changes import ChangesConsumer
@@ -0,0 +1,120 @@
+# Third party imports
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+# Module imports
+from plane.app.middleware.websocket_authentication import (
+    WEBSOCKET_TOKEN_PROTOCOL,
+)
+from plane.app.permissions import Memberships
+from plane.app.permissions.membership import load_memberships
+from plane.utils.realtime import issue_group, notification_group
+
+
+@database_sync_to_async
+def get_user_memberships(user_id):
+    return Memberships(**load_memberships(user_id))
+
+
+class ChangesConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Push issue changes and unread notification counters of a workspace
+
+    The unread counters of the user are sent from the start, issue changes
+    once the client subscribes to projects with
+    {"action": "subscribe", "project_ids": [...]}, leaving out project_ids
+    subscribes to every project of the user in the workspace. Memberships
+    are checked on every subscribe.
+    """
+
+    async def connect(self):
+        self.user = self.scope["user"]
+        self.slug = self.scope["url_route"]["kwargs"]["slug"]
+        self.project_ids = set()
+        if self.user.is_anonymous:
+            await self.close()
+            return
+
+        memberships = await get_user_memberships(self.user.id)
+        if memberships.workspace_role(self.slug) is None:
+            await self.close()
+            return
+
+        await self.channel_layer.group_add(
+            notification_group(self.user.id), self.channel_name
+        )
+        # Browsers drop the connection unless an offered subprotocol is
+        # accepted
+        await self.accept(
+            WEBSOCKET_TOKEN_PROTOCOL
+            if WEBSOCKET_TOKEN_PROTOCOL in self.scope["subprotocols"]
+            else None
+        )
+
+    async def disconnect(self, code):
+        if self.user.is_anonymous:
+            return
+        await self.channel_layer.group_discard(
+            notification_group(self.user.id), self.channel_name
+        )
+        for project_id in self.project_ids:
+            await self.channel_layer.group_discard(
+                issue_group(project_id), self.channel_name
+            )
+
+    async def receive_json(self, content, **kwargs):
+        action = content.get("action") if isinstance(content, dict) else None
+        project_ids = content.get("project_ids") if action else None
+        if action not in ["subscribe", "unsubscribe"] or not isinstance(
+            project_ids, (list, type(None))
+        ):
+            await self.send_json({"type": "error", "error": "Invalid action"})
+            return
+
+        if action == "subscribe":
+            memberships = await get_user_memberships(self.user.id)
+            if project_ids is None:
+                project_ids = [
+                    project_id
+                    for project_id, (slug, _, is_active) in (
+                        memberships.projects.items()
+                    )
+                    if slug == self.slug and is_active
+                ]
+            project_ids = {
+                str(project_id)
+                for project_id in project_ids
+                if memberships.project_role(self.slug, project_id) is not None
+            }
+            for project_id in project_ids - self.project_ids:
+                await self.channel_layer.group_add(
+                    issue_group(project_id), self.channel_name
+                )
+            self.project_ids |= project_ids
+        else:
+            project_ids = (
+                set(self.project_ids)
+                if project_ids is None
+                else {str(project_id) for project_id in project_ids}
+                & self.project_ids
+            )
+            for project_id in project_ids:
+                await self.channel_layer.group_discard(
+                    issue_group(project_id), self.channel_name
+                )
+            self.project_ids -= project_ids
+
+        await self.send_json(
+            {"type": "subscriptions", "project_ids": sorted(self.project_ids)}
+        )
+
+    async def issue_change(self, event):
+        if event["change"]["project_id"] in self.project_ids:
+            await self.send_json({"type": "issue.change", **event["change"]})
+
+    async def notification_unread(self, event):
+        # The notification group spans all the workspaces of the user
+        if event["workspace"] == self.slug:
+            await self.send_json(
+                {"type": "notification.unread", "counters": event["counters"]}
+            )
@@ -0,0 +1,60 @@
+# Django imports
+from django.contrib.auth.models import AnonymousUser
+
+# Third party imports
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+# Browsers can not set headers on websockets, they offer this subprotocol
+# followed by the access token instead: new WebSocket(url, ["bearer", token])
+# The token is kept out of the url so it never reaches the access logs
+WEBSOCKET_TOKEN_PROTOCOL = "bearer"
+
+
+@database_sync_to_async
+def get_jwt_user(raw_token):
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(
+            authentication.get_validated_token(raw_token)
+        )
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return AnonymousUser()
+
+
+def get_raw_token(scope):
+    """
+    Access token of a websocket handshake, read from the Authorization
+    header or from the subprotocol following WEBSOCKET_TOKEN_PROTOCOL
+
+    Returns:
+        tuple: the token, None without one, and the subprotocols left
+    """
+    subprotocols = list(scope.get("subprotocols", []))
+    headers = dict(scope.get("headers", []))
+    authorization = headers.get(b"authorization", b"").decode().split()
+    if len(authorization) == 2 and authorization[0] == "Bearer":
+        return authorization[1], subprotocols
+    if WEBSOCKET_TOKEN_PROTOCOL in subprotocols:
+        index = subprotocols.index(WEBSOCKET_TOKEN_PROTOCOL)
+        if index + 1 < len(subprotocols):
+            return subprotocols[index + 1], (
+                subprotocols[: index + 1] + subprotocols[index + 2 :]
+            )
+    return None, subprotocols
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Populate scope["user"] from the same JWT the REST API accepts"""
+
+    async def __call__(self, scope, receive, send):
+        # Copy the scope so the user does not leak to other middleware
+        scope = dict(scope)
+        raw_token, scope["subprotocols"] = get_raw_token(scope)
+        scope["user"] = (
+            await get_jwt_user(raw_token) if raw_token else AnonymousUser()
+        )
+        return await super().__call__(scope, receive, send)
@@ -12,3 +12,4 @@ from .project import (
     ProjectMemberPermission,
     ProjectLitePermission,
 )
+from .membership import Memberships, get_memberships
@@ -0,0 +1,93 @@
+# Python imports
+import json
+
+# Third Party imports
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.db.models import WorkspaceMember, ProjectMember
+from plane.db.models.workspace import membership_version_key
+from plane.settings.redis import redis_instance
+
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 10
+
+
+class Memberships:
+    """Workspace and project roles of a user"""
+
+    def __init__(self, workspaces, projects):
+        # workspace slug -> [role, is_active]
+        self.workspaces = workspaces
+        # project id -> [workspace slug, role, is_active]
+        self.projects = projects
+
+    def workspace_role(self, slug, active=True):
+        member = self.workspaces.get(slug)
+        if member is None or (active and not member[1]):
+            return None
+        return member[0]
+
+    def project_role(self, slug, project_id):
+        member = self.projects.get(str(project_id))
+        if member is None or member[0] != slug or not member[2]:
+            return None
+        return member[1]
+
+    def has_project(self, slug):
+        return any(
+            member[0] == slug and member[2]
+            for member in self.projects.values()
+        )
+
+
+def load_memberships(user_id):
+    workspace_members = WorkspaceMember.objects.filter(
+        member_id=user_id
+    ).values_list("workspace__slug", "role", "is_active")
+    project_members = ProjectMember.objects.filter(
+        member_id=user_id
+    ).values_list("project_id", "workspace__slug", "role", "is_active")
+    return {
+        "workspaces": {
+            slug: [role, is_active]
+            for slug, role, is_active in workspace_members
+        },
+        "projects": {
+            str(project_id): [slug, role, is_active]
+            for project_id, slug, role, is_active in project_members
+        },
+    }
+
+
+def get_memberships(request):
+    """
+    Roles of the request user, loaded once per request and cached in redis
+    until any of the user's memberships change
+    """
+    memberships = getattr(request, "_memberships", None)
+    if memberships is not None:
+        return memberships
+
+    user_id = request.user.id
+    data = None
+    try:
+        ri = redis_instance()
+        version = ri.get(membership_version_key(user_id))
+        key = f"membership:{user_id}:{int(version or 0)}"
+        cached = ri.get(key)
+        if cached is not None:
+            data = json.loads(cached)
+    except Exception as e:
+        capture_exception(e)
+        ri = None
+
+    if data is None:
+        data = load_memberships(user_id)
+        if ri is not None:
+            try:
+                ri.set(key, json.dumps(data), ex=MEMBERSHIP_CACHE_TIMEOUT)
+            except Exception as e:
+                capture_exception(e)
+
+    request._memberships = Memberships(data["workspaces"], data["projects"])
+    return request._memberships
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from plane.app.consumers import ChangesConsumer
+
+
+websocket_urlpatterns = [
+    path(
+        "api/ws/workspaces/<str:slug>/",
+        ChangesConsumer.as_asgi(),
+    ),
+]
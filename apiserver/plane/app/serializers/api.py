@@ -13,6 +13,9 @@ class APITokenSerializer(BaseSerializer):
             "updated_at",
             "workspace",
             "user",
+            # Limits are set by the operators, not by the token owners
+            "rate_limit",
+            "workspace_rate_limit",
         ]
 
 
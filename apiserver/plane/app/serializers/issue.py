@@ -614,7 +614,7 @@ class IssueSerializer(DynamicBaseSerializer):
 
     def get_module_ids(self, obj):
         # Access the prefetched modules and extract module IDs
-        return [module for module in obj.issue_module.values_list("module_id", flat=True)]
+        return [issue_module.module_id for issue_module in obj.issue_module.all()]
 
 
 class IssueDetailSerializer(IssueSerializer):
@@ -35,6 +35,15 @@ urlpatterns = [
         ),
         name="project-issue",
     ),
+    path(
+        "workspaces/<str:slug>/projects/<uuid:project_id>/issues/changes/",
+        IssueViewSet.as_view(
+            {
+                "get": "changes",
+            }
+        ),
+        name="project-issue-changes",
+    ),
     path(
         "workspaces/<str:slug>/projects/<uuid:project_id>/issues/<uuid:pk>/",
         IssueViewSet.as_view(
@@ -64,6 +64,16 @@ urlpatterns = [
         ),
         name="mark-all-read-notifications",
     ),
+    path(
+        "workspaces/<str:slug>/users/notifications/mark-all-archived/",
+        MarkAllReadNotificationViewSet.as_view(
+            {
+                "post": "archive",
+                "delete": "unarchive",
+            }
+        ),
+        name="mark-all-archived-notifications",
+    ),
     path(
         "users/me/notification-preferences/",
         UserNotificationPreferenceEndpoint.as_view(),
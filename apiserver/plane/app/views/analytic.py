@@ -9,9 +9,20 @@ from rest_framework.response import Response
 # Module imports
 from plane.app.views import BaseAPIView, BaseViewSet
 from plane.app.permissions import WorkSpaceAdminPermission
-from plane.db.models import Issue, AnalyticView, Workspace, State, Label
+from plane.db.models import (
+    Issue,
+    IssueAnalytics,
+    AnalyticView,
+    Workspace,
+    State,
+    Label,
+)
 from plane.app.serializers import AnalyticViewSerializer
-from plane.utils.analytics_plot import build_graph_plot
+from plane.utils.analytics_plot import (
+    analytics_facts,
+    build_graph_details,
+    build_graph_plot,
+)
 from plane.bgtasks.analytic_plot_export import analytic_export_task
 from plane.utils.issue_filters import issue_filters
 
@@ -74,8 +85,12 @@ class AnalyticsEndpoint(BaseAPIView):
         # Additional filters that need to be applied
         filters = issue_filters(request.GET, "GET")
 
-        # Get the issues for the workspace with the additional filters applied
-        queryset = Issue.issue_objects.filter(workspace__slug=slug, **filters)
+        # Read the analytics facts of the issues matching the filters
+        queryset = IssueAnalytics.objects.filter(workspace__slug=slug)
+        if filters:
+            queryset = analytics_facts(
+                Issue.issue_objects.filter(workspace__slug=slug, **filters)
+            )
 
         # Get the total issue count
         total_issues = queryset.count()
@@ -85,95 +100,13 @@ class AnalyticsEndpoint(BaseAPIView):
             queryset=queryset, x_axis=x_axis, y_axis=y_axis, segment=segment
         )
 
-        state_details = {}
-        if x_axis in ["state_id"] or segment in ["state_id"]:
-            state_details = (
-                Issue.issue_objects.filter(
-                    workspace__slug=slug,
-                    **filters,
-                )
-                .distinct("state_id")
-                .order_by("state_id")
-                .values("state_id", "state__name", "state__color")
-            )
-
-        label_details = {}
-        if x_axis in ["labels__id"] or segment in ["labels__id"]:
-            label_details = (
-                Issue.objects.filter(
-                    workspace__slug=slug, **filters, labels__id__isnull=False
-                )
-                .distinct("labels__id")
-                .order_by("labels__id")
-                .values("labels__id", "labels__color", "labels__name")
-            )
-
-        assignee_details = {}
-        if x_axis in ["assignees__id"] or segment in ["assignees__id"]:
-            assignee_details = (
-                Issue.issue_objects.filter(
-                    workspace__slug=slug,
-                    **filters,
-                    assignees__avatar__isnull=False,
-                )
-                .order_by("assignees__id")
-                .distinct("assignees__id")
-                .values(
-                    "assignees__avatar",
-                    "assignees__display_name",
-                    "assignees__first_name",
-                    "assignees__last_name",
-                    "assignees__id",
-                )
-            )
-
-        cycle_details = {}
-        if x_axis in ["issue_cycle__cycle_id"] or segment in [
-            "issue_cycle__cycle_id"
-        ]:
-            cycle_details = (
-                Issue.issue_objects.filter(
-                    workspace__slug=slug,
-                    **filters,
-                    issue_cycle__cycle_id__isnull=False,
-                )
-                .distinct("issue_cycle__cycle_id")
-                .order_by("issue_cycle__cycle_id")
-                .values(
-                    "issue_cycle__cycle_id",
-                    "issue_cycle__cycle__name",
-                )
-            )
-
-        module_details = {}
-        if x_axis in ["issue_module__module_id"] or segment in [
-            "issue_module__module_id"
-        ]:
-            module_details = (
-                Issue.issue_objects.filter(
-                    workspace__slug=slug,
-                    **filters,
-                    issue_module__module_id__isnull=False,
-                )
-                .distinct("issue_module__module_id")
-                .order_by("issue_module__module_id")
-                .values(
-                    "issue_module__module_id",
-                    "issue_module__module__name",
-                )
-            )
-
         return Response(
             {
                 "total": total_issues,
                 "distribution": distribution,
-                "extras": {
-                    "state_details": state_details,
-                    "assignee_details": assignee_details,
-                    "label_details": label_details,
-                    "cycle_details": cycle_details,
-                    "module_details": module_details,
-                },
+                "extras": build_graph_details(
+                    distribution, x_axis=x_axis, segment=segment
+                ),
             },
             status=status.HTTP_200_OK,
         )
@@ -19,6 +19,7 @@ from sentry_sdk import capture_message
 
 # Module imports
 from . import BaseAPIView
+from plane.db.models.workspace import invalidate_memberships
 from plane.db.models import (
     User,
     WorkspaceMemberInvite,
@@ -268,6 +269,7 @@ class SignInEndpoint(BaseAPIView):
         # Delete all the invites
         workspace_member_invites.delete()
         project_member_invites.delete()
+        invalidate_memberships([user.id])
         # Send event
         auth_events.delay(
             user=user.id,
@@ -422,6 +424,7 @@ class MagicSignInEndpoint(BaseAPIView):
                 # Delete all the invites
                 workspace_member_invites.delete()
                 project_member_invites.delete()
+                invalidate_memberships([user.id])
 
                 access_token, refresh_token = get_tokens_for_user(user)
                 data = {
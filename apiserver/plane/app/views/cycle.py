@@ -3,7 +3,6 @@ import json
 
 # Django imports
 from django.db.models import (
-    Func,
     F,
     Q,
     Exists,
@@ -47,15 +46,18 @@ from plane.db.models import (
     CycleIssue,
     Issue,
     CycleFavorite,
-    IssueLink,
-    IssueAttachment,
     Label,
     CycleUserProperties,
     IssueSubscriber,
 )
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.db.models.analytic import (
+    invalidate_burndown,
+    refresh_issue_analytics,
+)
+from plane.db.models.issue import bump_issue_version
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 from plane.utils.issue_filters import issue_filters
-from plane.utils.analytics_plot import burndown_plot
+from plane.utils.analytics_plot import burndown_charts, burndown_plot
 
 
 class CycleViewSet(WebhookMixin, BaseViewSet):
@@ -496,11 +498,18 @@ class CycleViewSet(WebhookMixin, BaseViewSet):
         }
 
         if queryset.start_date and queryset.end_date:
-            data["distribution"]["completion_chart"] = burndown_plot(
-                queryset=queryset,
-                slug=slug,
-                project_id=project_id,
-                cycle_id=pk,
+            data["distribution"].update(
+                burndown_charts(
+                    queryset=queryset,
+                    slug=slug,
+                    project_id=project_id,
+                    cycle_id=pk,
+                    plot_type=(
+                        "points"
+                        if request.GET.get("plot_type") == "points"
+                        else "issues"
+                    ),
+                )
             )
 
         return Response(
@@ -518,7 +527,7 @@ class CycleViewSet(WebhookMixin, BaseViewSet):
             workspace__slug=slug, project_id=project_id, pk=pk
         )
 
-        issue_activity.delay(
+        queue_issue_activity(
             type="cycle.activity.deleted",
             requested_data=json.dumps(
                 {
@@ -560,14 +569,7 @@ class CycleIssueViewSet(WebhookMixin, BaseViewSet):
         return self.filter_queryset(
             super()
             .get_queryset()
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("issue_id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
+            .annotate(sub_issues_count=F("issue__sub_issues_count"))
             .filter(workspace__slug=self.kwargs.get("slug"))
             .filter(project_id=self.kwargs.get("project_id"))
             .filter(project__project_projectmember__member=self.request.user)
@@ -591,14 +593,6 @@ class CycleIssueViewSet(WebhookMixin, BaseViewSet):
         filters = issue_filters(request.query_params, "GET")
         issues = (
             Issue.issue_objects.filter(issue_cycle__cycle_id=cycle_id)
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .filter(project_id=project_id)
             .filter(workspace__slug=slug)
             .select_related("workspace", "project", "state", "parent")
@@ -606,20 +600,6 @@ class CycleIssueViewSet(WebhookMixin, BaseViewSet):
             .order_by(order_by)
             .filter(**filters)
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .annotate(
                 is_subscribed=Exists(
                     IssueSubscriber.objects.filter(
@@ -703,9 +683,19 @@ class CycleIssueViewSet(WebhookMixin, BaseViewSet):
             ["cycle"],
             batch_size=10,
         )
+        # bulk_create and bulk_update skip the issue version signals
+        bump_issue_version([project_id])
+        # The cycles the issues were moved out of
+        invalidate_burndown(
+            "cycle",
+            [
+                cycle_issue["old_cycle_id"]
+                for cycle_issue in update_cycle_issue_activity
+            ],
+        )
 
         # Capture Issue Activity
-        issue_activity.delay(
+        queue_issue_activity(
             type="cycle.activity.created",
             requested_data=json.dumps({"cycles_list": issues}),
             actor_id=str(self.request.user.id),
@@ -741,7 +731,7 @@ class CycleIssueViewSet(WebhookMixin, BaseViewSet):
             project_id=project_id,
             cycle_id=cycle_id,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="cycle.activity.deleted",
             requested_data=json.dumps(
                 {
@@ -1092,6 +1082,12 @@ class TransferCycleIssueEndpoint(BaseAPIView):
         cycle_issues = CycleIssue.objects.bulk_update(
             updated_cycles, ["cycle_id"], batch_size=100
         )
+        # The bulk update sends no signals
+        bump_issue_version([project_id])
+        refresh_issue_analytics(
+            [cycle_issue.issue_id for cycle_issue in updated_cycles]
+        )
+        invalidate_burndown("cycle", [cycle_id, new_cycle_id])
 
         return Response({"message": "Success"}, status=status.HTTP_200_OK)
 
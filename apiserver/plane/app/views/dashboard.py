@@ -12,7 +12,6 @@ from django.db.models import (
     Max,
     Subquery,
     JSONField,
-    Func,
     Prefetch,
 )
 from django.utils import timezone
@@ -31,8 +30,6 @@ from plane.db.models import (
     DashboardWidget,
     Dashboard,
     Project,
-    IssueLink,
-    IssueAttachment,
     IssueRelation,
 )
 from plane.app.serializers import (
@@ -42,45 +39,19 @@ from plane.app.serializers import (
     WidgetSerializer,
 )
 from plane.utils.issue_filters import issue_filters
+from plane.utils.issue_stats import get_issue_stats
 
 
 def dashboard_overview_stats(self, request, slug):
-    assigned_issues = Issue.issue_objects.filter(
-        project__project_projectmember__is_active=True,
-        project__project_projectmember__member=request.user,
-        workspace__slug=slug,
-        assignees__in=[request.user],
-    ).count()
-
-    pending_issues_count = Issue.issue_objects.filter(
-        ~Q(state__group__in=["completed", "cancelled"]),
-        project__project_projectmember__is_active=True,
-        project__project_projectmember__member=request.user,
-        workspace__slug=slug,
-        assignees__in=[request.user],
-    ).count()
-
-    created_issues_count = Issue.issue_objects.filter(
-        workspace__slug=slug,
-        project__project_projectmember__is_active=True,
-        project__project_projectmember__member=request.user,
-        created_by_id=request.user.id,
-    ).count()
-
-    completed_issues_count = Issue.issue_objects.filter(
-        workspace__slug=slug,
-        project__project_projectmember__is_active=True,
-        project__project_projectmember__member=request.user,
-        assignees__in=[request.user],
-        state__group="completed",
-    ).count()
-
+    stats = get_issue_stats(
+        slug, request.user.id, request.user.id, active_only=True
+    )
     return Response(
         {
-            "assigned_issues_count": assigned_issues,
-            "pending_issues_count": pending_issues_count,
-            "completed_issues_count": completed_issues_count,
-            "created_issues_count": created_issues_count,
+            "assigned_issues_count": stats["assigned"],
+            "pending_issues_count": stats["pending"],
+            "completed_issues_count": stats["completed"],
+            "created_issues_count": stats["created"],
         },
         status=status.HTTP_200_OK,
     )
@@ -110,26 +81,6 @@ def dashboard_assigned_issues(self, request, slug):
             )
         )
         .annotate(cycle_id=F("issue_cycle__cycle_id"))
-        .annotate(
-            link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-            .order_by()
-            .annotate(count=Func(F("id"), function="Count"))
-            .values("count")
-        )
-        .annotate(
-            attachment_count=IssueAttachment.objects.filter(
-                issue=OuterRef("id")
-            )
-            .order_by()
-            .annotate(count=Func(F("id"), function="Count"))
-            .values("count")
-        )
-        .annotate(
-            sub_issues_count=Issue.issue_objects.filter(parent=OuterRef("id"))
-            .order_by()
-            .annotate(count=Func(F("id"), function="Count"))
-            .values("count")
-        )
         .order_by("created_at")
     )
 
@@ -239,26 +190,6 @@ def dashboard_created_issues(self, request, slug):
         .select_related("workspace", "project", "state", "parent")
         .prefetch_related("assignees", "labels", "issue_module__module")
         .annotate(cycle_id=F("issue_cycle__cycle_id"))
-        .annotate(
-            link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-            .order_by()
-            .annotate(count=Func(F("id"), function="Count"))
-            .values("count")
-        )
-        .annotate(
-            attachment_count=IssueAttachment.objects.filter(
-                issue=OuterRef("id")
-            )
-            .order_by()
-            .annotate(count=Func(F("id"), function="Count"))
-            .values("count")
-        )
-        .annotate(
-            sub_issues_count=Issue.issue_objects.filter(parent=OuterRef("id"))
-            .order_by()
-            .annotate(count=Func(F("id"), function="Count"))
-            .values("count")
-        )
         .order_by("created_at")
     )
 
@@ -348,29 +279,14 @@ def dashboard_created_issues(self, request, slug):
 
 def dashboard_issues_by_state_groups(self, request, slug):
     filters = issue_filters(request.query_params, "GET")
-    state_order = ["backlog", "unstarted", "started", "completed", "cancelled"]
-    issues_by_state_groups = (
-        Issue.issue_objects.filter(
-            workspace__slug=slug,
-            project__project_projectmember__is_active=True,
-            project__project_projectmember__member=request.user,
-            assignees__in=[request.user],
-        )
-        .filter(**filters)
-        .values("state__group")
-        .annotate(count=Count("id"))
+    stats = get_issue_stats(
+        slug, request.user.id, request.user.id, filters, active_only=True
     )
 
-    # default state
-    all_groups = {state: 0 for state in state_order}
-
-    # Update counts for existing groups
-    for entry in issues_by_state_groups:
-        all_groups[entry["state__group"]] = entry["count"]
-
     # Prepare output including all groups with their counts
     output_data = [
-        {"state": group, "count": count} for group, count in all_groups.items()
+        {"state": group, "count": count}
+        for group, count in stats["state_groups"].items()
     ]
 
     return Response(output_data, status=status.HTTP_200_OK)
@@ -378,31 +294,14 @@ def dashboard_issues_by_state_groups(self, request, slug):
 
 def dashboard_issues_by_priority(self, request, slug):
     filters = issue_filters(request.query_params, "GET")
-    priority_order = ["urgent", "high", "medium", "low", "none"]
-
-    issues_by_priority = (
-        Issue.issue_objects.filter(
-            workspace__slug=slug,
-            project__project_projectmember__is_active=True,
-            project__project_projectmember__member=request.user,
-            assignees__in=[request.user],
-        )
-        .filter(**filters)
-        .values("priority")
-        .annotate(count=Count("id"))
+    stats = get_issue_stats(
+        slug, request.user.id, request.user.id, filters, active_only=True
     )
 
-    # default priority
-    all_groups = {priority: 0 for priority in priority_order}
-
-    # Update counts for existing groups
-    for entry in issues_by_priority:
-        all_groups[entry["priority"]] = entry["count"]
-
     # Prepare output including all groups with their counts
     output_data = [
         {"priority": group, "count": count}
-        for group, count in all_groups.items()
+        for group, count in stats["priorities"].items()
     ]
 
     return Response(output_data, status=status.HTTP_200_OK)
@@ -6,10 +6,18 @@ from rest_framework import status
 from rest_framework.response import Response
 
 # Django imports
-from django.db.models import Max, Q
+from django.db.models import Q
 
 # Module imports
 from plane.app.views import BaseAPIView
+from plane.db.models.issue import (
+    allocate_sequence_ids,
+    bump_issue_version,
+    next_sort_order,
+    refresh_issue_counters,
+)
+from plane.db.models.search import index_search_documents
+from plane.db.models.analytic import refresh_issue_analytics
 from plane.db.models import (
     WorkspaceIntegration,
     Importer,
@@ -300,22 +308,6 @@ class BulkImportIssuesEndpoint(BaseAPIView):
                 ~Q(name="Triage"), project_id=project_id
             ).first()
 
-        # Get the maximum sequence_id
-        last_id = IssueSequence.objects.filter(
-            project_id=project_id
-        ).aggregate(largest=Max("sequence"))["largest"]
-
-        last_id = 1 if last_id is None else last_id + 1
-
-        # Get the maximum sort order
-        largest_sort_order = Issue.objects.filter(
-            project_id=project_id, state=default_state
-        ).aggregate(largest=Max("sort_order"))["largest"]
-
-        largest_sort_order = (
-            65535 if largest_sort_order is None else largest_sort_order + 10000
-        )
-
         # Get the issues_data
         issues_data = request.data.get("issues_data", [])
 
@@ -325,6 +317,10 @@ class BulkImportIssuesEndpoint(BaseAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # Reserve the sequence ids of all the issues at once
+        last_id = allocate_sequence_ids(project_id, len(issues_data))
+        largest_sort_order = next_sort_order(project_id, default_state.id)
+
         # Issues
         bulk_issues = []
         for issue_data in issues_data:
@@ -364,6 +360,8 @@ class BulkImportIssuesEndpoint(BaseAPIView):
             batch_size=100,
             ignore_conflicts=True,
         )
+        # bulk_create skips the search document receivers
+        index_search_documents("issue", issues, "description_stripped")
 
         # Sequences
         _ = IssueSequence.objects.bulk_create(
@@ -472,6 +470,10 @@ class BulkImportIssuesEndpoint(BaseAPIView):
                 for issue, issue_data in zip(issues, issues_data)
             ]
         )
+        refresh_issue_counters([issue.id for issue in issues], ["link_count"])
+        refresh_issue_analytics([issue.id for issue in issues])
+        # bulk_create skips the issue version signals
+        bump_issue_version([project_id])
 
         return Response(
             {"issues": IssueFlatSerializer(issues, many=True).data},
@@ -504,6 +506,7 @@ class BulkImportModulesEndpoint(BaseAPIView):
         modules = Module.objects.filter(
             id__in=[module.id for module in modules]
         )
+        index_search_documents("module", modules, "description")
 
         if len(modules) == len(modules_data):
             _ = ModuleLink.objects.bulk_create(
@@ -543,6 +546,10 @@ class BulkImportModulesEndpoint(BaseAPIView):
             _ = ModuleIssue.objects.bulk_create(
                 bulk_module_issues, batch_size=100, ignore_conflicts=True
             )
+            refresh_issue_analytics(
+                [module_issue.issue_id for module_issue in bulk_module_issues]
+            )
+            bump_issue_version([project_id])
 
             serializer = ModuleSerializer(modules, many=True)
             return Response(
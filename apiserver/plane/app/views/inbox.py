@@ -3,7 +3,7 @@ import json
 
 # Django import
 from django.utils import timezone
-from django.db.models import Q, Count, OuterRef, Func, F, Prefetch
+from django.db.models import Q, Count, F, Prefetch
 from django.core.serializers.json import DjangoJSONEncoder
 
 # Third party imports
@@ -18,8 +18,6 @@ from plane.db.models import (
     InboxIssue,
     Issue,
     State,
-    IssueLink,
-    IssueAttachment,
     ProjectMember,
 )
 from plane.app.serializers import (
@@ -30,7 +28,7 @@ from plane.app.serializers import (
     IssueDetailSerializer,
 )
 from plane.utils.issue_filters import issue_filters
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 
 
 class InboxViewSet(BaseViewSet):
@@ -105,28 +103,6 @@ class InboxIssueViewSet(BaseViewSet):
                 )
             )
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         ).distinct()
 
     def list(self, request, slug, project_id, inbox_id):
@@ -180,7 +156,7 @@ class InboxIssueViewSet(BaseViewSet):
         )
 
         # Create an Issue Activity
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue.activity.created",
             requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
             actor_id=str(request.user.id),
@@ -257,7 +233,7 @@ class InboxIssueViewSet(BaseViewSet):
                 # Log all the updates
                 requested_data = json.dumps(issue_data, cls=DjangoJSONEncoder)
                 if issue is not None:
-                    issue_activity.delay(
+                    queue_issue_activity(
                         type="issue.activity.updated",
                         requested_data=requested_data,
                         actor_id=str(request.user.id),
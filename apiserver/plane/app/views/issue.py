@@ -1,15 +1,15 @@
 # Python imports
 import json
 import random
+from datetime import timedelta
 from itertools import chain
 
 # Django imports
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 from django.db.models import (
     Prefetch,
-    OuterRef,
-    Func,
     F,
     Q,
     Count,
@@ -53,6 +53,7 @@ from plane.app.serializers import (
     IssueDetailSerializer,
 )
 from plane.app.permissions import (
+    get_memberships,
     ProjectEntityPermission,
     WorkSpaceAdminPermission,
     ProjectMemberPermission,
@@ -75,11 +76,26 @@ from plane.db.models import (
     ProjectDeployBoard,
     IssueVote,
     IssueRelation,
+    IssueTombstone,
     ProjectPublicMember,
 )
-from plane.bgtasks.issue_activites_task import issue_activity
-from plane.utils.grouper import group_results
+from plane.db.models.issue import issue_version_key, refresh_issue_counters
+from plane.bgtasks.issue_activites_task import queue_issue_activity
+from plane.utils.grouper import (
+    GROUP_BY_FIELDS,
+    group_queryset,
+    group_results,
+)
 from plane.utils.issue_filters import issue_filters
+from plane.utils.etag import conditional_issue_list
+from plane.utils.issue_changes import (
+    ISSUE_CHANGES_LIMIT,
+    ISSUE_CHANGES_MAX_LIMIT,
+    issue_changes,
+    parse_changes_cursor,
+)
+from plane.utils.issue_projection import issue_rows, issue_values
+from plane.utils.paginator import KeysetPaginator, KeysetCursor
 from collections import defaultdict
 
 
@@ -122,31 +138,10 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
                 )
             )
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         ).distinct()
 
     @method_decorator(gzip_page)
+    @conditional_issue_list()
     def list(self, request, slug, project_id):
         filters = issue_filters(request.query_params, "GET")
 
@@ -180,6 +175,7 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
                     output_field=CharField(),
                 )
             ).order_by("priority_order")
+            order_key = "priority_order"
 
         # State Ordering
         elif order_by_param in [
@@ -203,6 +199,7 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
                     output_field=CharField(),
                 )
             ).order_by("state_order")
+            order_key = "state_order"
         # assignee and label ordering
         elif order_by_param in [
             "labels__name",
@@ -221,26 +218,140 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
                 if order_by_param.startswith("-")
                 else "max_values"
             )
+            order_key = (
+                "-max_values"
+                if order_by_param.startswith("-")
+                else "max_values"
+            )
         else:
             issue_queryset = issue_queryset.order_by(order_by_param)
+            order_key = order_by_param
+
+        # Group in the database returning the counts and first issue ids
+        # of every group, the members are paged with the group filters
+        if request.GET.get("grouped", "false") == "true":
+            group_by = request.GET.get("group_by", False)
+            sub_group_by = request.GET.get("sub_group_by", False)
+            if (
+                group_by not in GROUP_BY_FIELDS
+                or (sub_group_by and sub_group_by not in GROUP_BY_FIELDS)
+                or sub_group_by == group_by
+            ):
+                return Response(
+                    {"error": "Group by and sub group by should be valid"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            return Response(
+                group_queryset(
+                    issue_queryset,
+                    group_by,
+                    sub_group_by,
+                    per_group=self.get_per_page(
+                        request, default_per_page=50, max_per_page=100
+                    ),
+                    ordering=(
+                        order_key
+                        if order_key == order_by_param
+                        else "-created_at"
+                    ),
+                ),
+                status=status.HTTP_200_OK,
+            )
 
-        issues = IssueSerializer(
-            issue_queryset, many=True, fields=self.fields, expand=self.expand
-        ).data
-        return Response(issues, status=status.HTTP_200_OK)
+        # The full issues are projected from values rows instead of
+        # serializing model instances, picked fields and expansions go
+        # through the serializer
+        if self.fields or self.expand:
+            queryset = issue_queryset
+
+            def on_results(issues):
+                return IssueSerializer(
+                    issues, many=True, fields=self.fields, expand=self.expand
+                ).data
+
+        else:
+            queryset = issue_values(issue_queryset, order_key.lstrip("-"))
+            on_results = issue_rows
+
+        # Stream the whole list as newline delimited json
+        if request.GET.get("stream", "false") == "true":
+            return self.stream(queryset=queryset, on_results=on_results)
+
+        # Keyset pagination on the active ordering
+        if request.GET.get("per_page", False):
+            return self.paginate(
+                request=request,
+                queryset=queryset,
+                order_by=order_key,
+                count_version_keys=[issue_version_key(project_id)],
+                paginator_cls=KeysetPaginator,
+                cursor_cls=KeysetCursor,
+                on_results=on_results,
+            )
+
+        return Response(on_results(queryset), status=status.HTTP_200_OK)
+
+    @method_decorator(gzip_page)
+    def changes(self, request, slug, project_id):
+        """
+        Issues upserted and removed since the cursor of the previous sync,
+        without a cursor the whole list is returned a page at a time
+        """
+        try:
+            since = parse_changes_cursor(request.GET.get("since"))
+            limit = min(
+                int(request.GET.get("per_page", ISSUE_CHANGES_LIMIT)),
+                ISSUE_CHANGES_MAX_LIMIT,
+            )
+        except ValueError:
+            return Response(
+                {"error": "Invalid cursor or page size"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if limit < 1:
+            return Response(
+                {"error": "Invalid cursor or page size"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Removals older than the tombstones may have been missed
+        if since is not None and (
+            since[2] is None
+            or since[2]
+            < timezone.now()
+            - timedelta(days=settings.ISSUE_TOMBSTONE_RETENTION_DAYS)
+        ):
+            return Response(
+                {"error": "Cursor has expired", "reset": True},
+                status=status.HTTP_410_GONE,
+            )
+
+        upserted, removed, cursor, has_more = issue_changes(
+            self.get_queryset(),
+            IssueTombstone.objects.filter(
+                project_id=project_id, workspace__slug=slug
+            ),
+            since=since,
+            limit=limit,
+        )
+        return Response(
+            {
+                "upserted": IssueSerializer(
+                    upserted, many=True, fields=self.fields, expand=self.expand
+                ).data,
+                "removed": removed,
+                "cursor": cursor,
+                "has_more": has_more,
+            },
+            status=status.HTTP_200_OK,
+        )
 
     def create(self, request, slug, project_id):
     ####################################################################################################
          # Get the project member
-        project_member = ProjectMember.objects.get(
-            workspace__slug=slug,
-            project_id=project_id,
-            member=request.user,
-            is_active=True,
-        )
-        print("role is ", project_member.role, request.user)
+        project_role = get_memberships(request).project_role(slug, project_id)
          # Only project members,QA, admins and created_by users can access this endpoint
-        if project_member.role <12:
+        if project_role is None or project_role < 12:
             
             return Response(
                 {"error": "You don't have permission"},
@@ -265,7 +376,7 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
             serializer.save()
 
             # Track the issue
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue.activity.created",
                 requested_data=json.dumps(
                     self.request.data, cls=DjangoJSONEncoder
@@ -295,26 +406,19 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
         )
 
     def partial_update(self, request, slug, project_id, pk=None):
-        print("partial update ")
         data_json = request.data
          ####################################################################################################
          # Get the project member
-        project_member = ProjectMember.objects.get(
-            workspace__slug=slug,
-            project_id=project_id,
-            member=request.user,
-            is_active=True,
-        )
-        print("role is ", project_member.role)
+        project_role = get_memberships(request).project_role(slug, project_id)
          # Only project members admins and created_by users can access this endpoint
-        if project_member.role <10:
+        if project_role is None or project_role < 10:
             
             return Response(
                 {"error": "You don't have permission"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        if project_member.role ==10 :
+        if project_role == 10:
             
             data_json = {
                 "id": request.data.get("id"),
@@ -323,9 +427,7 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
                 }
             if request.data.get("assignees"):
                 data_json["assignees"] = request.data.get("assignees")
-            print("request_data developer ",data_json)
     
-        print("data ",data_json)
         
 
         ####################################################################################################
@@ -341,7 +443,7 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
         )
         if serializer.is_valid():
             serializer.save()
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue.activity.updated",
                 requested_data=requested_data,
                 actor_id=str(request.user.id),
@@ -361,15 +463,9 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
     def destroy(self, request, slug, project_id, pk=None):
     ####################################################################################################
          # Get the project member
-        project_member = ProjectMember.objects.get(
-            workspace__slug=slug,
-            project_id=project_id,
-            member=request.user,
-            is_active=True,
-        )
-        print("role is ", project_member.role)
+        project_role = get_memberships(request).project_role(slug, project_id)
          # Only project members,QA, admins and created_by users can access this endpoint
-        if project_member.role <12:
+        if project_role is None or project_role < 12:
             
             return Response(
                 {"error": "You don't have permission"},
@@ -385,7 +481,7 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
             IssueSerializer(issue).data, cls=DjangoJSONEncoder
         )
         issue.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue.activity.deleted",
             requested_data=json.dumps({"issue_id": str(pk)}),
             actor_id=str(request.user.id),
@@ -401,6 +497,7 @@ class IssueViewSet(WebhookMixin, BaseViewSet):
 
 class UserWorkSpaceIssues(BaseAPIView):
     @method_decorator(gzip_page)
+    @conditional_issue_list(scope="workspace")
     def get(self, request, slug):
         filters = issue_filters(request.query_params, "GET")
         # Custom ordering for priority and state
@@ -424,14 +521,6 @@ class UserWorkSpaceIssues(BaseAPIView):
                 ),
                 workspace__slug=slug,
             )
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .select_related("project")
             .select_related("workspace")
             .select_related("state")
@@ -439,20 +528,6 @@ class UserWorkSpaceIssues(BaseAPIView):
             .prefetch_related("assignees")
             .prefetch_related("labels")
             .order_by(order_by_param)
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .prefetch_related(
                 Prefetch(
                     "issue_reactions",
@@ -660,7 +735,7 @@ class IssueCommentViewSet(WebhookMixin, BaseViewSet):
                 issue_id=issue_id,
                 actor=request.user,
             )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="comment.activity.created",
                 requested_data=json.dumps(
                     serializer.data, cls=DjangoJSONEncoder
@@ -693,7 +768,7 @@ class IssueCommentViewSet(WebhookMixin, BaseViewSet):
         )
         if serializer.is_valid():
             serializer.save()
-            issue_activity.delay(
+            queue_issue_activity(
                 type="comment.activity.updated",
                 requested_data=requested_data,
                 actor_id=str(request.user.id),
@@ -719,7 +794,7 @@ class IssueCommentViewSet(WebhookMixin, BaseViewSet):
             cls=DjangoJSONEncoder,
         )
         issue_comment.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="comment.activity.deleted",
             requested_data=json.dumps({"comment_id": str(pk)}),
             actor_id=str(request.user.id),
@@ -851,28 +926,6 @@ class SubIssuesEndpoint(BaseAPIView):
             .select_related("parent")
             .prefetch_related("assignees")
             .prefetch_related("labels")
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .prefetch_related(
                 Prefetch(
                     "issue_reactions",
@@ -912,10 +965,14 @@ class SubIssuesEndpoint(BaseAPIView):
 
         sub_issues = Issue.issue_objects.filter(id__in=sub_issue_ids)
 
+        # bulk_update skips the counter signals of the previous parents
+        parent_ids = {parent_issue.id}
         for sub_issue in sub_issues:
+            parent_ids.add(sub_issue.parent_id)
             sub_issue.parent = parent_issue
 
         _ = Issue.objects.bulk_update(sub_issues, ["parent"], batch_size=10)
+        refresh_issue_counters(parent_ids, ["sub_issues_count"])
 
         updated_sub_issues = Issue.issue_objects.filter(
             id__in=sub_issue_ids
@@ -923,7 +980,7 @@ class SubIssuesEndpoint(BaseAPIView):
 
         # Track the issue
         _ = [
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue.activity.updated",
                 requested_data=json.dumps({"parent": str(issue_id)}),
                 actor_id=str(request.user.id),
@@ -982,7 +1039,7 @@ class IssueLinkViewSet(BaseViewSet):
                 project_id=project_id,
                 issue_id=issue_id,
             )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="link.activity.created",
                 requested_data=json.dumps(
                     serializer.data, cls=DjangoJSONEncoder
@@ -1015,7 +1072,7 @@ class IssueLinkViewSet(BaseViewSet):
         )
         if serializer.is_valid():
             serializer.save()
-            issue_activity.delay(
+            queue_issue_activity(
                 type="link.activity.updated",
                 requested_data=requested_data,
                 actor_id=str(request.user.id),
@@ -1040,7 +1097,7 @@ class IssueLinkViewSet(BaseViewSet):
             IssueLinkSerializer(issue_link).data,
             cls=DjangoJSONEncoder,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="link.activity.deleted",
             requested_data=json.dumps({"link_id": str(pk)}),
             actor_id=str(request.user.id),
@@ -1095,7 +1152,7 @@ class IssueAttachmentEndpoint(BaseAPIView):
         serializer = IssueAttachmentSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save(project_id=project_id, issue_id=issue_id)
-            issue_activity.delay(
+            queue_issue_activity(
                 type="attachment.activity.created",
                 requested_data=None,
                 actor_id=str(self.request.user.id),
@@ -1116,7 +1173,7 @@ class IssueAttachmentEndpoint(BaseAPIView):
         issue_attachment = IssueAttachment.objects.get(pk=pk)
         issue_attachment.asset.delete(save=False)
         issue_attachment.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="attachment.activity.deleted",
             requested_data=None,
             actor_id=str(self.request.user.id),
@@ -1147,40 +1204,12 @@ class IssueArchiveViewSet(BaseViewSet):
 
     def get_queryset(self):
         return (
-            Issue.objects.annotate(
-                sub_issues_count=Issue.objects.filter(parent=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .filter(archived_at__isnull=False)
+            Issue.objects.filter(archived_at__isnull=False)
             .filter(project_id=self.kwargs.get("project_id"))
             .filter(workspace__slug=self.kwargs.get("slug"))
             .select_related("workspace", "project", "state", "parent")
             .prefetch_related("assignees", "labels", "issue_module__module")
             .annotate(cycle_id=F("issue_cycle__cycle_id"))            
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         )
 
     @method_decorator(gzip_page)
@@ -1297,7 +1326,7 @@ class IssueArchiveViewSet(BaseViewSet):
             archived_at__isnull=False,
             pk=pk,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue.activity.updated",
             requested_data=json.dumps({"archived_at": None}),
             actor_id=str(request.user.id),
@@ -1446,7 +1475,7 @@ class IssueReactionViewSet(BaseViewSet):
                 project_id=project_id,
                 actor=request.user,
             )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue_reaction.activity.created",
                 requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
                 actor_id=str(request.user.id),
@@ -1468,7 +1497,7 @@ class IssueReactionViewSet(BaseViewSet):
             reaction=reaction_code,
             actor=request.user,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue_reaction.activity.deleted",
             requested_data=None,
             actor_id=str(self.request.user.id),
@@ -1515,7 +1544,7 @@ class CommentReactionViewSet(BaseViewSet):
                 actor_id=request.user.id,
                 comment_id=comment_id,
             )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="comment_reaction.activity.created",
                 requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
                 actor_id=str(request.user.id),
@@ -1537,7 +1566,7 @@ class CommentReactionViewSet(BaseViewSet):
             reaction=reaction_code,
             actor=request.user,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="comment_reaction.activity.deleted",
             requested_data=None,
             actor_id=str(self.request.user.id),
@@ -1673,7 +1702,7 @@ class IssueRelationViewSet(BaseViewSet):
             ignore_conflicts=True,
         )
 
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue_relation.activity.created",
             requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
             actor_id=str(request.user.id),
@@ -1719,7 +1748,7 @@ class IssueRelationViewSet(BaseViewSet):
             cls=DjangoJSONEncoder,
         )
         issue_relation.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue_relation.activity.deleted",
             requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
             actor_id=str(request.user.id),
@@ -1756,28 +1785,6 @@ class IssueDraftViewSet(BaseViewSet):
                 )
             )
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         ).distinct()
 
     @method_decorator(gzip_page)
@@ -1887,7 +1894,7 @@ class IssueDraftViewSet(BaseViewSet):
             serializer.save(is_draft=True)
 
             # Track the issue
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue_draft.activity.created",
                 requested_data=json.dumps(
                     self.request.data, cls=DjangoJSONEncoder
@@ -1921,7 +1928,7 @@ class IssueDraftViewSet(BaseViewSet):
                 )
             else:
                 serializer.save()
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue_draft.activity.updated",
                 requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
                 actor_id=str(self.request.user.id),
@@ -1955,7 +1962,7 @@ class IssueDraftViewSet(BaseViewSet):
             IssueSerializer(issue).data, cls=DjangoJSONEncoder
         )
         issue.delete()
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue_draft.activity.deleted",
             requested_data=json.dumps({"issue_id": str(pk)}),
             actor_id=str(request.user.id),
@@ -3,7 +3,7 @@ import json
 
 # Django Imports
 from django.utils import timezone
-from django.db.models import Prefetch, F, OuterRef, Func, Exists, Count, Q
+from django.db.models import Prefetch, F, OuterRef, Exists, Count, Q
 from django.core import serializers
 from django.utils.decorators import method_decorator
 from django.views.decorators.gzip import gzip_page
@@ -36,15 +36,14 @@ from plane.db.models import (
     Issue,
     ModuleLink,
     ModuleFavorite,
-    IssueLink,
-    IssueAttachment,
     IssueSubscriber,
     ModuleUserProperties,
 )
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.db.models.issue import bump_issue_version
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 from plane.utils.grouper import group_results
 from plane.utils.issue_filters import issue_filters
-from plane.utils.analytics_plot import burndown_plot
+from plane.utils.analytics_plot import burndown_charts
 
 
 class ModuleViewSet(WebhookMixin, BaseViewSet):
@@ -277,11 +276,18 @@ class ModuleViewSet(WebhookMixin, BaseViewSet):
         }
 
         if queryset.start_date and queryset.target_date:
-            data["distribution"]["completion_chart"] = burndown_plot(
-                queryset=queryset,
-                slug=slug,
-                project_id=project_id,
-                module_id=pk,
+            data["distribution"].update(
+                burndown_charts(
+                    queryset=queryset,
+                    slug=slug,
+                    project_id=project_id,
+                    module_id=pk,
+                    plot_type=(
+                        "points"
+                        if request.GET.get("plot_type") == "points"
+                        else "issues"
+                    ),
+                )
             )
 
         return Response(
@@ -299,7 +305,7 @@ class ModuleViewSet(WebhookMixin, BaseViewSet):
             )
         )
         _ = [
-            issue_activity.delay(
+            queue_issue_activity(
                 type="module.activity.deleted",
                 requested_data=json.dumps({"module_id": str(pk)}),
                 actor_id=str(request.user.id),
@@ -343,28 +349,6 @@ class ModuleIssueViewSet(WebhookMixin, BaseViewSet):
             .prefetch_related("labels", "assignees")
             .prefetch_related('issue_module__module')
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         ).distinct()
 
     @method_decorator(gzip_page)
@@ -405,9 +389,11 @@ class ModuleIssueViewSet(WebhookMixin, BaseViewSet):
             batch_size=10,
             ignore_conflicts=True,
         )
+        # bulk_create skips the issue version signals
+        bump_issue_version([project_id])
         # Bulk Update the activity
         _ = [
-            issue_activity.delay(
+            queue_issue_activity(
                 type="module.activity.created",
                 requested_data=json.dumps({"module_id": str(module_id)}),
                 actor_id=str(request.user.id),
@@ -450,9 +436,11 @@ class ModuleIssueViewSet(WebhookMixin, BaseViewSet):
             batch_size=10,
             ignore_conflicts=True,
         )
+        # bulk_create skips the issue version signals
+        bump_issue_version([project_id])
         # Bulk Update the activity
         _ = [
-            issue_activity.delay(
+            queue_issue_activity(
                 type="module.activity.created",
                 requested_data=json.dumps({"module_id": module}),
                 actor_id=str(request.user.id),
@@ -478,7 +466,7 @@ class ModuleIssueViewSet(WebhookMixin, BaseViewSet):
             module_id=module_id,
             issue_id=issue_id,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="module.activity.deleted",
             requested_data=json.dumps({"module_id": str(module_id)}),
             actor_id=str(request.user.id),
@@ -6,6 +6,11 @@ from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from plane.utils.paginator import BasePaginator
+from plane.utils.notification_counter import (
+    get_unread_counters,
+    reset_unread_counters,
+    update_unread_counters,
+)
 
 # Module imports
 from .base import BaseViewSet, BaseAPIView
@@ -19,6 +24,9 @@ from plane.db.models import (
 )
 from plane.app.serializers import NotificationSerializer, UserNotificationPreferenceSerializer
 
+# Rows updated per statement by the bulk read and archive actions
+NOTIFICATION_UPDATE_CHUNK = 5000
+
 
 class NotificationViewSet(BaseViewSet, BasePaginator):
     model = Notification
@@ -159,8 +167,18 @@ class NotificationViewSet(BaseViewSet, BasePaginator):
         notification = Notification.objects.get(
             receiver=request.user, workspace__slug=slug, pk=pk
         )
+        counted = (
+            notification.read_at is None
+            and notification.archived_at is None
+        )
         notification.read_at = timezone.now()
         notification.save()
+        if counted:
+            update_unread_counters(
+                slug,
+                [(notification.receiver_id, notification.entity_identifier)],
+                -1,
+            )
         serializer = NotificationSerializer(notification)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -168,8 +186,18 @@ class NotificationViewSet(BaseViewSet, BasePaginator):
         notification = Notification.objects.get(
             receiver=request.user, workspace__slug=slug, pk=pk
         )
+        counted = (
+            notification.read_at is not None
+            and notification.archived_at is None
+        )
         notification.read_at = None
         notification.save()
+        if counted:
+            update_unread_counters(
+                slug,
+                [(notification.receiver_id, notification.entity_identifier)],
+                1,
+            )
         serializer = NotificationSerializer(notification)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -177,8 +205,18 @@ class NotificationViewSet(BaseViewSet, BasePaginator):
         notification = Notification.objects.get(
             receiver=request.user, workspace__slug=slug, pk=pk
         )
+        counted = (
+            notification.read_at is None
+            and notification.archived_at is None
+        )
         notification.archived_at = timezone.now()
         notification.save()
+        if counted:
+            update_unread_counters(
+                slug,
+                [(notification.receiver_id, notification.entity_identifier)],
+                -1,
+            )
         serializer = NotificationSerializer(notification)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -186,71 +224,75 @@ class NotificationViewSet(BaseViewSet, BasePaginator):
         notification = Notification.objects.get(
             receiver=request.user, workspace__slug=slug, pk=pk
         )
+        counted = (
+            notification.read_at is None
+            and notification.archived_at is not None
+        )
         notification.archived_at = None
         notification.save()
+        if counted:
+            update_unread_counters(
+                slug,
+                [(notification.receiver_id, notification.entity_identifier)],
+                1,
+            )
         serializer = NotificationSerializer(notification)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class UnreadNotificationEndpoint(BaseAPIView):
     def get(self, request, slug):
-        # Watching Issues Count
-        watching_issues_count = Notification.objects.filter(
-            workspace__slug=slug,
-            receiver_id=request.user.id,
-            read_at__isnull=True,
-            archived_at__isnull=True,
-            entity_identifier__in=IssueSubscriber.objects.filter(
-                workspace__slug=slug, subscriber_id=request.user.id
-            ).values_list("issue_id", flat=True),
-        ).count()
-
-        # My Issues Count
-        my_issues_count = Notification.objects.filter(
-            workspace__slug=slug,
-            receiver_id=request.user.id,
-            read_at__isnull=True,
-            archived_at__isnull=True,
-            entity_identifier__in=IssueAssignee.objects.filter(
-                workspace__slug=slug, assignee_id=request.user.id
-            ).values_list("issue_id", flat=True),
-        ).count()
-
-        # Created Issues Count
-        created_issues_count = Notification.objects.filter(
-            workspace__slug=slug,
-            receiver_id=request.user.id,
-            read_at__isnull=True,
-            archived_at__isnull=True,
-            entity_identifier__in=Issue.objects.filter(
-                workspace__slug=slug, created_by=request.user
-            ).values_list("pk", flat=True),
-        ).count()
-
+        counters = get_unread_counters(slug, request.user.id)
         return Response(
             {
-                "watching_issues": watching_issues_count,
-                "my_issues": my_issues_count,
-                "created_issues": created_issues_count,
+                "watching_issues": counters["watching_issues"],
+                "my_issues": counters["my_issues"],
+                "created_issues": counters["created_issues"],
             },
             status=status.HTTP_200_OK,
         )
 
 
+def update_by_pk_range(
+    queryset, chunk_size=NOTIFICATION_UPDATE_CHUNK, **values
+):
+    """
+    Apply a set based UPDATE to the queryset, split into primary key ranges
+    of chunk_size rows so very large sets do not hold one long lock
+
+    Returns the number of rows updated
+    """
+    queryset = queryset.order_by("pk")
+    updated = 0
+    last_pk = None
+    while True:
+        chunk = (
+            queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        )
+        # Primary key of the last row of the chunk
+        boundary = next(
+            iter(
+                chunk.values_list("pk", flat=True)[
+                    chunk_size - 1 : chunk_size
+                ]
+            ),
+            None,
+        )
+        if boundary is None:
+            return updated + chunk.update(**values)
+        updated += chunk.filter(pk__lte=boundary).update(**values)
+        last_pk = boundary
+
+
 class MarkAllReadNotificationViewSet(BaseViewSet):
-    def create(self, request, slug):
+    def get_notifications(self, request, slug, **filters):
         snoozed = request.data.get("snoozed", False)
-        archived = request.data.get("archived", False)
         type = request.data.get("type", "all")
 
-        notifications = (
-            Notification.objects.filter(
-                workspace__slug=slug,
-                receiver_id=request.user.id,
-                read_at__isnull=True,
-            )
-            .select_related("workspace", "project", "triggered_by", "receiver")
-            .order_by("snoozed_till", "-created_at")
+        notifications = Notification.objects.filter(
+            workspace__slug=slug,
+            receiver_id=request.user.id,
+            **filters,
         )
 
         # Filter for snoozed notifications
@@ -265,12 +307,6 @@ class MarkAllReadNotificationViewSet(BaseViewSet):
                 | Q(snoozed_till__isnull=True),
             )
 
-        # Filter for archived or unarchive
-        if archived:
-            notifications = notifications.filter(archived_at__isnull=False)
-        else:
-            notifications = notifications.filter(archived_at__isnull=True)
-
         # Subscribed issues
         if type == "watching":
             issue_ids = IssueSubscriber.objects.filter(
@@ -306,14 +342,40 @@ class MarkAllReadNotificationViewSet(BaseViewSet):
                     entity_identifier__in=issue_ids
                 )
 
-        updated_notifications = []
-        for notification in notifications:
-            notification.read_at = timezone.now()
-            updated_notifications.append(notification)
-        Notification.objects.bulk_update(
-            updated_notifications, ["read_at"], batch_size=100
+        return notifications
+
+    def updated(self, request, slug, count):
+        # The counters are rebuilt from the database on the next read
+        reset_unread_counters(slug, request.user.id)
+        return Response(
+            {"message": "Successful", "count": count},
+            status=status.HTTP_200_OK,
+        )
+
+    def create(self, request, slug):
+        archived = request.data.get("archived", False)
+        notifications = self.get_notifications(
+            request,
+            slug,
+            read_at__isnull=True,
+            archived_at__isnull=not archived,
+        )
+        count = update_by_pk_range(notifications, read_at=timezone.now())
+        return self.updated(request, slug, count)
+
+    def archive(self, request, slug):
+        notifications = self.get_notifications(
+            request, slug, archived_at__isnull=True
+        )
+        count = update_by_pk_range(notifications, archived_at=timezone.now())
+        return self.updated(request, slug, count)
+
+    def unarchive(self, request, slug):
+        notifications = self.get_notifications(
+            request, slug, archived_at__isnull=False
         )
-        return Response({"message": "Successful"}, status=status.HTTP_200_OK)
+        count = update_by_pk_range(notifications, archived_at=None)
+        return self.updated(request, slug, count)
 
 
 class UserNotificationPreferenceEndpoint(BaseAPIView):
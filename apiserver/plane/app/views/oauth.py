@@ -20,6 +20,7 @@ from google.oauth2 import id_token
 from google.auth.transport import requests as google_auth_request
 
 # Module imports
+from plane.db.models.workspace import invalidate_memberships
 from plane.db.models import (
     SocialLoginConnection,
     User,
@@ -279,6 +280,7 @@ class OauthEndpoint(BaseAPIView):
             # Delete all the invites
             workspace_member_invites.delete()
             project_member_invites.delete()
+            invalidate_memberships([user.id])
 
             SocialLoginConnection.objects.update_or_create(
                 medium=medium,
@@ -420,6 +422,7 @@ class OauthEndpoint(BaseAPIView):
             # Delete all the invites
             workspace_member_invites.delete()
             project_member_invites.delete()
+            invalidate_memberships([user.id])
 
             # Send event
             auth_events.delay(
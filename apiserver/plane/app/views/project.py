@@ -46,6 +46,7 @@ from plane.app.permissions import (
     ProjectLitePermission,
 )
 
+from plane.db.models.workspace import invalidate_memberships
 from plane.db.models import (
     Project,
     ProjectMember,
@@ -519,6 +520,7 @@ class UserProjectInvitationsViewset(BaseViewSet):
             ],
             ignore_conflicts=True,
         )
+        invalidate_memberships([request.user.id])
 
         IssueProperty.objects.bulk_create(
             [
@@ -729,6 +731,7 @@ class ProjectMemberViewSet(BaseViewSet):
             batch_size=10,
             ignore_conflicts=True,
         )
+        invalidate_memberships([member.get("member_id") for member in members])
 
         _ = IssueProperty.objects.bulk_create(
             bulk_issue_props, batch_size=10, ignore_conflicts=True
@@ -900,6 +903,9 @@ class AddTeamToProjectEndpoint(BaseAPIView):
         ProjectMember.objects.bulk_create(
             project_members, batch_size=10, ignore_conflicts=True
         )
+        invalidate_memberships(
+            [project_member.member_id for project_member in project_members]
+        )
 
         _ = IssueProperty.objects.bulk_create(
             issue_props, batch_size=10, ignore_conflicts=True
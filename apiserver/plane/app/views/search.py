@@ -2,7 +2,9 @@
 import re
 
 # Django imports
-from django.db.models import Q
+from django.contrib.postgres.search import SearchRank, TrigramSimilarity
+from django.db.models import Q, F, Window
+from django.db.models.functions import RowNumber
 
 # Third party imports
 from rest_framework import status
@@ -14,12 +16,17 @@ from plane.db.models import (
     Workspace,
     Project,
     Issue,
-    Cycle,
-    Module,
-    Page,
-    IssueView,
+    ProjectMember,
+    InboxIssue,
+    SearchDocument,
 )
-from plane.utils.issue_search import search_issues
+from plane.utils.issue_search import search_issues, build_search_query
+
+# Maximum results returned per entity type
+SEARCH_RESULTS_LIMIT = 25
+
+# Entity types served from the search documents
+SEARCH_ENTITY_TYPES = ("issue", "cycle", "module", "issue_view", "page")
 
 
 class GlobalSearchEndpoint(BaseAPIView):
@@ -56,127 +63,77 @@ class GlobalSearchEndpoint(BaseAPIView):
             .values("name", "id", "identifier", "workspace__slug")
         )
 
-    def filter_issues(self, query, slug, project_id, workspace_search):
-        fields = ["name", "sequence_id", "project__identifier"]
-        q = Q()
-        for field in fields:
-            if field == "sequence_id":
-                # Match whole integers only (exclude decimal numbers)
-                sequences = re.findall(r"\b\d+\b", query)
-                for sequence_id in sequences:
-                    q |= Q(**{"sequence_id": sequence_id})
-            else:
-                q |= Q(**{f"{field}__icontains": query})
-
-        issues = Issue.issue_objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            workspace__slug=slug,
-        )
-
-        if workspace_search == "false" and project_id:
-            issues = issues.filter(project_id=project_id)
-
-        return issues.distinct().values(
-            "name",
-            "id",
-            "sequence_id",
-            "project__identifier",
-            "project_id",
-            "workspace__slug",
-        )
-
-    def filter_cycles(self, query, slug, project_id, workspace_search):
-        fields = ["name"]
-        q = Q()
-        for field in fields:
-            q |= Q(**{f"{field}__icontains": query})
-
-        cycles = Cycle.objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            workspace__slug=slug,
-        )
-
-        if workspace_search == "false" and project_id:
-            cycles = cycles.filter(project_id=project_id)
-
-        return cycles.distinct().values(
-            "name",
-            "id",
-            "project_id",
-            "project__identifier",
-            "workspace__slug",
-        )
-
-    def filter_modules(self, query, slug, project_id, workspace_search):
-        fields = ["name"]
-        q = Q()
-        for field in fields:
-            q |= Q(**{f"{field}__icontains": query})
-
-        modules = Module.objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            workspace__slug=slug,
-        )
-
-        if workspace_search == "false" and project_id:
-            modules = modules.filter(project_id=project_id)
-
-        return modules.distinct().values(
-            "name",
-            "id",
-            "project_id",
-            "project__identifier",
-            "workspace__slug",
-        )
+    def filter_entities(self, query, slug, project_id, workspace_search):
+        """
+        Search issues, cycles, modules, pages and views in one ranked query
+        over the search documents and return the top matches of each type
+        """
+        search_query = build_search_query(query)
+        sequences = re.findall(r"\b\d+\b", query)
 
-    def filter_pages(self, query, slug, project_id, workspace_search):
-        fields = ["name"]
-        q = Q()
-        for field in fields:
-            q |= Q(**{f"{field}__icontains": query})
+        q = Q(name__icontains=query)
+        if search_query is not None:
+            q |= Q(search_vector=search_query)
+        if sequences:
+            q |= Q(entity_type="issue", sequence_id__in=sequences)
+        q |= Q(entity_type="issue", project__identifier__icontains=query)
 
-        pages = Page.objects.filter(
+        documents = SearchDocument.objects.filter(
             q,
-            project__project_projectmember__member=self.request.user,
             workspace__slug=slug,
+            is_hidden=False,
+            project_id__in=ProjectMember.objects.filter(
+                workspace__slug=slug, member=self.request.user
+            ).values("project_id"),
+        ).exclude(
+            entity_type="issue",
+            entity_identifier__in=InboxIssue.objects.filter(
+                workspace__slug=slug, status__in=[-2, 0]
+            ).values("issue_id"),
         )
 
         if workspace_search == "false" and project_id:
-            pages = pages.filter(project_id=project_id)
-
-        return pages.distinct().values(
-            "name",
-            "id",
-            "project_id",
-            "project__identifier",
-            "workspace__slug",
-        )
-
-    def filter_views(self, query, slug, project_id, workspace_search):
-        fields = ["name"]
-        q = Q()
-        for field in fields:
-            q |= Q(**{f"{field}__icontains": query})
-
-        issue_views = IssueView.objects.filter(
-            q,
-            project__project_projectmember__member=self.request.user,
-            workspace__slug=slug,
+            documents = documents.filter(project_id=project_id)
+
+        rank = TrigramSimilarity("name", query)
+        if search_query is not None:
+            rank = rank + SearchRank(F("search_vector"), search_query)
+
+        documents = (
+            documents.annotate(rank=rank)
+            .annotate(
+                position=Window(
+                    expression=RowNumber(),
+                    partition_by=[F("entity_type")],
+                    order_by=[F("rank").desc(), F("created_at").desc()],
+                )
+            )
+            .filter(position__lte=SEARCH_RESULTS_LIMIT)
+            .order_by("entity_type", "position")
+            .values(
+                "entity_type",
+                "entity_identifier",
+                "name",
+                "sequence_id",
+                "project_id",
+                "project__identifier",
+                "workspace__slug",
+            )
         )
 
-        if workspace_search == "false" and project_id:
-            issue_views = issue_views.filter(project_id=project_id)
-
-        return issue_views.distinct().values(
-            "name",
-            "id",
-            "project_id",
-            "project__identifier",
-            "workspace__slug",
-        )
+        results = {entity_type: [] for entity_type in SEARCH_ENTITY_TYPES}
+        for document in documents:
+            result = {
+                "name": document["name"],
+                "id": document["entity_identifier"],
+                "project_id": document["project_id"],
+                "project__identifier": document["project__identifier"],
+                "workspace__slug": document["workspace__slug"],
+            }
+            if document["entity_type"] == "issue":
+                result["sequence_id"] = document["sequence_id"]
+            results[document["entity_type"]].append(result)
+        return results
 
     def get(self, request, slug):
         query = request.query_params.get("search", False)
@@ -204,11 +161,6 @@ class GlobalSearchEndpoint(BaseAPIView):
         MODELS_MAPPER = {
             "workspace": self.filter_workspaces,
             "project": self.filter_projects,
-            "issue": self.filter_issues,
-            "cycle": self.filter_cycles,
-            "module": self.filter_modules,
-            "issue_view": self.filter_views,
-            "page": self.filter_pages,
         }
 
         results = {}
@@ -216,6 +168,9 @@ class GlobalSearchEndpoint(BaseAPIView):
         for model in MODELS_MAPPER.keys():
             func = MODELS_MAPPER.get(model, None)
             results[model] = func(query, slug, project_id, workspace_search)
+        results.update(
+            self.filter_entities(query, slug, project_id, workspace_search)
+        )
         return Response({"results": results}, status=status.HTTP_200_OK)
 
 
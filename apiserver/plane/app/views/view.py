@@ -2,7 +2,6 @@
 from django.db.models import (
     Prefetch,
     OuterRef,
-    Func,
     F,
     Case,
     Value,
@@ -40,11 +39,10 @@ from plane.db.models import (
     Issue,
     IssueViewFavorite,
     IssueReaction,
-    IssueLink,
-    IssueAttachment,
     IssueSubscriber,
 )
 from plane.utils.issue_filters import issue_filters
+from plane.utils.etag import conditional_issue_list
 from plane.utils.grouper import group_results
 
 
@@ -78,15 +76,7 @@ class GlobalViewIssuesViewSet(BaseViewSet):
 
     def get_queryset(self):
         return (
-            Issue.issue_objects.annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .filter(workspace__slug=self.kwargs.get("slug"))
+            Issue.issue_objects.filter(workspace__slug=self.kwargs.get("slug"))
             .select_related("workspace", "project", "state", "parent")
             .prefetch_related("assignees", "labels", "issue_module__module")
             .prefetch_related(
@@ -98,6 +88,7 @@ class GlobalViewIssuesViewSet(BaseViewSet):
         )
 
     @method_decorator(gzip_page)
+    @conditional_issue_list(scope="workspace")
     def list(self, request, slug):
         filters = issue_filters(request.query_params, "GET")
         fields = [
@@ -123,28 +114,6 @@ class GlobalViewIssuesViewSet(BaseViewSet):
             .filter(**filters)
             .filter(project__project_projectmember__member=self.request.user)
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         )
 
         # Priority Ordering
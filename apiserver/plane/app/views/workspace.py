@@ -52,6 +52,7 @@ from plane.app.serializers import (
 )
 from plane.app.views.base import BaseAPIView
 from . import BaseViewSet
+from plane.db.models.workspace import invalidate_memberships
 from plane.db.models import (
     State,
     User,
@@ -62,8 +63,6 @@ from plane.db.models import (
     IssueActivity,
     Issue,
     WorkspaceTheme,
-    IssueLink,
-    IssueAttachment,
     IssueSubscriber,
     Project,
     Label,
@@ -84,6 +83,7 @@ from plane.app.permissions import (
 )
 from plane.bgtasks.workspace_invitation_task import workspace_invitation
 from plane.utils.issue_filters import issue_filters
+from plane.utils.issue_stats import get_issue_stats
 from plane.bgtasks.event_tracking_task import workspace_invite_event
 
 
@@ -508,6 +508,7 @@ class UserWorkspaceInvitationsViewSet(BaseViewSet):
             ],
             ignore_conflicts=True,
         )
+        invalidate_memberships([request.user.id])
 
         # Delete joined workspace invites
         workspace_invitations.delete()
@@ -1069,96 +1070,25 @@ class WorkspaceThemeViewSet(BaseViewSet):
 class WorkspaceUserProfileStatsEndpoint(BaseAPIView):
     def get(self, request, slug, user_id):
         filters = issue_filters(request.query_params, "GET")
+        stats = get_issue_stats(slug, user_id, request.user.id, filters)
 
-        state_distribution = (
-            Issue.issue_objects.filter(
-                workspace__slug=slug,
-                assignees__in=[user_id],
-                project__project_projectmember__member=request.user,
-            )
-            .filter(**filters)
-            .annotate(state_group=F("state__group"))
-            .values("state_group")
-            .annotate(state_count=Count("state_group"))
-            .order_by("state_group")
-        )
-
-        priority_order = ["urgent", "high", "medium", "low", "none"]
-
-        priority_distribution = (
-            Issue.issue_objects.filter(
-                workspace__slug=slug,
-                assignees__in=[user_id],
-                project__project_projectmember__member=request.user,
-            )
-            .filter(**filters)
-            .values("priority")
-            .annotate(priority_count=Count("priority"))
-            .filter(priority_count__gte=1)
-            .annotate(
-                priority_order=Case(
-                    *[
-                        When(priority=p, then=Value(i))
-                        for i, p in enumerate(priority_order)
-                    ],
-                    default=Value(len(priority_order)),
-                    output_field=IntegerField(),
-                )
-            )
-            .order_by("priority_order")
-        )
-
-        created_issues = (
-            Issue.issue_objects.filter(
-                workspace__slug=slug,
-                project__project_projectmember__member=request.user,
-                created_by_id=user_id,
-            )
-            .filter(**filters)
-            .count()
-        )
-
-        assigned_issues_count = (
-            Issue.issue_objects.filter(
-                workspace__slug=slug,
-                assignees__in=[user_id],
-                project__project_projectmember__member=request.user,
-            )
-            .filter(**filters)
-            .count()
-        )
-
-        pending_issues_count = (
-            Issue.issue_objects.filter(
-                ~Q(state__group__in=["completed", "cancelled"]),
-                workspace__slug=slug,
-                assignees__in=[user_id],
-                project__project_projectmember__member=request.user,
-            )
-            .filter(**filters)
-            .count()
-        )
-
-        completed_issues_count = (
-            Issue.issue_objects.filter(
-                workspace__slug=slug,
-                assignees__in=[user_id],
-                state__group="completed",
-                project__project_projectmember__member=request.user,
-            )
-            .filter(**filters)
-            .count()
-        )
+        state_distribution = [
+            {"state_group": group, "state_count": count}
+            for group, count in sorted(stats["state_groups"].items())
+            if count
+        ]
 
-        subscribed_issues_count = (
-            IssueSubscriber.objects.filter(
-                workspace__slug=slug,
-                subscriber_id=user_id,
-                project__project_projectmember__member=request.user,
+        priority_distribution = [
+            {
+                "priority": priority,
+                "priority_count": count,
+                "priority_order": priority_order,
+            }
+            for priority_order, (priority, count) in enumerate(
+                stats["priorities"].items()
             )
-            .filter(**filters)
-            .count()
-        )
+            if count
+        ]
 
         upcoming_cycles = CycleIssue.objects.filter(
             workspace__slug=slug,
@@ -1181,11 +1111,11 @@ class WorkspaceUserProfileStatsEndpoint(BaseAPIView):
             {
                 "state_distribution": state_distribution,
                 "priority_distribution": priority_distribution,
-                "created_issues": created_issues,
-                "assigned_issues": assigned_issues_count,
-                "completed_issues": completed_issues_count,
-                "pending_issues": pending_issues_count,
-                "subscribed_issues": subscribed_issues_count,
+                "created_issues": stats["created"],
+                "assigned_issues": stats["assigned"],
+                "completed_issues": stats["completed"],
+                "pending_issues": stats["pending"],
+                "subscribed_issues": stats["subscribed"],
                 "present_cycles": present_cycle,
                 "upcoming_cycles": upcoming_cycles,
             }
@@ -1348,28 +1278,6 @@ class WorkspaceUserProfileIssuesEndpoint(BaseAPIView):
             .select_related("workspace", "project", "state", "parent")
             .prefetch_related("assignees", "labels", "issue_module__module")
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .order_by("created_at")
         ).distinct()
 
@@ -0,0 +1,116 @@
+# Python imports
+import json
+from datetime import timedelta
+
+# Django imports
+from django.conf import settings
+from django.utils import timezone
+
+# Third party imports
+from celery import shared_task
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.db.models import APIActivityLog
+from plane.db.models.api import API_ACTIVITY_LOG_QUEUE_KEY
+from plane.settings.redis import redis_instance
+
+API_ACTIVITY_LOG_BATCH_SIZE = 1000
+# A batch stays in the processing list until its insert has committed, a
+# failed or crashed flush leaves it there for the next flush
+API_ACTIVITY_LOG_PROCESSING_KEY = "api_activity_logs:processing"
+API_ACTIVITY_LOG_FLUSH_LOCK_KEY = "api_activity_logs:flush_lock"
+API_ACTIVITY_LOG_FLUSH_LOCK_TIMEOUT = 300
+
+# Move the next batch of the queue into the empty processing list
+#
+# KEYS: queue, processing
+# ARGV: batch size
+MOVE_BATCH_SCRIPT = """
+local records = redis.call("LRANGE", KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #records > 0 then
+    redis.call("LTRIM", KEYS[1], #records, -1)
+    redis.call("RPUSH", KEYS[2], unpack(records))
+end
+return records
+"""
+
+
+def next_api_activity_logs(ri):
+    """The batch left over by a failed flush first, otherwise a new one"""
+    records = ri.lrange(API_ACTIVITY_LOG_PROCESSING_KEY, 0, -1)
+    if records:
+        return records
+    return ri.register_script(MOVE_BATCH_SCRIPT)(
+        keys=[API_ACTIVITY_LOG_QUEUE_KEY, API_ACTIVITY_LOG_PROCESSING_KEY],
+        args=[API_ACTIVITY_LOG_BATCH_SIZE],
+    )
+
+
+def build_api_activity_logs(records):
+    api_activity_logs = []
+    for record in records:
+        try:
+            api_activity_logs.append(APIActivityLog(**json.loads(record)))
+        except (TypeError, ValueError) as e:
+            # A malformed record would block the batch forever
+            capture_exception(e)
+    return api_activity_logs
+
+
+@shared_task
+def flush_api_activity_logs():
+    """Write the queued API activity logs in batches"""
+    ri = redis_instance()
+    try:
+        # One flush at a time shares the processing list
+        if not ri.set(
+            API_ACTIVITY_LOG_FLUSH_LOCK_KEY,
+            1,
+            nx=True,
+            ex=API_ACTIVITY_LOG_FLUSH_LOCK_TIMEOUT,
+        ):
+            return
+    except Exception as e:
+        capture_exception(e)
+        return
+
+    try:
+        while True:
+            records = next_api_activity_logs(ri)
+            if not records:
+                return
+
+            APIActivityLog.objects.bulk_create(
+                build_api_activity_logs(records),
+                batch_size=API_ACTIVITY_LOG_BATCH_SIZE,
+            )
+            ri.delete(API_ACTIVITY_LOG_PROCESSING_KEY)
+
+            if len(records) < API_ACTIVITY_LOG_BATCH_SIZE:
+                return
+    except Exception as e:
+        capture_exception(e)
+    finally:
+        try:
+            ri.delete(API_ACTIVITY_LOG_FLUSH_LOCK_KEY)
+        except Exception as e:
+            # The lock expires on its own
+            capture_exception(e)
+
+
+@shared_task
+def delete_old_api_activity_logs():
+    """Prune the API activity logs past the retention period a day at a time"""
+    cutoff = timezone.now() - timedelta(
+        days=settings.API_ACTIVITY_LOG_RETENTION_DAYS
+    )
+    oldest = (
+        APIActivityLog.objects.filter(created_at__lt=cutoff)
+        .order_by("created_at")
+        .values_list("created_at", flat=True)
+        .first()
+    )
+    while oldest is not None and oldest < cutoff:
+        oldest = min(oldest + timedelta(days=1), cutoff)
+        APIActivityLog.objects.filter(created_at__lt=oldest).delete()
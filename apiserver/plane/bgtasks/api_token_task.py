@@ -0,0 +1,39 @@
+# Django imports
+from django.utils.dateparse import parse_datetime
+
+# Third party imports
+from celery import shared_task
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.db.models import APIToken
+from plane.db.models.api import API_TOKEN_LAST_USED_KEY
+from plane.settings.redis import redis_instance
+
+
+@shared_task
+def flush_api_token_last_used():
+    """Write the last used timestamps recorded on authentication"""
+    try:
+        # Read and clear atomically so uses recorded meanwhile are kept
+        pipeline = redis_instance().pipeline()
+        pipeline.hgetall(API_TOKEN_LAST_USED_KEY)
+        pipeline.delete(API_TOKEN_LAST_USED_KEY)
+        last_used, _ = pipeline.execute()
+    except Exception as e:
+        capture_exception(e)
+        return
+
+    if not last_used:
+        return
+
+    APIToken.objects.bulk_update(
+        [
+            APIToken(
+                id=token_id.decode(), last_used=parse_datetime(value.decode())
+            )
+            for token_id, value in last_used.items()
+        ],
+        ["last_used"],
+        batch_size=500,
+    )
@@ -2,11 +2,16 @@
 import csv
 import io
 import json
+import shutil
+import tempfile
 import boto3
 import zipfile
 
 # Django imports
 from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import OuterRef, Q, Subquery, Value
+from django.db.models.functions import Concat
 from django.utils import timezone
 
 # Third party imports
@@ -16,7 +21,19 @@ from botocore.client import Config
 from openpyxl import Workbook
 
 # Module imports
-from plane.db.models import Issue, ExporterHistory
+from plane.db.models import (
+    Issue,
+    IssueAssignee,
+    IssueLabel,
+    ExporterHistory,
+)
+
+# Issues fetched from the database at a time
+EXPORT_CHUNK_SIZE = 2000
+# Issues exported between progress updates
+EXPORT_PROGRESS_INTERVAL = 1000
+# Size past which the archive is written to disk
+EXPORT_SPOOL_SIZE = 10 * 1024 * 1024
 
 
 def dateTimeConverter(time):
@@ -29,42 +46,46 @@ def dateConverter(time):
         return time.strftime("%a, %d %b %Y")
 
 
-def create_csv_file(data):
-    csv_buffer = io.StringIO()
+def write_csv(header, rows, file):
+    csv_buffer = io.TextIOWrapper(file, encoding="utf-8", newline="")
     csv_writer = csv.writer(csv_buffer, delimiter=",", quoting=csv.QUOTE_ALL)
 
-    for row in data:
+    csv_writer.writerow(header)
+    for row in rows:
         csv_writer.writerow(row)
 
-    csv_buffer.seek(0)
-    return csv_buffer.getvalue()
-
+    csv_buffer.flush()
+    csv_buffer.detach()
 
-def create_json_file(data):
-    return json.dumps(data)
 
+def write_json(header, rows, file):
+    json_buffer = io.TextIOWrapper(file, encoding="utf-8")
 
-def create_xlsx_file(data):
-    workbook = Workbook()
-    sheet = workbook.active
+    # Written as a single array one issue at a time
+    json_buffer.write("[")
+    for index, row in enumerate(rows):
+        if index:
+            json_buffer.write(", ")
+        json_buffer.write(json.dumps(row))
+    json_buffer.write("]")
 
-    for row in data:
-        sheet.append(row)
+    json_buffer.flush()
+    json_buffer.detach()
 
-    xlsx_buffer = io.BytesIO()
-    workbook.save(xlsx_buffer)
-    xlsx_buffer.seek(0)
-    return xlsx_buffer.getvalue()
 
+def write_xlsx(header, rows, file):
+    # Write only workbooks keep the rows in a temporary file
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
 
-def create_zip_file(files):
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for filename, file_content in files:
-            zipf.writestr(filename, file_content)
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
 
-    zip_buffer.seek(0)
-    return zip_buffer
+    with tempfile.TemporaryFile() as xlsx_buffer:
+        workbook.save(xlsx_buffer)
+        xlsx_buffer.seek(0)
+        shutil.copyfileobj(xlsx_buffer, file)
 
 
 def upload_to_s3(zip_file, workspace_id, token_id, slug):
@@ -147,10 +168,8 @@ def generate_table_row(issue):
         f"{issue['created_by__first_name']} {issue['created_by__last_name']}"
         if issue["created_by__first_name"] and issue["created_by__last_name"]
         else "",
-        f"{issue['assignees__first_name']} {issue['assignees__last_name']}"
-        if issue["assignees__first_name"] and issue["assignees__last_name"]
-        else "",
-        issue["labels__name"],
+        ", ".join(issue["assignee_names"] or []),
+        ", ".join(issue["label_names"] or []) or None,
         issue["issue_cycle__cycle__name"],
         dateConverter(issue["issue_cycle__cycle__start_date"]),
         dateConverter(issue["issue_cycle__cycle__end_date"]),
@@ -175,10 +194,8 @@ def generate_json_row(issue):
         "Created By": f"{issue['created_by__first_name']} {issue['created_by__last_name']}"
         if issue["created_by__first_name"] and issue["created_by__last_name"]
         else "",
-        "Assignee": f"{issue['assignees__first_name']} {issue['assignees__last_name']}"
-        if issue["assignees__first_name"] and issue["assignees__last_name"]
-        else "",
-        "Labels": issue["labels__name"],
+        "Assignee": ", ".join(issue["assignee_names"] or []),
+        "Labels": ", ".join(issue["label_names"] or []) or None,
         "Cycle Name": issue["issue_cycle__cycle__name"],
         "Cycle Start Date": dateConverter(
             issue["issue_cycle__cycle__start_date"]
@@ -198,83 +215,138 @@ def generate_json_row(issue):
     }
 
 
-def update_json_row(rows, row):
-    matched_index = next(
-        (
-            index
-            for index, existing_row in enumerate(rows)
-            if existing_row["ID"] == row["ID"]
-        ),
-        None,
-    )
+def unique_rows(rows, key):
+    """
+    Skip the repeated rows of an issue, the export query returns a row per
+    module of the issue and the first one is exported
 
-    if matched_index is not None:
-        existing_assignees, existing_labels = (
-            rows[matched_index]["Assignee"],
-            rows[matched_index]["Labels"],
+    Args:
+        rows (iterable): table or json rows ordered by issue
+        key (int|string): column holding the issue identifier
+    """
+    previous = None
+    for row in rows:
+        if row[key] != previous:
+            previous = row[key]
+            yield row
+
+
+class ExportProgress:
+    """Count the exported issues and record them on the exporter history"""
+
+    def __init__(self, exporter_id):
+        self.exporter_id = exporter_id
+        self.exported = 0
+
+    def track(self, rows):
+        for row in rows:
+            yield row
+            self.exported += 1
+            if self.exported % EXPORT_PROGRESS_INTERVAL == 0:
+                self.save()
+
+    def save(self):
+        ExporterHistory.objects.filter(pk=self.exporter_id).update(
+            exported_issues=self.exported
         )
-        assignee, label = row["Assignee"], row["Labels"]
-
-        if assignee is not None and assignee not in existing_assignees:
-            rows[matched_index]["Assignee"] += f", {assignee}"
-        if label is not None and label not in existing_labels:
-            rows[matched_index]["Labels"] += f", {label}"
-    else:
-        rows.append(row)
-
-
-def update_table_row(rows, row):
-    matched_index = next(
-        (
-            index
-            for index, existing_row in enumerate(rows)
-            if existing_row[0] == row[0]
-        ),
-        None,
-    )
-
-    if matched_index is not None:
-        existing_assignees, existing_labels = rows[matched_index][7:9]
-        assignee, label = row[7:9]
-
-        if assignee is not None and assignee not in existing_assignees:
-            rows[matched_index][7] += f", {assignee}"
-        if label is not None and label not in existing_labels:
-            rows[matched_index][8] += f", {label}"
-    else:
-        rows.append(row)
 
 
-def generate_csv(header, project_id, issues, files):
+def generate_csv(header, name, issues, zip_file, progress):
     """
     Generate CSV export for all the passed issues.
     """
-    rows = [
-        header,
-    ]
-    for issue in issues:
-        row = generate_table_row(issue)
-        update_table_row(rows, row)
-    csv_file = create_csv_file(rows)
-    files.append((f"{project_id}.csv", csv_file))
+    rows = unique_rows(map(generate_table_row, issues), 0)
+    with zip_file.open(f"{name}.csv", "w", force_zip64=True) as file:
+        write_csv(header, progress.track(rows), file)
 
 
-def generate_json(header, project_id, issues, files):
-    rows = []
-    for issue in issues:
-        row = generate_json_row(issue)
-        update_json_row(rows, row)
-    json_file = create_json_file(rows)
-    files.append((f"{project_id}.json", json_file))
+def generate_json(header, name, issues, zip_file, progress):
+    rows = unique_rows(map(generate_json_row, issues), "ID")
+    with zip_file.open(f"{name}.json", "w", force_zip64=True) as file:
+        write_json(header, progress.track(rows), file)
 
 
-def generate_xlsx(header, project_id, issues, files):
-    rows = [header]
-    for issue in issues:
-        row = generate_table_row(issue)
-        update_table_row(rows, row)
-    xlsx_file = create_xlsx_file(rows)
-    files.append((f"{project_id}.xlsx", xlsx_file))
+def generate_xlsx(header, name, issues, zip_file, progress):
+    rows = unique_rows(map(generate_table_row, issues), 0)
+    with zip_file.open(f"{name}.xlsx", "w", force_zip64=True) as file:
+        write_xlsx(header, progress.track(rows), file)
+
+
+def export_rows(issues):
+    """
+    Values of the exported issues ordered by issue, with the assignee and
+    label names merged on one row. Issues in several modules come back
+    once per module
+    """
+    return (
+        (
+            issues.annotate(
+                # Aggregated per issue instead of returning a row per
+                # assignee and label combination
+                assignee_names=Subquery(
+                    IssueAssignee.objects.filter(
+                        ~Q(assignee__first_name=""),
+                        ~Q(assignee__last_name=""),
+                        issue_id=OuterRef("id"),
+                    )
+                    .order_by()
+                    .values("issue_id")
+                    .annotate(
+                        names=ArrayAgg(
+                            Concat(
+                                "assignee__first_name",
+                                Value(" "),
+                                "assignee__last_name",
+                            ),
+                            distinct=True,
+                        )
+                    )
+                    .values("names")
+                ),
+                label_names=Subquery(
+                    IssueLabel.objects.filter(issue_id=OuterRef("id"))
+                    .order_by()
+                    .values("issue_id")
+                    .annotate(names=ArrayAgg("label__name", distinct=True))
+                    .values("names")
+                ),
+            )
+            .select_related(
+                "project", "workspace", "state", "parent", "created_by"
+            )
+            .prefetch_related(
+                "issue_cycle__cycle",
+                "issue_module__module",
+            )
+            .values(
+                "id",
+                "project__identifier",
+                "project__name",
+                "project__id",
+                "sequence_id",
+                "name",
+                "description_stripped",
+                "priority",
+                "state__name",
+                "created_at",
+                "updated_at",
+                "completed_at",
+                "archived_at",
+                "issue_cycle__cycle__name",
+                "issue_cycle__cycle__start_date",
+                "issue_cycle__cycle__end_date",
+                "issue_module__module__name",
+                "issue_module__module__start_date",
+                "issue_module__module__target_date",
+                "created_by__first_name",
+                "created_by__last_name",
+                "assignee_names",
+                "label_names",
+            )
+        )
+        .order_by("project__identifier", "sequence_id")
+        .distinct()
+    )
 
 
 @shared_task
@@ -283,55 +355,22 @@ def issue_export_task(
 ):
     try:
         exporter_instance = ExporterHistory.objects.get(token=token_id)
+        issues = Issue.objects.filter(
+            workspace__id=workspace_id,
+            project_id__in=project_ids,
+            project__project_projectmember__member=exporter_instance.initiated_by_id,
+        )
         exporter_instance.status = "processing"
-        exporter_instance.save(update_fields=["status"])
-
-        workspace_issues = (
-            (
-                Issue.objects.filter(
-                    workspace__id=workspace_id,
-                    project_id__in=project_ids,
-                    project__project_projectmember__member=exporter_instance.initiated_by_id,
-                )
-                .select_related(
-                    "project", "workspace", "state", "parent", "created_by"
-                )
-                .prefetch_related(
-                    "assignees",
-                    "labels",
-                    "issue_cycle__cycle",
-                    "issue_module__module",
-                )
-                .values(
-                    "id",
-                    "project__identifier",
-                    "project__name",
-                    "project__id",
-                    "sequence_id",
-                    "name",
-                    "description_stripped",
-                    "priority",
-                    "state__name",
-                    "created_at",
-                    "updated_at",
-                    "completed_at",
-                    "archived_at",
-                    "issue_cycle__cycle__name",
-                    "issue_cycle__cycle__start_date",
-                    "issue_cycle__cycle__end_date",
-                    "issue_module__module__name",
-                    "issue_module__module__start_date",
-                    "issue_module__module__target_date",
-                    "created_by__first_name",
-                    "created_by__last_name",
-                    "assignees__first_name",
-                    "assignees__last_name",
-                    "labels__name",
-                )
-            )
-            .order_by("project__identifier", "sequence_id")
-            .distinct()
+        exporter_instance.total_issues = (
+            issues.order_by().values("id").distinct().count()
         )
+        exporter_instance.exported_issues = 0
+        exporter_instance.save(
+            update_fields=["status", "total_issues", "exported_issues"]
+        )
+
+        workspace_issues = export_rows(issues)
+
         # CSV header
         header = [
             "ID",
@@ -361,31 +400,42 @@ def issue_export_task(
             "xlsx": generate_xlsx,
         }
 
-        files = []
-        if multiple:
-            for project_id in project_ids:
-                issues = workspace_issues.filter(project__id=project_id)
-                exporter = EXPORTER_MAPPER.get(provider)
+        progress = ExportProgress(exporter_instance.id)
+        exporter = EXPORTER_MAPPER.get(provider)
+        # The archive is spooled to disk past EXPORT_SPOOL_SIZE and
+        # uploaded in parts
+        with tempfile.SpooledTemporaryFile(
+            max_size=EXPORT_SPOOL_SIZE
+        ) as zip_buffer:
+            with zipfile.ZipFile(
+                zip_buffer, "w", zipfile.ZIP_DEFLATED
+            ) as zip_file:
                 if exporter is not None:
-                    exporter(
-                        header,
-                        project_id,
-                        issues,
-                        files,
-                    )
-
-        else:
-            exporter = EXPORTER_MAPPER.get(provider)
-            if exporter is not None:
-                exporter(
-                    header,
-                    workspace_id,
-                    workspace_issues,
-                    files,
-                )
-
-        zip_buffer = create_zip_file(files)
-        upload_to_s3(zip_buffer, workspace_id, token_id, slug)
+                    if multiple:
+                        for project_id in project_ids:
+                            exporter(
+                                header,
+                                project_id,
+                                workspace_issues.filter(
+                                    project__id=project_id
+                                ).iterator(chunk_size=EXPORT_CHUNK_SIZE),
+                                zip_file,
+                                progress,
+                            )
+                    else:
+                        exporter(
+                            header,
+                            workspace_id,
+                            workspace_issues.iterator(
+                                chunk_size=EXPORT_CHUNK_SIZE
+                            ),
+                            zip_file,
+                            progress,
+                        )
+
+            progress.save()
+            zip_buffer.seek(0)
+            upload_to_s3(zip_buffer, workspace_id, token_id, slug)
 
     except Exception as e:
         exporter_instance = ExporterHistory.objects.get(token=token_id)
@@ -14,6 +14,7 @@ from sentry_sdk import capture_exception
 
 # Module imports
 from plane.app.serializers import ImporterSerializer
+from plane.db.models.workspace import invalidate_memberships
 from plane.db.models import (
     Importer,
     WorkspaceMember,
@@ -111,6 +112,7 @@ def service_importer(service, importer_id):
                 batch_size=100,
                 ignore_conflicts=True,
             )
+            invalidate_memberships([user.id for user in workspace_users])
 
             IssueProperty.objects.bulk_create(
                 [
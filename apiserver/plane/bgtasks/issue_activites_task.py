@@ -1,13 +1,17 @@
 # Python imports
 import json
 import requests
+from uuid import UUID, uuid4
 
 # Django imports
 from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connection, transaction
 from django.utils import timezone
+from collections import defaultdict
 
 # Third Party imports
+import redis
 from celery import shared_task
 from sentry_sdk import capture_exception
 
@@ -29,6 +33,103 @@ from plane.db.models import (
 from plane.app.serializers import IssueActivitySerializer
 from plane.bgtasks.notification_task import notifications
 from plane.settings.redis import redis_instance
+from plane.db.models.analytic import refresh_issue_analytics
+from plane.utils.realtime import activity_changes, publish_issue_changes
+
+
+class ActivityLookups:
+    """
+    Lookup cache shared by the activity functions of a task. All the
+    referenced ids are collected up front and resolved with one in_bulk per
+    model, anything missed is fetched on demand and memoized.
+    """
+
+    def __init__(self):
+        self.ids = defaultdict(set)
+        self.objects = defaultdict(dict)
+
+    def querysets(self):
+        return {
+            State: State.objects.all(),
+            Label: Label.objects.all(),
+            User: User.objects.all(),
+            Cycle: Cycle.objects.all(),
+            Module: Module.objects.all(),
+            Issue: Issue.objects.select_related("project"),
+        }
+
+    def add(self, model, *pks):
+        for pk in pks:
+            if pk:
+                self.ids[model].add(str(pk))
+
+    def collect(self, type, requested_data, current_instance, issue_id):
+        requested_data = load_activity_json(requested_data) or {}
+        current_instance = load_activity_json(current_instance) or {}
+
+        if type in ("issue.activity.created", "issue.activity.updated"):
+            for data in (requested_data, current_instance):
+                self.add(State, data.get("state_id"), data.get("closed_to"))
+                self.add(Issue, data.get("parent_id"))
+                self.add(Label, *data.get("label_ids", None) or [])
+                self.add(User, *data.get("assignee_ids", None) or [])
+        elif type == "cycle.activity.created":
+            for record in current_instance.get("updated_cycle_issues", []):
+                self.add(
+                    Cycle,
+                    record.get("old_cycle_id"),
+                    record.get("new_cycle_id"),
+                )
+            for record in load_activity_json(
+                current_instance.get("created_cycle_issues", "[]")
+            ):
+                self.add(Cycle, record.get("fields", {}).get("cycle"))
+        elif type == "cycle.activity.deleted":
+            self.add(Cycle, requested_data.get("cycle_id"))
+        elif type == "module.activity.created":
+            self.add(Module, requested_data.get("module_id"))
+        elif type == "issue_relation.activity.created":
+            self.add(
+                Issue, issue_id, *requested_data.get("issues", None) or []
+            )
+        elif type == "issue_relation.activity.deleted":
+            self.add(Issue, issue_id, requested_data.get("related_issue"))
+
+    def load(self):
+        for model, queryset in self.querysets().items():
+            pks = self.ids.pop(model, set()) - set(self.objects[model])
+            if pks:
+                self.objects[model].update(
+                    {
+                        str(pk): obj
+                        for pk, obj in queryset.in_bulk(list(pks)).items()
+                    }
+                )
+                # Remember the misses so they are not queried again
+                for pk in pks:
+                    self.objects[model].setdefault(pk, None)
+
+    def get(self, model, pk):
+        if pk is None:
+            return None
+        pk = str(pk)
+        if pk not in self.objects[model]:
+            self.objects[model][pk] = (
+                self.querysets()[model].filter(pk=pk).first()
+            )
+        return self.objects[model][pk]
+
+    def get_or_raise(self, model, pk):
+        obj = self.get(model, pk)
+        if obj is None:
+            raise model.DoesNotExist(f"{model.__name__} {pk} does not exist")
+        return obj
+
+
+def load_activity_json(value):
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
 
 
 # Track Changes in name
@@ -41,6 +142,7 @@ def track_name(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if current_instance.get("name") != requested_data.get("name"):
         issue_activities.append(
@@ -69,6 +171,7 @@ def track_description(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if current_instance.get("description_html") != requested_data.get(
         "description_html"
@@ -112,18 +215,12 @@ def track_parent(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
+    lookups = lookups or ActivityLookups()
     if current_instance.get("parent_id") != requested_data.get("parent_id"):
-        old_parent = (
-            Issue.objects.filter(pk=current_instance.get("parent_id")).first()
-            if current_instance.get("parent_id") is not None
-            else None
-        )
-        new_parent = (
-            Issue.objects.filter(pk=requested_data.get("parent_id")).first()
-            if requested_data.get("parent_id") is not None
-            else None
-        )
+        old_parent = lookups.get(Issue, current_instance.get("parent_id"))
+        new_parent = lookups.get(Issue, requested_data.get("parent_id"))
 
         issue_activities.append(
             IssueActivity(
@@ -161,6 +258,7 @@ def track_priority(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if current_instance.get("priority") != requested_data.get("priority"):
         issue_activities.append(
@@ -189,11 +287,15 @@ def track_state(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if current_instance.get("state_id") != requested_data.get("state_id"):
-        new_state = State.objects.get(pk=requested_data.get("state_id", None))
-        old_state = State.objects.get(
-            pk=current_instance.get("state_id", None)
+        lookups = lookups or ActivityLookups()
+        new_state = lookups.get_or_raise(
+            State, requested_data.get("state_id", None)
+        )
+        old_state = lookups.get_or_raise(
+            State, current_instance.get("state_id", None)
         )
 
         issue_activities.append(
@@ -224,6 +326,7 @@ def track_target_date(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if current_instance.get("target_date") != requested_data.get(
         "target_date"
@@ -258,6 +361,7 @@ def track_start_date(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if current_instance.get("start_date") != requested_data.get("start_date"):
         issue_activities.append(
@@ -290,6 +394,7 @@ def track_labels(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_labels = set(
         [str(lab) for lab in requested_data.get("label_ids", [])]
@@ -301,9 +406,13 @@ def track_labels(
     added_labels = requested_labels - current_labels
     dropped_labels = current_labels - requested_labels
 
+    lookups = lookups or ActivityLookups()
+    lookups.add(Label, *added_labels, *dropped_labels)
+    lookups.load()
+
     # Set of newly added labels
     for added_label in added_labels:
-        label = Label.objects.get(pk=added_label)
+        label = lookups.get_or_raise(Label, added_label)
         issue_activities.append(
             IssueActivity(
                 issue_id=issue_id,
@@ -323,7 +432,7 @@ def track_labels(
 
     # Set of dropped labels
     for dropped_label in dropped_labels:
-        label = Label.objects.get(pk=dropped_label)
+        label = lookups.get_or_raise(Label, dropped_label)
         issue_activities.append(
             IssueActivity(
                 issue_id=issue_id,
@@ -352,6 +461,7 @@ def track_assignees(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_assignees = (
         set([str(asg) for asg in requested_data.get("assignee_ids", [])])
@@ -368,9 +478,13 @@ def track_assignees(
     added_assignees = requested_assignees - current_assignees
     dropped_assginees = current_assignees - requested_assignees
 
+    lookups = lookups or ActivityLookups()
+    lookups.add(User, *added_assignees, *dropped_assginees)
+    lookups.load()
+
     bulk_subscribers = []
     for added_asignee in added_assignees:
-        assignee = User.objects.get(pk=added_asignee)
+        assignee = lookups.get_or_raise(User, added_asignee)
         issue_activities.append(
             IssueActivity(
                 issue_id=issue_id,
@@ -403,7 +517,7 @@ def track_assignees(
     )
 
     for dropped_assignee in dropped_assginees:
-        assignee = User.objects.get(pk=dropped_assignee)
+        assignee = lookups.get_or_raise(User, dropped_assignee)
         issue_activities.append(
             IssueActivity(
                 issue_id=issue_id,
@@ -430,6 +544,7 @@ def track_estimate_points(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if current_instance.get("estimate_point") != requested_data.get(
         "estimate_point"
@@ -463,6 +578,7 @@ def track_archive_at(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if current_instance.get("archived_at") != requested_data.get(
         "archived_at"
@@ -508,11 +624,15 @@ def track_closed_to(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     if requested_data.get("closed_to") is not None:
-        updated_state = State.objects.get(
-            pk=requested_data.get("closed_to"), project_id=project_id
+        lookups = lookups or ActivityLookups()
+        updated_state = lookups.get_or_raise(
+            State, requested_data.get("closed_to")
         )
+        if str(updated_state.project_id) != str(project_id):
+            raise State.DoesNotExist("State does not belong to the project")
         issue_activities.append(
             IssueActivity(
                 issue_id=issue_id,
@@ -540,6 +660,7 @@ def create_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     issue_activities.append(
         IssueActivity(
@@ -565,6 +686,7 @@ def create_issue_activity(
             actor_id,
             issue_activities,
             epoch,
+            lookups,
         )
 
 
@@ -577,6 +699,7 @@ def update_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     ISSUE_ACTIVITY_MAPPER = {
         "name": track_name,
@@ -612,6 +735,7 @@ def update_issue_activity(
                 actor_id=actor_id,
                 issue_activities=issue_activities,
                 epoch=epoch,
+                lookups=lookups,
             )
 
 
@@ -624,6 +748,7 @@ def delete_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     issue_activities.append(
         IssueActivity(
@@ -647,6 +772,7 @@ def create_comment_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -681,6 +807,7 @@ def update_comment_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -720,6 +847,7 @@ def delete_comment_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     issue_activities.append(
         IssueActivity(
@@ -744,6 +872,7 @@ def create_cycle_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -758,17 +887,30 @@ def create_cycle_issue_activity(
         current_instance.get("created_cycle_issues", [])
     )
 
+    lookups = lookups or ActivityLookups()
     for updated_record in updated_records:
-        old_cycle = Cycle.objects.filter(
-            pk=updated_record.get("old_cycle_id", None)
-        ).first()
-        new_cycle = Cycle.objects.filter(
-            pk=updated_record.get("new_cycle_id", None)
-        ).first()
-        issue = Issue.objects.filter(pk=updated_record.get("issue_id")).first()
-        if issue:
-            issue.updated_at = timezone.now()
-            issue.save(update_fields=["updated_at"])
+        lookups.add(
+            Cycle,
+            updated_record.get("old_cycle_id", None),
+            updated_record.get("new_cycle_id", None),
+        )
+    for created_record in created_records:
+        lookups.add(Cycle, created_record.get("fields").get("cycle"))
+    lookups.load()
+
+    # Touch all the moved issues with a single update
+    Issue.objects.filter(
+        pk__in=[record.get("issue_id") for record in updated_records]
+        + [record.get("fields").get("issue") for record in created_records]
+    ).update(updated_at=timezone.now())
+
+    for updated_record in updated_records:
+        old_cycle = lookups.get(
+            Cycle, updated_record.get("old_cycle_id", None)
+        )
+        new_cycle = lookups.get(
+            Cycle, updated_record.get("new_cycle_id", None)
+        )
 
         issue_activities.append(
             IssueActivity(
@@ -788,15 +930,7 @@ def create_cycle_issue_activity(
         )
 
     for created_record in created_records:
-        cycle = Cycle.objects.filter(
-            pk=created_record.get("fields").get("cycle")
-        ).first()
-        issue = Issue.objects.filter(
-            pk=created_record.get("fields").get("issue")
-        ).first()
-        if issue:
-            issue.updated_at = timezone.now()
-            issue.save(update_fields=["updated_at"])
+        cycle = lookups.get(Cycle, created_record.get("fields").get("cycle"))
 
         issue_activities.append(
             IssueActivity(
@@ -824,6 +958,7 @@ def delete_cycle_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -834,14 +969,11 @@ def delete_cycle_issue_activity(
 
     cycle_id = requested_data.get("cycle_id", "")
     cycle_name = requested_data.get("cycle_name", "")
-    cycle = Cycle.objects.filter(pk=cycle_id).first()
+    cycle = (lookups or ActivityLookups()).get(Cycle, cycle_id)
     issues = requested_data.get("issues")
 
+    Issue.objects.filter(pk__in=issues).update(updated_at=timezone.now())
     for issue in issues:
-        current_issue = Issue.objects.filter(pk=issue).first()
-        if issue:
-            current_issue.updated_at = timezone.now()
-            current_issue.save(update_fields=["updated_at"])
         issue_activities.append(
             IssueActivity(
                 issue_id=issue,
@@ -868,11 +1000,14 @@ def create_module_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
     )
-    module = Module.objects.filter(pk=requested_data.get("module_id")).first()
+    module = (lookups or ActivityLookups()).get(
+        Module, requested_data.get("module_id")
+    )
     issue = Issue.objects.filter(pk=issue_id).first()
     if issue:
         issue.updated_at = timezone.now()
@@ -903,6 +1038,7 @@ def delete_module_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -941,6 +1077,7 @@ def create_link_activity(
     workspace_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -974,6 +1111,7 @@ def update_link_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -1010,6 +1148,7 @@ def delete_link_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     current_instance = (
         json.loads(current_instance) if current_instance is not None else None
@@ -1040,6 +1179,7 @@ def create_attachment_activity(
     workspace_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -1073,6 +1213,7 @@ def delete_attachment_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     issue_activities.append(
         IssueActivity(
@@ -1097,6 +1238,7 @@ def create_issue_reaction_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -1139,6 +1281,7 @@ def delete_issue_reaction_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     current_instance = (
         json.loads(current_instance) if current_instance is not None else None
@@ -1171,6 +1314,7 @@ def create_comment_reaction_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -1220,6 +1364,7 @@ def delete_comment_reaction_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     current_instance = (
         json.loads(current_instance) if current_instance is not None else None
@@ -1260,6 +1405,7 @@ def create_issue_vote_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -1292,6 +1438,7 @@ def delete_issue_vote_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     current_instance = (
         json.loads(current_instance) if current_instance is not None else None
@@ -1324,6 +1471,7 @@ def create_issue_relation_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -1332,8 +1480,11 @@ def create_issue_relation_activity(
         json.loads(current_instance) if current_instance is not None else None
     )
     if current_instance is None and requested_data.get("issues") is not None:
+        lookups = lookups or ActivityLookups()
+        lookups.add(Issue, issue_id, *requested_data.get("issues"))
+        lookups.load()
         for related_issue in requested_data.get("issues"):
-            issue = Issue.objects.get(pk=related_issue)
+            issue = lookups.get_or_raise(Issue, related_issue)
             issue_activities.append(
                 IssueActivity(
                     issue_id=issue_id,
@@ -1348,7 +1499,7 @@ def create_issue_relation_activity(
                     old_identifier=related_issue,
                 )
             )
-            issue = Issue.objects.get(pk=issue_id)
+            issue = lookups.get_or_raise(Issue, issue_id)
             issue_activities.append(
                 IssueActivity(
                     issue_id=related_issue,
@@ -1381,6 +1532,7 @@ def delete_issue_relation_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -1388,7 +1540,10 @@ def delete_issue_relation_activity(
     current_instance = (
         json.loads(current_instance) if current_instance is not None else None
     )
-    issue = Issue.objects.get(pk=requested_data.get("related_issue"))
+    lookups = lookups or ActivityLookups()
+    lookups.add(Issue, issue_id, requested_data.get("related_issue"))
+    lookups.load()
+    issue = lookups.get_or_raise(Issue, requested_data.get("related_issue"))
     issue_activities.append(
         IssueActivity(
             issue_id=issue_id,
@@ -1404,7 +1559,7 @@ def delete_issue_relation_activity(
             epoch=epoch,
         )
     )
-    issue = Issue.objects.get(pk=issue_id)
+    issue = lookups.get_or_raise(Issue, issue_id)
     issue_activities.append(
         IssueActivity(
             issue_id=requested_data.get("related_issue"),
@@ -1437,6 +1592,7 @@ def create_draft_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     issue_activities.append(
         IssueActivity(
@@ -1461,6 +1617,7 @@ def update_draft_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     requested_data = (
         json.loads(requested_data) if requested_data is not None else None
@@ -1507,6 +1664,7 @@ def delete_draft_issue_activity(
     actor_id,
     issue_activities,
     epoch,
+    lookups=None,
 ):
     issue_activities.append(
         IssueActivity(
@@ -1521,7 +1679,150 @@ def delete_draft_issue_activity(
     )
 
 
+ACTIVITY_MAPPER = {
+    "issue.activity.created": create_issue_activity,
+    "issue.activity.updated": update_issue_activity,
+    "issue.activity.deleted": delete_issue_activity,
+    "comment.activity.created": create_comment_activity,
+    "comment.activity.updated": update_comment_activity,
+    "comment.activity.deleted": delete_comment_activity,
+    "cycle.activity.created": create_cycle_issue_activity,
+    "cycle.activity.deleted": delete_cycle_issue_activity,
+    "module.activity.created": create_module_issue_activity,
+    "module.activity.deleted": delete_module_issue_activity,
+    "link.activity.created": create_link_activity,
+    "link.activity.updated": update_link_activity,
+    "link.activity.deleted": delete_link_activity,
+    "attachment.activity.created": create_attachment_activity,
+    "attachment.activity.deleted": delete_attachment_activity,
+    "issue_relation.activity.created": create_issue_relation_activity,
+    "issue_relation.activity.deleted": delete_issue_relation_activity,
+    "issue_reaction.activity.created": create_issue_reaction_activity,
+    "issue_reaction.activity.deleted": delete_issue_reaction_activity,
+    "comment_reaction.activity.created": create_comment_reaction_activity,
+    "comment_reaction.activity.deleted": delete_comment_reaction_activity,
+    "issue_vote.activity.created": create_issue_vote_activity,
+    "issue_vote.activity.deleted": delete_issue_vote_activity,
+    "issue_draft.activity.created": create_draft_issue_activity,
+    "issue_draft.activity.updated": update_draft_issue_activity,
+    "issue_draft.activity.deleted": delete_draft_issue_activity,
+}
+
+# Buffered activity events are drained from this redis stream in batches
+ACTIVITY_STREAM = "issue_activity:stream"
+ACTIVITY_GROUP = "issue_activity:drainers"
+ACTIVITY_DRAIN_SCHEDULED = "issue_activity:drain_scheduled"
+ACTIVITY_BATCH_WINDOW = 2
+ACTIVITY_BATCH_SIZE = 500
+# Entries left pending this long by a crashed drainer are claimed again
+ACTIVITY_CLAIM_IDLE_MS = 5 * 60 * 1000
+# Entries still failing after this many deliveries are moved aside
+ACTIVITY_MAX_DELIVERIES = 5
+ACTIVITY_DEAD_LETTER = "issue_activity:dead_letter"
+
+
+def build_issue_activities(
+    type,
+    requested_data,
+    current_instance,
+    issue_id,
+    project_id,
+    workspace_id,
+    actor_id,
+    epoch,
+    lookups=None,
+):
+    issue_activities = []
+    func = ACTIVITY_MAPPER.get(type)
+    if func is not None:
+        if lookups is None:
+            lookups = ActivityLookups()
+            lookups.collect(type, requested_data, current_instance, issue_id)
+            lookups.load()
+        func(
+            requested_data=requested_data,
+            current_instance=current_instance,
+            issue_id=issue_id,
+            project_id=project_id,
+            workspace_id=workspace_id,
+            actor_id=actor_id,
+            issue_activities=issue_activities,
+            epoch=epoch,
+            lookups=lookups,
+        )
+    return issue_activities
+
+
+def post_issue_activities(issue_activities_created):
+    # Post the updates to segway for integrations and webhooks
+    if not len(issue_activities_created):
+        return
+    # Don't send activities if the actor is a bot
+    try:
+        if settings.PROXY_BASE_URL:
+            for issue_activity in issue_activities_created:
+                headers = {"Content-Type": "application/json"}
+                issue_activity_json = json.dumps(
+                    IssueActivitySerializer(issue_activity).data,
+                    cls=DjangoJSONEncoder,
+                )
+                _ = requests.post(
+                    f"{settings.PROXY_BASE_URL}/hooks/workspaces/{str(issue_activity.workspace_id)}/projects/{str(issue_activity.project_id)}/issues/{str(issue_activity.issue_id)}/issue-activity-hooks/",
+                    json=issue_activity_json,
+                    headers=headers,
+                )
+    except Exception as e:
+        capture_exception(e)
+
+
+def send_activity_notifications(
+    type,
+    issue_id,
+    actor_id,
+    project_id,
+    subscriber,
+    issue_activities_created,
+    requested_data,
+    current_instance,
+    run_inline=False,
+):
+    kwargs = dict(
+        type=type,
+        issue_id=issue_id,
+        actor_id=actor_id,
+        project_id=project_id,
+        subscriber=subscriber,
+        issue_activities_created=json.dumps(
+            IssueActivitySerializer(issue_activities_created, many=True).data,
+            cls=DjangoJSONEncoder,
+        ),
+        requested_data=requested_data,
+        current_instance=current_instance,
+    )
+    if run_inline:
+        notifications(**kwargs)
+    else:
+        notifications.delay(**kwargs)
+
+
 # Receive message from room group
+def activity_issue_ids(type, requested_data, issue_id):
+    """Issues whose analytics facts an activity event changes"""
+    issue_ids = {str(issue_id)} if issue_id is not None else set()
+    # Issues are added to a cycle in bulk without an issue id
+    if type == "cycle.activity.created":
+        try:
+            issue_ids.update(
+                str(issue)
+                for issue in json.loads(requested_data or "{}").get(
+                    "cycles_list", []
+                )
+            )
+        except (TypeError, ValueError, AttributeError):
+            pass
+    return issue_ids
+
+
 @shared_task
 def issue_activity(
     type,
@@ -1536,8 +1837,6 @@ def issue_activity(
     origin=None,
 ):
     try:
-        issue_activities = []
-
         project = Project.objects.get(pk=project_id)
         workspace_id = project.workspace_id
 
@@ -1554,84 +1853,43 @@ def issue_activity(
                 except Exception as e:
                     pass
 
-        ACTIVITY_MAPPER = {
-            "issue.activity.created": create_issue_activity,
-            "issue.activity.updated": update_issue_activity,
-            "issue.activity.deleted": delete_issue_activity,
-            "comment.activity.created": create_comment_activity,
-            "comment.activity.updated": update_comment_activity,
-            "comment.activity.deleted": delete_comment_activity,
-            "cycle.activity.created": create_cycle_issue_activity,
-            "cycle.activity.deleted": delete_cycle_issue_activity,
-            "module.activity.created": create_module_issue_activity,
-            "module.activity.deleted": delete_module_issue_activity,
-            "link.activity.created": create_link_activity,
-            "link.activity.updated": update_link_activity,
-            "link.activity.deleted": delete_link_activity,
-            "attachment.activity.created": create_attachment_activity,
-            "attachment.activity.deleted": delete_attachment_activity,
-            "issue_relation.activity.created": create_issue_relation_activity,
-            "issue_relation.activity.deleted": delete_issue_relation_activity,
-            "issue_reaction.activity.created": create_issue_reaction_activity,
-            "issue_reaction.activity.deleted": delete_issue_reaction_activity,
-            "comment_reaction.activity.created": create_comment_reaction_activity,
-            "comment_reaction.activity.deleted": delete_comment_reaction_activity,
-            "issue_vote.activity.created": create_issue_vote_activity,
-            "issue_vote.activity.deleted": delete_issue_vote_activity,
-            "issue_draft.activity.created": create_draft_issue_activity,
-            "issue_draft.activity.updated": update_draft_issue_activity,
-            "issue_draft.activity.deleted": delete_draft_issue_activity,
-        }
-
-        func = ACTIVITY_MAPPER.get(type)
-        if func is not None:
-            func(
-                requested_data=requested_data,
-                current_instance=current_instance,
-                issue_id=issue_id,
-                project_id=project_id,
-                workspace_id=workspace_id,
-                actor_id=actor_id,
-                issue_activities=issue_activities,
-                epoch=epoch,
+        try:
+            refresh_issue_analytics(
+                activity_issue_ids(type, requested_data, issue_id)
             )
+        except Exception as e:
+            capture_exception(e)
+
+        issue_activities = build_issue_activities(
+            type=type,
+            requested_data=requested_data,
+            current_instance=current_instance,
+            issue_id=issue_id,
+            project_id=project_id,
+            workspace_id=workspace_id,
+            actor_id=actor_id,
+            epoch=epoch,
+        )
 
         # Save all the values to database
         issue_activities_created = IssueActivity.objects.bulk_create(
             issue_activities
         )
-        # Post the updates to segway for integrations and webhooks
-        if len(issue_activities_created):
-            # Don't send activities if the actor is a bot
-            try:
-                if settings.PROXY_BASE_URL:
-                    for issue_activity in issue_activities_created:
-                        headers = {"Content-Type": "application/json"}
-                        issue_activity_json = json.dumps(
-                            IssueActivitySerializer(issue_activity).data,
-                            cls=DjangoJSONEncoder,
-                        )
-                        _ = requests.post(
-                            f"{settings.PROXY_BASE_URL}/hooks/workspaces/{str(issue_activity.workspace_id)}/projects/{str(issue_activity.project_id)}/issues/{str(issue_activity.issue_id)}/issue-activity-hooks/",
-                            json=issue_activity_json,
-                            headers=headers,
-                        )
-            except Exception as e:
-                capture_exception(e)
+        post_issue_activities(issue_activities_created)
+        publish_issue_changes(
+            activity_changes(
+                type, issue_id, project_id, issue_activities_created
+            )
+        )
 
         if notification:
-            notifications.delay(
+            send_activity_notifications(
                 type=type,
                 issue_id=issue_id,
                 actor_id=actor_id,
                 project_id=project_id,
                 subscriber=subscriber,
-                issue_activities_created=json.dumps(
-                    IssueActivitySerializer(
-                        issue_activities_created, many=True
-                    ).data,
-                    cls=DjangoJSONEncoder,
-                ),
+                issue_activities_created=issue_activities_created,
                 requested_data=requested_data,
                 current_instance=current_instance,
             )
@@ -1643,3 +1901,412 @@ def issue_activity(
             print(e)
         capture_exception(e)
         return
+
+
+def schedule_activity_drain(ri, countdown):
+    """Schedule a drain unless one is already waiting to run"""
+    if ri.set(
+        ACTIVITY_DRAIN_SCHEDULED, 1, nx=True, ex=ACTIVITY_BATCH_WINDOW * 30
+    ):
+        drain_issue_activities.apply_async(countdown=countdown)
+
+
+def queue_issue_activity(**kwargs):
+    """
+    Buffer the activity event in the redis stream and make sure a drain is
+    scheduled, so a burst of mutations is processed by a single task
+    """
+    try:
+        ri = redis_instance()
+        ri.xadd(
+            ACTIVITY_STREAM,
+            {"event": json.dumps(kwargs, cls=DjangoJSONEncoder)},
+        )
+        schedule_activity_drain(ri, ACTIVITY_BATCH_WINDOW)
+    except Exception as e:
+        capture_exception(e)
+        # Fallback to the unbuffered task
+        issue_activity.delay(**kwargs)
+
+
+def is_description_update(event):
+    if event.get("type") != "issue.activity.updated":
+        return False
+    try:
+        requested_data = json.loads(event.get("requested_data") or "{}")
+    except (TypeError, ValueError):
+        return False
+    return isinstance(requested_data, dict) and set(requested_data) == {
+        "description_html"
+    }
+
+
+def coalesce_activity_events(events):
+    """
+    Collapse consecutive description only edits of an issue by the same
+    actor into one event keeping the first previous state and the last
+    requested state
+    """
+    coalesced = []
+    last_description = {}
+    for event in events:
+        issue_key = event.get("issue_id")
+        if is_description_update(event):
+            key = (issue_key, event.get("actor_id"))
+            index = last_description.get(key)
+            if index is not None:
+                previous = coalesced[index]
+                coalesced[index] = {
+                    **event,
+                    "current_instance": previous.get("current_instance"),
+                    "notification": previous.get("notification", False)
+                    or event.get("notification", False),
+                    "entry_ids": previous.get("entry_ids", [])
+                    + event.get("entry_ids", []),
+                }
+                continue
+            # Any other event for the issue breaks the run
+            last_description = {
+                k: v for k, v in last_description.items() if k[0] != issue_key
+            }
+            last_description[key] = len(coalesced)
+        else:
+            last_description = {
+                k: v for k, v in last_description.items() if k[0] != issue_key
+            }
+        coalesced.append(event)
+    return coalesced
+
+
+def read_activity_events(ri, consumer):
+    try:
+        ri.xgroup_create(
+            ACTIVITY_STREAM, ACTIVITY_GROUP, id="0", mkstream=True
+        )
+    except redis.exceptions.ResponseError:
+        # The group already exists
+        pass
+
+    # Pick up entries a crashed or failed drainer left unacknowledged first
+    messages = ri.xautoclaim(
+        ACTIVITY_STREAM,
+        ACTIVITY_GROUP,
+        consumer,
+        min_idle_time=ACTIVITY_CLAIM_IDLE_MS,
+        start_id="0-0",
+        count=ACTIVITY_BATCH_SIZE,
+    )[1]
+    if messages:
+        messages = dead_letter_activity_events(ri, messages)
+
+    # New entries fill up the rest of the batch, so reclaiming old entries
+    # does not hold back the events that scheduled this drain
+    if len(messages) < ACTIVITY_BATCH_SIZE:
+        entries = ri.xreadgroup(
+            ACTIVITY_GROUP,
+            consumer,
+            {ACTIVITY_STREAM: ">"},
+            count=ACTIVITY_BATCH_SIZE - len(messages),
+        )
+        if entries:
+            messages = messages + entries[0][1]
+
+    entry_ids = []
+    events = []
+    for entry_id, fields in messages:
+        entry_ids.append(entry_id)
+        event = (fields or {}).get(b"event")
+        if event is not None:
+            # The entry id is the idempotency key of the event
+            events.append(
+                {**json.loads(event), "entry_ids": [entry_id.decode()]}
+            )
+    return entry_ids, events
+
+
+def dead_letter_activity_events(ri, messages):
+    """
+    Move the claimed entries delivered too many times to the dead letter
+    list, so an event that can never be stored stops being retried
+
+    Returns:
+        list: the claimed entries to process
+    """
+    pipeline = ri.pipeline()
+    for entry_id, _ in messages:
+        pipeline.xpending_range(
+            ACTIVITY_STREAM,
+            ACTIVITY_GROUP,
+            min=entry_id,
+            max=entry_id,
+            count=1,
+        )
+    deliveries = {
+        pending[0]["message_id"]: pending[0]["times_delivered"]
+        for pending in pipeline.execute()
+        if pending
+    }
+
+    retried, dead = [], []
+    for entry_id, fields in messages:
+        if deliveries.get(entry_id, 0) > ACTIVITY_MAX_DELIVERIES:
+            dead.append((entry_id, fields))
+        else:
+            retried.append((entry_id, fields))
+    if dead:
+        pipeline = ri.pipeline()
+        for entry_id, fields in dead:
+            pipeline.rpush(
+                ACTIVITY_DEAD_LETTER,
+                json.dumps(
+                    {
+                        "entry_id": entry_id.decode(),
+                        "event": (fields or {}).get(b"event", b"").decode(),
+                    }
+                ),
+            )
+        dead_ids = [entry_id for entry_id, _ in dead]
+        pipeline.xack(ACTIVITY_STREAM, ACTIVITY_GROUP, *dead_ids)
+        pipeline.xdel(ACTIVITY_STREAM, *dead_ids)
+        pipeline.execute()
+    return retried
+
+
+def event_key(event):
+    entry_ids = event.get("entry_ids")
+    return entry_ids[-1] if entry_ids else None
+
+
+def immediate_constraints():
+    # Foreign keys are checked on commit by default, checking them on
+    # insert raises a violation inside the savepoint of its event
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+def store_activity_events(batches):
+    """
+    Store the activities of the events in one insert, falling back to an
+    insert per event so that one bad event does not fail the others
+
+    Args:
+        batches (list): (event, activities) pairs
+
+    Returns:
+        tuple: the (event, created activities) pairs that were stored and
+        the events that failed
+    """
+    try:
+        with transaction.atomic():
+            immediate_constraints()
+            created = IssueActivity.objects.bulk_create(
+                [
+                    issue_activity
+                    for _, event_activities in batches
+                    for issue_activity in event_activities
+                ],
+                batch_size=ACTIVITY_BATCH_SIZE,
+            )
+    except DatabaseError:
+        stored, failed = [], []
+        for event, event_activities in batches:
+            try:
+                with transaction.atomic():
+                    immediate_constraints()
+                    stored.append(
+                        (
+                            event,
+                            IssueActivity.objects.bulk_create(
+                                event_activities
+                            ),
+                        )
+                    )
+            except DatabaseError as e:
+                capture_exception(e)
+                failed.append(event)
+        return stored, failed
+
+    stored, offset = [], 0
+    for event, event_activities in batches:
+        stored.append(
+            (event, created[offset : offset + len(event_activities)])
+        )
+        offset += len(event_activities)
+    return stored, []
+
+
+def reschedule_activity_drain(ri):
+    """
+    Keep draining while entries are left in the stream, right away for
+    unread entries and once they can be claimed for the pending ones
+    """
+    length = ri.xlen(ACTIVITY_STREAM)
+    if not length:
+        return
+    pending = ri.xpending(ACTIVITY_STREAM, ACTIVITY_GROUP)["pending"]
+    schedule_activity_drain(
+        ri, 0 if length > pending else ACTIVITY_CLAIM_IDLE_MS // 1000
+    )
+
+
+@shared_task
+def drain_issue_activities():
+    try:
+        ri = redis_instance()
+        # Events queued from now on schedule another drain
+        ri.delete(ACTIVITY_DRAIN_SCHEDULED)
+
+        entry_ids, events = read_activity_events(ri, str(uuid4()))
+        if not entry_ids:
+            reschedule_activity_drain(ri)
+            return
+
+        events = coalesce_activity_events(events)
+
+        projects = Project.objects.in_bulk(
+            {event["project_id"] for event in events}
+        )
+
+        # Touch all the issues and store the request origins in one go
+        issue_ids = {
+            event["issue_id"]
+            for event in events
+            if event.get("issue_id") is not None
+        }
+        if issue_ids:
+            Issue.objects.filter(pk__in=issue_ids).update(
+                updated_at=timezone.now()
+            )
+        try:
+            refresh_issue_analytics(
+                {
+                    analytics_issue_id
+                    for event in events
+                    for analytics_issue_id in activity_issue_ids(
+                        event["type"],
+                        event.get("requested_data"),
+                        event.get("issue_id"),
+                    )
+                }
+            )
+        except Exception as e:
+            capture_exception(e)
+        pipeline = ri.pipeline()
+        for event in events:
+            if event.get("issue_id") is not None and event.get("origin"):
+                pipeline.set(str(event["issue_id"]), event["origin"], ex=600)
+        pipeline.execute()
+
+        # Resolve every referenced state, label, user, cycle, module and
+        # issue of the batch up front
+        lookups = ActivityLookups()
+        for event in events:
+            try:
+                lookups.collect(
+                    event["type"],
+                    event.get("requested_data"),
+                    event.get("current_instance"),
+                    event.get("issue_id"),
+                )
+            except Exception as e:
+                capture_exception(e)
+        try:
+            lookups.load()
+        except Exception as e:
+            # The activity functions fall back to single lookups
+            capture_exception(e)
+
+        # Events redelivered after their activities were stored
+        stored_keys = set(
+            IssueActivity.objects.filter(
+                event_id__in=[event_key(event) for event in events]
+            )
+            .values_list("event_id", flat=True)
+            .distinct()
+        )
+
+        batches = []
+        failed = []
+        for event in events:
+            project = projects.get(UUID(str(event["project_id"])))
+            if project is None or event_key(event) in stored_keys:
+                continue
+            try:
+                event_activities = build_issue_activities(
+                    type=event["type"],
+                    requested_data=event.get("requested_data"),
+                    current_instance=event.get("current_instance"),
+                    issue_id=event.get("issue_id"),
+                    project_id=event["project_id"],
+                    workspace_id=project.workspace_id,
+                    actor_id=event.get("actor_id"),
+                    epoch=event.get("epoch"),
+                    lookups=lookups,
+                )
+            except Exception as e:
+                capture_exception(e)
+                failed.append(event)
+                continue
+            for issue_activity in event_activities:
+                issue_activity.event_id = event_key(event)
+            batches.append((event, event_activities))
+
+        stored, failed_inserts = store_activity_events(batches)
+        failed.extend(failed_inserts)
+        post_issue_activities(
+            [
+                issue_activity
+                for _, event_activities in stored
+                for issue_activity in event_activities
+            ]
+        )
+
+        changes = []
+        for event, event_activities in stored:
+            changes.extend(
+                activity_changes(
+                    event["type"],
+                    event.get("issue_id"),
+                    event["project_id"],
+                    event_activities,
+                )
+            )
+            if not event.get("notification", False):
+                continue
+            try:
+                send_activity_notifications(
+                    type=event["type"],
+                    issue_id=event.get("issue_id"),
+                    actor_id=event.get("actor_id"),
+                    project_id=event["project_id"],
+                    subscriber=event.get("subscriber", True),
+                    issue_activities_created=event_activities,
+                    requested_data=event.get("requested_data"),
+                    current_instance=event.get("current_instance"),
+                    run_inline=True,
+                )
+            except Exception as e:
+                capture_exception(e)
+        publish_issue_changes(changes)
+
+        # Failed events stay pending to be claimed again
+        failed_ids = {
+            entry_id.encode()
+            for event in failed
+            for entry_id in event.get("entry_ids", [])
+        }
+        done_ids = [
+            entry_id for entry_id in entry_ids if entry_id not in failed_ids
+        ]
+        if done_ids:
+            ri.xack(ACTIVITY_STREAM, ACTIVITY_GROUP, *done_ids)
+            ri.xdel(ACTIVITY_STREAM, *done_ids)
+
+        reschedule_activity_drain(ri)
+        return
+    except Exception as e:
+        # Print logs if in DEBUG mode
+        if settings.DEBUG:
+            print(e)
+        capture_exception(e)
+        return
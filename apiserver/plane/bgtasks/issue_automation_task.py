@@ -12,8 +12,18 @@ from celery import shared_task
 from sentry_sdk import capture_exception
 
 # Module imports
-from plane.db.models import Issue, Project, State
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.db.models import (
+    Issue,
+    IssueTombstone,
+    Project,
+    State,
+    SearchDocument,
+)
+from plane.db.models.issue import (
+    record_issue_tombstones,
+    refresh_issue_counters,
+)
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 
 
 @shared_task
@@ -75,8 +85,20 @@ def archive_old_issues():
                     Issue.objects.bulk_update(
                         issues_to_update, ["archived_at"], batch_size=100
                     )
+                    # bulk_update skips the search index signals
+                    SearchDocument.objects.filter(
+                        entity_type="issue",
+                        entity_identifier__in=[
+                            issue.id for issue in issues_to_update
+                        ],
+                    ).update(is_hidden=True)
+                    record_issue_tombstones(issues_to_update, "archived")
+                    refresh_issue_counters(
+                        {issue.parent_id for issue in issues_to_update},
+                        ["sub_issues_count"],
+                    )
                     _ = [
-                        issue_activity.delay(
+                        queue_issue_activity(
                             type="issue.activity.updated",
                             requested_data=json.dumps(
                                 {"archived_at": str(archive_at)}
@@ -159,7 +181,7 @@ def close_old_issues():
                         issues_to_update, ["state"], batch_size=100
                     )
                     [
-                        issue_activity.delay(
+                        queue_issue_activity(
                             type="issue.activity.updated",
                             requested_data=json.dumps(
                                 {"closed_to": str(issue.state_id)}
@@ -180,3 +202,12 @@ def close_old_issues():
             print(e)
         capture_exception(e)
         return
+
+
+@shared_task
+def delete_old_issue_tombstones():
+    """Forget the issues removed before the delta sync retention period"""
+    IssueTombstone.objects.filter(
+        updated_at__lt=timezone.now()
+        - timedelta(days=settings.ISSUE_TOMBSTONE_RETENTION_DAYS)
+    ).delete()
@@ -17,6 +17,8 @@ from plane.db.models import (
     IssueActivity,
     UserNotificationPreference,
 )
+from plane.db.models.issue import bump_issue_version
+from plane.utils.notification_counter import update_unread_counters
 
 # Third Party imports
 from celery import shared_task
@@ -41,6 +43,9 @@ def update_mentions_for_issue(issue, project, new_mentions, removed_mention):
 
     IssueMention.objects.bulk_create(aggregated_issue_mentions, batch_size=100)
     IssueMention.objects.filter(issue=issue, mention__in=removed_mention).delete()
+    # Issue lists filter on mentions, bulk_create skips the signals
+    if new_mentions or removed_mention:
+        bump_issue_version([project.id])
 
 
 def get_new_mentions(requested_instance, current_instance):
@@ -718,6 +723,14 @@ def notifications(
             EmailNotificationLog.objects.bulk_create(
                 bulk_email_logs, batch_size=100, ignore_conflicts=True
             )
+            update_unread_counters(
+                project.workspace.slug,
+                [
+                    (notification.receiver_id, notification.entity_identifier)
+                    for notification in bulk_notifications
+                ],
+                1,
+            )
         return
     except Exception as e:
         print(e)
@@ -1,8 +1,13 @@
+# Python imports
 import requests
 import uuid
 import hashlib
 import json
 import hmac
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 # Django imports
 from django.conf import settings
@@ -13,6 +18,8 @@ from django.utils.html import strip_tags
 
 # Third party imports
 from celery import shared_task
+from celery.exceptions import Retry
+from requests.adapters import HTTPAdapter
 from sentry_sdk import capture_exception
 
 from plane.db.models import (
@@ -39,6 +46,7 @@ from plane.api.serializers import (
 
 # Module imports
 from plane.license.utils.instance_value import get_email_configuration
+from plane.settings.redis import redis_instance
 
 SERIALIZER_MAPPER = {
     "project": ProjectSerializer,
@@ -71,106 +79,370 @@ def get_model_data(event, event_id, many=False):
     return serializer(queryset, many=many).data
 
 
-@shared_task(
-    bind=True,
-    autoretry_for=(requests.RequestException,),
-    retry_backoff=600,
-    max_retries=5,
-    retry_jitter=True,
-)
-def webhook_task(self, webhook, slug, event, event_data, action, current_site):
-    try:
-        webhook = Webhook.objects.get(id=webhook, workspace__slug=slug)
-
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "Autopilot",
-            "X-Plane-Delivery": str(uuid.uuid4()),
-            "X-Plane-Event": event,
-        }
-
-        # # Your secret key
-        event_data = (
-            json.loads(json.dumps(event_data, cls=DjangoJSONEncoder))
-            if event_data is not None
-            else None
+WEBHOOK_ACTIONS = {
+    "POST": "create",
+    "PATCH": "update",
+    "PUT": "update",
+    "DELETE": "delete",
+}
+
+# (connect, read) timeouts for a delivery
+WEBHOOK_TIMEOUT = (5, 30)
+# Connections kept alive per destination host
+WEBHOOK_POOL_SIZE = 16
+# Seconds a delivery waits for a free slot of the endpoint
+WEBHOOK_SLOT_WAIT = 10
+# Seconds after which a slot that was never released is reclaimed
+WEBHOOK_SLOT_TTL = sum(WEBHOOK_TIMEOUT) * 2
+
+# Slots of an endpoint are the holder tokens of a sorted set scored by the
+# time they were taken, slots older than the ttl are leaked by a killed
+# worker and are dropped before counting
+#
+# KEYS: slots
+# ARGV: limit, slot ttl, holder token
+# Returns: 1 when the slot was taken, 0 when the endpoint is full
+ACQUIRE_SLOT_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - tonumber(ARGV[2]))
+if redis.call("ZCARD", KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call("ZADD", KEYS[1], now, ARGV[3])
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+return 1
+"""
+
+# Consecutive failures that open the circuit of an endpoint
+CIRCUIT_FAILURE_THRESHOLD = 5
+# Seconds the circuit stays open before deliveries are tried again
+CIRCUIT_COOLDOWN = 600
+# Times the circuit opens in a row before the webhook is deactivated
+CIRCUIT_MAX_TRIPS = 5
+
+# Encoded records are shared by the delivery tasks through redis
+WEBHOOK_PAYLOAD_KEY = "webhook:payload"
+WEBHOOK_PAYLOAD_TTL = 60 * 60 * 24
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(url):
+    """Return the pooled session of the destination host for this worker"""
+    host = urlparse(url).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=WEBHOOK_POOL_SIZE
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[host] = session
+    return session
+
+
+class WebhookCircuit:
+    """Redis backed circuit breaker of a webhook endpoint"""
+
+    acquire_script = None
+
+    def __init__(self, webhook_id, ri=None):
+        self.ri = ri or redis_instance()
+        self.failures_key = f"webhook:{webhook_id}:failures"
+        self.open_key = f"webhook:{webhook_id}:circuit_open"
+        self.trips_key = f"webhook:{webhook_id}:circuit_trips"
+        self.slots_key = f"webhook:{webhook_id}:slots"
+
+    def open_for(self):
+        """Seconds left before the open circuit can be tried again"""
+        ttl = self.ri.ttl(self.open_key)
+        return ttl if ttl and ttl > 0 else 0
+
+    def record_success(self):
+        self.ri.delete(self.failures_key, self.trips_key)
+
+    def record_failure(self, count=1):
+        """Record the failures and return the number of consecutive trips"""
+        failures = self.ri.incrby(self.failures_key, count)
+        self.ri.expire(self.failures_key, CIRCUIT_COOLDOWN)
+        if failures < CIRCUIT_FAILURE_THRESHOLD:
+            return 0
+        self.ri.set(self.open_key, 1, ex=CIRCUIT_COOLDOWN)
+        self.ri.delete(self.failures_key)
+        trips = self.ri.incr(self.trips_key)
+        self.ri.expire(
+            self.trips_key, CIRCUIT_COOLDOWN * CIRCUIT_MAX_TRIPS * 2
         )
+        return trips
 
-        action = {
-            "POST": "create",
-            "PATCH": "update",
-            "PUT": "update",
-            "DELETE": "delete",
-        }.get(action, action)
+    def get_acquire_script(self):
+        # Registered once per process, executed with EVALSHA afterwards
+        if WebhookCircuit.acquire_script is None:
+            WebhookCircuit.acquire_script = self.ri.register_script(
+                ACQUIRE_SLOT_SCRIPT
+            )
+        return WebhookCircuit.acquire_script
+
+    def acquire_slot(self, limit):
+        """Return the token of the slot taken, or None when none freed up"""
+        token = uuid.uuid4().hex
+        script = self.get_acquire_script()
+        deadline = time.monotonic() + WEBHOOK_SLOT_WAIT
+        while True:
+            if script(
+                keys=[self.slots_key],
+                args=[limit, WEBHOOK_SLOT_TTL, token],
+                client=self.ri,
+            ):
+                return token
+            if time.monotonic() > deadline:
+                return None
+            time.sleep(0.1)
+
+    def release_slot(self, token):
+        self.ri.zrem(self.slots_key, token)
+
+
+def encode_event_data(event_data):
+    """Encode a record into the canonical json bytes shared by all webhooks"""
+    return json.dumps(
+        event_data,
+        cls=DjangoJSONEncoder,
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def store_webhook_payloads(records):
+    """
+    Serialize every record once, store it under its content hash and return
+    the hashes to hand over to the delivery tasks
+    """
+    ri = redis_instance()
+    pipeline = ri.pipeline()
+    digests = []
+    for record in records:
+        data = encode_event_data(record)
+        digest = hashlib.sha256(data).hexdigest()
+        pipeline.set(
+            f"{WEBHOOK_PAYLOAD_KEY}:{digest}", data, ex=WEBHOOK_PAYLOAD_TTL
+        )
+        digests.append(digest)
+    pipeline.execute()
+    return digests
 
-        payload = {
+
+def load_webhook_payloads(digests):
+    ri = redis_instance()
+    return ri.mget([f"{WEBHOOK_PAYLOAD_KEY}:{digest}" for digest in digests])
+
+
+def build_webhook_body(webhook, event, action, data):
+    """
+    Wrap the stored record bytes in the delivery envelope without
+    decoding and encoding them again
+    """
+    envelope = json.dumps(
+        {
             "event": event,
-            "action": action,
+            "action": WEBHOOK_ACTIONS.get(action, action),
             "webhook_id": str(webhook.id),
             "workspace_id": str(webhook.workspace_id),
-            "data": event_data,
-        }
-
-        # Use HMAC for generating signature
-        if webhook.secret_key:
-            hmac_signature = hmac.new(
-                webhook.secret_key.encode("utf-8"),
-                json.dumps(payload).encode("utf-8"),
-                hashlib.sha256,
-            )
-            signature = hmac_signature.hexdigest()
-            headers["X-Plane-Signature"] = signature
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return envelope[:-1] + b',"data":' + data + b"}"
+
+
+def build_webhook_log(webhook, event, action, body, headers=None, **fields):
+    return WebhookLog(
+        workspace_id=webhook.workspace_id,
+        webhook_id=webhook.id,
+        event_type=str(event),
+        request_method=str(WEBHOOK_ACTIONS.get(action, action)),
+        request_headers=str(headers or {}),
+        request_body=body.decode("utf-8"),
+        **fields,
+    )
+
 
-        # Send the webhook event
-        response = requests.post(
+def deliver_webhook(webhook, circuit, event, action, data):
+    """
+    Send a single signed delivery of the encoded record and return the
+    WebhookLog to save and whether it should be retried
+    """
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "Autopilot",
+        "X-Plane-Delivery": str(uuid.uuid4()),
+        "X-Plane-Event": event,
+    }
+    body = build_webhook_body(webhook, event, action, data)
+
+    # Use HMAC for generating signature
+    if webhook.secret_key:
+        hmac_signature = hmac.new(
+            webhook.secret_key.encode("utf-8"),
+            body,
+            hashlib.sha256,
+        )
+        headers["X-Plane-Signature"] = hmac_signature.hexdigest()
+
+    log = build_webhook_log(webhook, event, action, body, headers)
+
+    slot = circuit.acquire_slot(webhook.max_concurrency)
+    if slot is None:
+        # Deferred without counting against the endpoint
+        return None, True
+
+    try:
+        response = get_session(webhook.url).post(
             webhook.url,
             headers=headers,
-            json=payload,
-            timeout=30,
+            data=body,
+            timeout=WEBHOOK_TIMEOUT,
         )
+        log.response_status = str(response.status_code)
+        log.response_headers = str(response.headers)
+        log.response_body = str(response.text)
+        return log, response.status_code >= 500
+    except requests.RequestException as e:
+        log.response_status = 500
+        log.response_headers = ""
+        log.response_body = str(e)
+        return log, True
+    finally:
+        circuit.release_slot(slot)
+
+
+@shared_task(bind=True, max_retries=10)
+def webhook_delivery_task(
+    self, webhook, slug, event, payload_hashes, action, current_site
+):
+    """Deliver the stored records of an event to one webhook endpoint"""
+    try:
+        webhook = Webhook.objects.filter(
+            id=webhook, workspace__slug=slug, is_active=True
+        ).first()
+        if webhook is None:
+            return
+        circuit = WebhookCircuit(webhook.id)
+
+        def delivery_kwargs(payload_hashes):
+            return {
+                "webhook": webhook.id,
+                "slug": slug,
+                "event": event,
+                "payload_hashes": payload_hashes,
+                "action": action,
+                "current_site": current_site,
+            }
+
+        # Hold the deliveries while the endpoint is failing, the wait is
+        # not a failed attempt so it does not spend a retry
+        open_for = circuit.open_for()
+        if open_for:
+            webhook_delivery_task.apply_async(
+                kwargs=delivery_kwargs(payload_hashes),
+                countdown=open_for,
+                retries=self.request.retries,
+            )
+            return
 
-        # Log the webhook request
-        WebhookLog.objects.create(
-            workspace_id=str(webhook.workspace_id),
-            webhook_id=str(webhook.id),
-            event_type=str(event),
-            request_method=str(action),
-            request_headers=str(headers),
-            request_body=str(payload),
-            response_status=str(response.status_code),
-            response_headers=str(response.headers),
-            response_body=str(response.text),
-            retry_count=str(self.request.retries),
-        )
+        # Expired payloads are dropped
+        records = [
+            (digest, data)
+            for digest, data in zip(
+                payload_hashes, load_webhook_payloads(payload_hashes)
+            )
+            if data is not None
+        ]
+        if not records:
+            return
 
-    except requests.RequestException as e:
-        # Log the failed webhook request
-        WebhookLog.objects.create(
-            workspace_id=str(webhook.workspace_id),
-            webhook_id=str(webhook.id),
-            event_type=str(event),
-            request_method=str(action),
-            request_headers=str(headers),
-            request_body=str(payload),
-            response_status=500,
-            response_headers="",
-            response_body=str(e),
-            retry_count=str(self.request.retries),
+        if webhook.batch_events:
+            deliveries = [b"[" + b",".join(data for _, data in records) + b"]"]
+            delivery_hashes = [[digest for digest, _ in records]]
+        else:
+            deliveries = [data for _, data in records]
+            delivery_hashes = [[digest] for digest, _ in records]
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(webhook.max_concurrency, len(deliveries)))
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda data: deliver_webhook(
+                        webhook, circuit, event, action, data
+                    ),
+                    deliveries,
+                )
+            )
+
+        # Log the webhook requests
+        logs = [log for log, _ in results if log is not None]
+        for log in logs:
+            log.retry_count = str(self.request.retries)
+        WebhookLog.objects.bulk_create(logs, batch_size=100)
+
+        failed = [
+            digest
+            for digests, (log, retry) in zip(delivery_hashes, results)
+            if retry
+            for digest in digests
+        ]
+        if not failed:
+            circuit.record_success()
+            return
+
+        trips = circuit.record_failure(
+            len([1 for log, retry in results if retry and log is not None])
         )
-        # Retry logic
+        if trips >= CIRCUIT_MAX_TRIPS:
+            Webhook.objects.filter(pk=webhook.id).update(is_active=False)
+            # send email for the deactivation of the webhook
+            send_webhook_deactivation_email.delay(
+                webhook_id=webhook.id,
+                receiver_id=webhook.created_by_id,
+                reason=str(logs[-1].response_body if logs else ""),
+                current_site=current_site,
+            )
+            return
+
         if self.request.retries >= self.max_retries:
-            Webhook.objects.filter(pk=webhook.id).update(is_active=False)   
-            if webhook:
-                # send email for the deactivation of the webhook
-                send_webhook_deactivation_email(
-                    webhook_id=webhook.id,
-                    receiver_id=webhook.created_by_id,
-                    reason=str(e),
-                    current_site=current_site,
-                )
+            # Log the deliveries that never got a slot before giving up
+            WebhookLog.objects.bulk_create(
+                [
+                    build_webhook_log(
+                        webhook,
+                        event,
+                        action,
+                        build_webhook_body(webhook, event, action, data),
+                        response_status="500",
+                        response_body="Retries exhausted before the "
+                        "delivery could be sent",
+                        retry_count=str(self.request.retries),
+                    )
+                    for data, (log, _) in zip(deliveries, results)
+                    if log is None
+                ],
+                batch_size=100,
+            )
             return
-        raise requests.RequestException()
 
+        # Retry only the failed deliveries
+        raise self.retry(
+            kwargs=delivery_kwargs(failed),
+            countdown=circuit.open_for()
+            or min(600, 30 * 2**self.request.retries),
+        )
+
+    except Retry:
+        raise
     except Exception as e:
         if settings.DEBUG:
             print(e)
@@ -178,6 +450,19 @@ def webhook_task(self, webhook, slug, event, event_data, action, current_site):
         return
 
 
+@shared_task
+def webhook_task(webhook, slug, event, event_data, action, current_site):
+    # Kept for the deliveries queued before the delivery engine
+    webhook_delivery_task.delay(
+        webhook=webhook,
+        slug=slug,
+        event=event,
+        payload_hashes=store_webhook_payloads([event_data]),
+        action=action,
+        current_site=current_site,
+    )
+
+
 @shared_task()
 def send_webhook(event, payload, kw, action, slug, bulk, current_site):
     try:
@@ -225,16 +510,18 @@ def send_webhook(event, payload, kw, action, slug, bulk, current_site):
             if action == "DELETE":
                 event_data = [{"id": kw.get("pk")}]
 
+            # Serialize the records once for all the endpoints
+            payload_hashes = store_webhook_payloads(event_data)
+            # One delivery task per endpoint for all the records
             for webhook in webhooks:
-                for data in event_data:
-                    webhook_task.delay(
-                        webhook=webhook.id,
-                        slug=slug,
-                        event=event,
-                        event_data=data,
-                        action=action,
-                        current_site=current_site,
-                    )
+                webhook_delivery_task.delay(
+                    webhook=webhook.id,
+                    slug=slug,
+                    event=event,
+                    payload_hashes=payload_hashes,
+                    action=action,
+                    current_site=current_site,
+                )
 
     except Exception as e:
         if settings.DEBUG:
@@ -33,6 +33,26 @@ app.conf.beat_schedule = {
         "task": "plane.bgtasks.email_notification_task.stack_email_notification",
         "schedule": crontab(minute='*/5')
     },
+    "check-every-minute-to-flush-api-activity-logs": {
+        "task": "plane.bgtasks.api_logs_task.flush_api_activity_logs",
+        "schedule": crontab(minute="*"),
+    },
+    "check-every-day-to-delete-api-activity-logs": {
+        "task": "plane.bgtasks.api_logs_task.delete_old_api_activity_logs",
+        "schedule": crontab(hour=0, minute=0),
+    },
+    "check-every-day-to-delete-issue-tombstones": {
+        "task": "plane.bgtasks.issue_automation_task.delete_old_issue_tombstones",
+        "schedule": crontab(hour=0, minute=0),
+    },
+    "check-every-minute-to-drain-issue-activities": {
+        "task": "plane.bgtasks.issue_activites_task.drain_issue_activities",
+        "schedule": crontab(minute="*"),
+    },
+    "check-every-minute-to-flush-api-token-last-used": {
+        "task": "plane.bgtasks.api_token_task.flush_api_token_last_used",
+        "schedule": crontab(minute="*"),
+    },
 }
 
 # Load task modules from all registered Django app configs.
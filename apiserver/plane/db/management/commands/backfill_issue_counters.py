@@ -0,0 +1,64 @@
+# Django imports
+from django.core.management import BaseCommand
+from django.db.models import F, Q
+
+# Module imports
+from plane.db.models import Issue
+from plane.db.models.issue import (
+    ISSUE_COUNTER_FIELDS,
+    issue_counter_subqueries,
+    refresh_issue_counters,
+)
+
+
+class Command(BaseCommand):
+    help = "Recount the link, attachment and sub issue counters of issues"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report the issues whose counters are off",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        expected = {
+            f"expected_{field}": subquery
+            for field, subquery in issue_counter_subqueries().items()
+        }
+        mismatch = Q()
+        for field in ISSUE_COUNTER_FIELDS:
+            mismatch |= ~Q(**{field: F(f"expected_{field}")})
+
+        checked, drifted, last_id = 0, 0, None
+        while True:
+            issues = Issue.objects.order_by("id")
+            if last_id is not None:
+                issues = issues.filter(id__gt=last_id)
+            ids = list(issues.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            checked += len(ids)
+
+            drifted_ids = list(
+                Issue.objects.filter(id__in=ids)
+                .annotate(**expected)
+                .filter(mismatch)
+                .values_list("id", flat=True)
+            )
+            drifted += len(drifted_ids)
+            if drifted_ids and not options["verify"]:
+                refresh_issue_counters(drifted_ids)
+
+        message = f"{drifted} of {checked} issues had counters that were off"
+        if options["verify"]:
+            self.stdout.write(
+                self.style.WARNING(message)
+                if drifted
+                else self.style.SUCCESS(message)
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{message}, recounted"))
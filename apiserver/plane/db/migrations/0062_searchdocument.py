@@ -0,0 +1,190 @@
+# Generated by Django 4.2.10 on 2026-10-18 04:59
+
+from django.conf import settings
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+import uuid
+
+BACKFILL_SQL = """
+INSERT INTO search_documents (
+    id, created_at, updated_at, workspace_id, project_id, entity_type,
+    entity_identifier, name, sequence_id, search_vector, is_hidden
+)
+SELECT
+    gen_random_uuid(), now(), now(), workspace_id, project_id, %(type)s,
+    id, name, %(sequence)s,
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(%(content)s, '')), 'B'),
+    %(hidden)s
+FROM %(table)s
+ON CONFLICT (entity_type, entity_identifier) DO NOTHING;
+"""
+
+SEARCH_ENTITIES = [
+    {
+        "type": "'issue'",
+        "table": "issues",
+        "sequence": "sequence_id",
+        "content": "description_stripped",
+        "hidden": "archived_at IS NOT NULL OR is_draft",
+    },
+    {
+        "type": "'page'",
+        "table": "pages",
+        "sequence": "NULL",
+        "content": "description_stripped",
+        "hidden": "archived_at IS NOT NULL",
+    },
+    {
+        "type": "'cycle'",
+        "table": "cycles",
+        "sequence": "NULL",
+        "content": "description",
+        "hidden": "false",
+    },
+    {
+        "type": "'module'",
+        "table": "modules",
+        "sequence": "NULL",
+        "content": "description",
+        "hidden": "false",
+    },
+    {
+        "type": "'issue_view'",
+        "table": "issue_views",
+        "sequence": "NULL",
+        "content": "description",
+        "hidden": "false",
+    },
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0061_webhook_batch_events_max_concurrency"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Last Modified At"
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "entity_type",
+                    models.CharField(
+                        choices=[
+                            ("issue", "Issue"),
+                            ("page", "Page"),
+                            ("cycle", "Cycle"),
+                            ("module", "Module"),
+                            ("issue_view", "Issue View"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("entity_identifier", models.UUIDField()),
+                ("name", models.TextField()),
+                ("sequence_id", models.IntegerField(null=True)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(
+                        null=True
+                    ),
+                ),
+                ("is_hidden", models.BooleanField(default=False)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_created_by",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Created By",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="project_%(class)s",
+                        to="db.project",
+                    ),
+                ),
+                (
+                    "updated_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_updated_by",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Last Modified By",
+                    ),
+                ),
+                (
+                    "workspace",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="workspace_%(class)s",
+                        to="db.workspace",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Document",
+                "verbose_name_plural": "Search Documents",
+                "db_table": "search_documents",
+                "ordering": ("-created_at",),
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"],
+                        name="search_document_vector_idx",
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="search_document_name_trgm_idx",
+                    ),
+                    models.Index(
+                        fields=["workspace", "entity_type"],
+                        name="search_document_type_idx",
+                    ),
+                ],
+                "unique_together": {("entity_type", "entity_identifier")},
+            },
+        ),
+        migrations.RunSQL(
+            [BACKFILL_SQL % entity for entity in SEARCH_ENTITIES],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
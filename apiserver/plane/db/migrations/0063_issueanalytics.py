@@ -0,0 +1,274 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:02
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+BACKFILL_FACTS_SQL = """
+INSERT INTO issue_analytics (
+    id, created_at, updated_at, workspace_id, project_id, issue_id,
+    state_id, state_group, priority, estimate_point, cycle_id, start_date,
+    target_date, issue_created_at, completed_at, created_month, start_month,
+    target_month, completed_month
+)
+SELECT
+    gen_random_uuid(), now(), now(), i.workspace_id, i.project_id, i.id,
+    i.state_id, s."group", i.priority, i.estimate_point, ci.cycle_id,
+    i.start_date, i.target_date, i.created_at, i.completed_at,
+    %(created)s, %(start)s, %(target)s, %(completed)s
+FROM issues i
+LEFT JOIN states s ON s.id = i.state_id
+LEFT JOIN cycle_issues ci ON ci.issue_id = i.id
+WHERE i.archived_at IS NULL
+AND i.is_draft IS NOT TRUE
+AND (
+    EXISTS (
+        SELECT 1 FROM inbox_issues ii
+        WHERE ii.issue_id = i.id AND ii.status IN (1, -1, 2)
+    )
+    OR NOT EXISTS (SELECT 1 FROM inbox_issues ii WHERE ii.issue_id = i.id)
+)
+ON CONFLICT (issue_id) DO NOTHING;
+""" % {
+    field: "EXTRACT(YEAR FROM i.%(column)s)::int || '-' || "
+    "EXTRACT(MONTH FROM i.%(column)s)::int" % {"column": column}
+    for field, column in [
+        ("created", "created_at"),
+        ("start", "start_date"),
+        ("target", "target_date"),
+        ("completed", "completed_at"),
+    ]
+}
+
+BACKFILL_DIMENSIONS_SQL = """
+INSERT INTO issue_analytics_dimensions (
+    id, created_at, updated_at, fact_id, kind, value
+)
+SELECT gen_random_uuid(), now(), now(), f.id, %(kind)s, t.%(column)s
+FROM %(table)s t
+JOIN issue_analytics f ON f.issue_id = t.issue_id
+ON CONFLICT (fact_id, kind, value) DO NOTHING;
+"""
+
+ANALYTICS_DIMENSIONS = [
+    {"kind": "'label'", "table": "issue_labels", "column": "label_id"},
+    {
+        "kind": "'assignee'",
+        "table": "issue_assignees",
+        "column": "assignee_id",
+    },
+    {"kind": "'module'", "table": "module_issues", "column": "module_id"},
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0062_searchdocument"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueAnalytics",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Last Modified At"
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("state_id", models.UUIDField(null=True)),
+                ("state_group", models.CharField(max_length=20, null=True)),
+                ("priority", models.CharField(max_length=30)),
+                ("estimate_point", models.IntegerField(null=True)),
+                ("cycle_id", models.UUIDField(null=True)),
+                ("start_date", models.DateField(null=True)),
+                ("target_date", models.DateField(null=True)),
+                ("issue_created_at", models.DateTimeField()),
+                ("completed_at", models.DateTimeField(null=True)),
+                ("created_month", models.CharField(max_length=7)),
+                ("start_month", models.CharField(max_length=7, null=True)),
+                ("target_month", models.CharField(max_length=7, null=True)),
+                ("completed_month", models.CharField(max_length=7, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_created_by",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Created By",
+                    ),
+                ),
+                (
+                    "issue",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="analytics",
+                        to="db.issue",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="project_%(class)s",
+                        to="db.project",
+                    ),
+                ),
+                (
+                    "updated_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_updated_by",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Last Modified By",
+                    ),
+                ),
+                (
+                    "workspace",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="workspace_%(class)s",
+                        to="db.workspace",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Issue Analytics",
+                "verbose_name_plural": "Issue Analytics",
+                "db_table": "issue_analytics",
+                "ordering": ("-created_at",),
+            },
+        ),
+        migrations.CreateModel(
+            name="IssueAnalyticsDimension",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Last Modified At"
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("label", "Label"),
+                            ("assignee", "Assignee"),
+                            ("module", "Module"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("value", models.UUIDField()),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_created_by",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Created By",
+                    ),
+                ),
+                (
+                    "fact",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dimensions",
+                        to="db.issueanalytics",
+                    ),
+                ),
+                (
+                    "updated_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="%(class)s_updated_by",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Last Modified By",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Issue Analytics Dimension",
+                "verbose_name_plural": "Issue Analytics Dimensions",
+                "db_table": "issue_analytics_dimensions",
+                "ordering": ("-created_at",),
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "value"],
+                        name="issue_analytics_dim_value_idx",
+                    )
+                ],
+                "unique_together": {("fact", "kind", "value")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="issueanalytics",
+            index=models.Index(
+                fields=["workspace", "state_group"],
+                name="issue_analytics_state_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issueanalytics",
+            index=models.Index(
+                fields=["workspace", "priority"],
+                name="issue_analytics_priority_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issueanalytics",
+            index=models.Index(
+                fields=["workspace", "cycle_id"],
+                name="issue_analytics_cycle_idx",
+            ),
+        ),
+        migrations.RunSQL(
+            [BACKFILL_FACTS_SQL]
+            + [
+                BACKFILL_DIMENSIONS_SQL % dimension
+                for dimension in ANALYTICS_DIMENSIONS
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
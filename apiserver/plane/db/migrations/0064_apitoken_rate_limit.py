@@ -0,0 +1,23 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0063_issueanalytics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apitoken",
+            name="rate_limit",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="apitoken",
+            name="workspace_rate_limit",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
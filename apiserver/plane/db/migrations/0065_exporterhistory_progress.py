@@ -0,0 +1,23 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0064_apitoken_rate_limit"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exporterhistory",
+            name="exported_issues",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="exporterhistory",
+            name="total_issues",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
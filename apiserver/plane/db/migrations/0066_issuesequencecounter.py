@@ -0,0 +1,100 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0065_exporterhistory_progress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueSequenceCounter",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Last Modified At"
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("last_sequence", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Issue Sequence Counter",
+                "verbose_name_plural": "Issue Sequence Counters",
+                "db_table": "issue_sequence_counters",
+                "ordering": ("-created_at",),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "state", "-sort_order"],
+                name="issue_state_sort_order_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="issuesequencecounter",
+            name="created_by",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="%(class)s_created_by",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Created By",
+            ),
+        ),
+        migrations.AddField(
+            model_name="issuesequencecounter",
+            name="project",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="issue_sequence_counter",
+                to="db.project",
+            ),
+        ),
+        migrations.AddField(
+            model_name="issuesequencecounter",
+            name="updated_by",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="%(class)s_updated_by",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Last Modified By",
+            ),
+        ),
+        migrations.RunSQL(
+            """
+INSERT INTO issue_sequence_counters
+    (id, created_at, updated_at, project_id, last_sequence)
+SELECT gen_random_uuid(), now(), now(), project_id, MAX(sequence)
+FROM issue_sequences
+GROUP BY project_id
+ON CONFLICT (project_id) DO NOTHING
+""",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0066_issuesequencecounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueTombstone",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Last Modified At"
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("issue_id", models.UUIDField(unique=True)),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[
+                            ("deleted", "Deleted"),
+                            ("archived", "Archived"),
+                            ("draft", "Draft"),
+                            ("inbox", "Inbox"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Issue Tombstone",
+                "verbose_name_plural": "Issue Tombstones",
+                "db_table": "issue_tombstones",
+                "ordering": ("-created_at",),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "updated_at", "id"],
+                name="issue_project_updated_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="issuetombstone",
+            name="created_by",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="%(class)s_created_by",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Created By",
+            ),
+        ),
+        migrations.AddField(
+            model_name="issuetombstone",
+            name="project",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="project_%(class)s",
+                to="db.project",
+            ),
+        ),
+        migrations.AddField(
+            model_name="issuetombstone",
+            name="updated_by",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="%(class)s_updated_by",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Last Modified By",
+            ),
+        ),
+        migrations.AddField(
+            model_name="issuetombstone",
+            name="workspace",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="workspace_%(class)s",
+                to="db.workspace",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issuetombstone",
+            index=models.Index(
+                fields=["project", "updated_at", "issue_id"],
+                name="issue_tombstone_updated_idx",
+            ),
+        ),
+    ]
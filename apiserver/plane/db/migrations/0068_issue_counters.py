@@ -0,0 +1,64 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0067_issue_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="attachment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="link_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="sub_issues_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(
+            """
+UPDATE issues
+SET
+    link_count = (
+        SELECT COUNT(*) FROM issue_links WHERE issue_id = issues.id
+    ),
+    attachment_count = (
+        SELECT COUNT(*) FROM issue_attachments WHERE issue_id = issues.id
+    ),
+    sub_issues_count = (
+        SELECT COUNT(*)
+        FROM issues AS sub_issues
+        WHERE sub_issues.parent_id = issues.id
+            AND sub_issues.archived_at IS NULL
+            AND NOT sub_issues.is_draft
+            AND (
+                NOT EXISTS (
+                    SELECT 1 FROM inbox_issues
+                    WHERE inbox_issues.issue_id = sub_issues.id
+                )
+                OR EXISTS (
+                    SELECT 1 FROM inbox_issues
+                    WHERE inbox_issues.issue_id = sub_issues.id
+                        AND inbox_issues.status IN (-1, 1, 2)
+                )
+            )
+    )
+WHERE id IN (
+    SELECT issue_id FROM issue_links
+    UNION SELECT issue_id FROM issue_attachments
+    UNION SELECT parent_id FROM issues WHERE parent_id IS NOT NULL
+)
+""",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0068_issue_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issueactivity",
+            name="event_id",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="issueactivity",
+            index=models.Index(
+                condition=models.Q(("event_id__isnull", False)),
+                fields=["event_id"],
+                name="issue_activity_event_idx",
+            ),
+        ),
+    ]
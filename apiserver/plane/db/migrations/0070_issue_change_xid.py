@@ -0,0 +1,68 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0069_issue_activity_event_id"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="issue",
+            name="issue_project_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="issuetombstone",
+            name="issue_tombstone_updated_idx",
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="change_xid",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="issuetombstone",
+            name="change_xid",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "change_xid", "id"],
+                name="issue_project_change_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issuetombstone",
+            index=models.Index(
+                fields=["project", "change_xid", "issue_id"],
+                name="issue_tombstone_change_idx",
+            ),
+        ),
+        migrations.RunSQL(
+            """
+CREATE OR REPLACE FUNCTION stamp_change_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER issues_change_xid
+BEFORE INSERT OR UPDATE ON issues
+FOR EACH ROW EXECUTE FUNCTION stamp_change_xid();
+
+CREATE TRIGGER issue_tombstones_change_xid
+BEFORE INSERT OR UPDATE ON issue_tombstones
+FOR EACH ROW EXECUTE FUNCTION stamp_change_xid();
+""",
+            reverse_sql="""
+DROP TRIGGER IF EXISTS issue_tombstones_change_xid ON issue_tombstones;
+DROP TRIGGER IF EXISTS issues_change_xid ON issues;
+DROP FUNCTION IF EXISTS stamp_change_xid();
+""",
+        ),
+    ]
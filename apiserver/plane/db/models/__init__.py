@@ -37,6 +37,8 @@ from .issue import (
     IssueMention,
     IssueLink,
     IssueSequence,
+    IssueSequenceCounter,
+    IssueTombstone,
     IssueAttachment,
     IssueSubscriber,
     IssueReaction,
@@ -83,7 +85,7 @@ from .estimate import Estimate, EstimatePoint
 
 from .inbox import Inbox, InboxIssue
 
-from .analytic import AnalyticView
+from .analytic import AnalyticView, IssueAnalytics, IssueAnalyticsDimension
 
 from .notification import Notification, UserNotificationPreference, EmailNotificationLog
 
@@ -91,4 +93,6 @@ from .exporter import ExporterHistory
 
 from .webhook import Webhook, WebhookLog
 
-from .dashboard import Dashboard, DashboardWidget, Widget
\ No newline at end of file
+from .dashboard import Dashboard, DashboardWidget, Widget
+
+from .search import SearchDocument
@@ -1,8 +1,30 @@
+# Python imports
+from datetime import datetime
+
 # Django models
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+# Third party imports
+from sentry_sdk import capture_exception
 
+from plane.settings.redis import redis_instance
 from .base import BaseModel
+from .workspace import WorkspaceBaseModel
+from .issue import (
+    bump_issue_version,
+    Issue,
+    IssueAssignee,
+    IssueLabel,
+    IssueSubscriber,
+    Label,
+)
+from .cycle import Cycle, CycleIssue
+from .module import Module, ModuleIssue
+from .state import State
 
 
 class AnalyticView(BaseModel):
@@ -23,3 +45,302 @@ class AnalyticView(BaseModel):
     def __str__(self):
         """Return name of the analytic view"""
         return f"{self.name} <{self.workspace.name}>"
+
+
+class IssueAnalytics(WorkspaceBaseModel):
+    """
+    Pre-aggregated analytics fact of an issue holding every scalar axis the
+    analytics graphs group by, with the date axes already bucketed by month
+    """
+
+    issue = models.OneToOneField(
+        "db.Issue", on_delete=models.CASCADE, related_name="analytics"
+    )
+    state_id = models.UUIDField(null=True)
+    state_group = models.CharField(max_length=20, null=True)
+    priority = models.CharField(max_length=30)
+    estimate_point = models.IntegerField(null=True)
+    cycle_id = models.UUIDField(null=True)
+    start_date = models.DateField(null=True)
+    target_date = models.DateField(null=True)
+    issue_created_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True)
+    # Month buckets formatted as "<year>-<month>"
+    created_month = models.CharField(max_length=7)
+    start_month = models.CharField(max_length=7, null=True)
+    target_month = models.CharField(max_length=7, null=True)
+    completed_month = models.CharField(max_length=7, null=True)
+
+    class Meta:
+        verbose_name = "Issue Analytics"
+        verbose_name_plural = "Issue Analytics"
+        db_table = "issue_analytics"
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["workspace", "state_group"],
+                name="issue_analytics_state_idx",
+            ),
+            models.Index(
+                fields=["workspace", "priority"],
+                name="issue_analytics_priority_idx",
+            ),
+            models.Index(
+                fields=["workspace", "cycle_id"],
+                name="issue_analytics_cycle_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.issue_id} <{self.workspace_id}>"
+
+
+class IssueAnalyticsDimension(BaseModel):
+    """
+    Multi valued axes (labels, assignees and modules) of an issue analytics
+    fact, one row per value
+    """
+
+    KIND_CHOICES = (
+        ("label", "Label"),
+        ("assignee", "Assignee"),
+        ("module", "Module"),
+    )
+
+    fact = models.ForeignKey(
+        IssueAnalytics, on_delete=models.CASCADE, related_name="dimensions"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    value = models.UUIDField()
+
+    class Meta:
+        unique_together = ["fact", "kind", "value"]
+        verbose_name = "Issue Analytics Dimension"
+        verbose_name_plural = "Issue Analytics Dimensions"
+        db_table = "issue_analytics_dimensions"
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["kind", "value"],
+                name="issue_analytics_dim_value_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.value}"
+
+
+def burndown_version_key(kind, entity_id):
+    return f"burndown:version:{kind}:{entity_id}"
+
+
+def invalidate_burndown(kind, entity_ids):
+    """Invalidate the cached burndown charts of the cycles or modules"""
+    entity_ids = {entity_id for entity_id in entity_ids if entity_id}
+    if not entity_ids:
+        return
+    try:
+        pipeline = redis_instance().pipeline()
+        for entity_id in entity_ids:
+            pipeline.incr(burndown_version_key(kind, entity_id))
+        pipeline.execute()
+    except Exception as e:
+        capture_exception(e)
+
+
+def issue_stats_version_key(workspace_id):
+    return f"issue_stats:version:{workspace_id}"
+
+
+def invalidate_issue_stats(workspace_ids):
+    """Invalidate the cached issue stats of the workspaces"""
+    workspace_ids = {
+        workspace_id for workspace_id in workspace_ids if workspace_id
+    }
+    if not workspace_ids:
+        return
+    try:
+        pipeline = redis_instance().pipeline()
+        for workspace_id in workspace_ids:
+            pipeline.incr(issue_stats_version_key(workspace_id))
+        pipeline.execute()
+    except Exception as e:
+        capture_exception(e)
+
+
+def month_bucket(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = timezone.localtime(value)
+    return f"{value.year}-{value.month}"
+
+
+def refresh_issue_analytics(issue_ids):
+    """
+    Rebuild the analytics facts of the given issues from their current
+    state, dropping the facts of issues that are no longer reported on
+    """
+    issue_ids = set(issue_ids)
+    if not issue_ids:
+        return
+
+    issues = (
+        Issue.issue_objects.filter(pk__in=issue_ids)
+        .values(
+            "id",
+            "workspace_id",
+            "project_id",
+            "state_id",
+            "state__group",
+            "priority",
+            "estimate_point",
+            "start_date",
+            "target_date",
+            "created_at",
+            "completed_at",
+        )
+        .distinct()
+    )
+    cycles = dict(
+        CycleIssue.objects.filter(issue_id__in=issue_ids).values_list(
+            "issue_id", "cycle_id"
+        )
+    )
+    dimensions = [
+        (issue_id, "label", value)
+        for issue_id, value in IssueLabel.objects.filter(
+            issue_id__in=issue_ids
+        ).values_list("issue_id", "label_id")
+    ]
+    dimensions += [
+        (issue_id, "assignee", value)
+        for issue_id, value in IssueAssignee.objects.filter(
+            issue_id__in=issue_ids
+        ).values_list("issue_id", "assignee_id")
+    ]
+    dimensions += [
+        (issue_id, "module", value)
+        for issue_id, value in ModuleIssue.objects.filter(
+            issue_id__in=issue_ids
+        ).values_list("issue_id", "module_id")
+    ]
+
+    facts = {
+        issue["id"]: IssueAnalytics(
+            workspace_id=issue["workspace_id"],
+            project_id=issue["project_id"],
+            issue_id=issue["id"],
+            state_id=issue["state_id"],
+            state_group=issue["state__group"],
+            priority=issue["priority"],
+            estimate_point=issue["estimate_point"],
+            cycle_id=cycles.get(issue["id"]),
+            start_date=issue["start_date"],
+            target_date=issue["target_date"],
+            issue_created_at=issue["created_at"],
+            completed_at=issue["completed_at"],
+            created_month=month_bucket(issue["created_at"]),
+            start_month=month_bucket(issue["start_date"]),
+            target_month=month_bucket(issue["target_date"]),
+            completed_month=month_bucket(issue["completed_at"]),
+        )
+        for issue in issues
+    }
+
+    # Progress of the cycles and modules of the issues may have moved
+    invalidate_issue_stats({fact.workspace_id for fact in facts.values()})
+    bump_issue_version({fact.project_id for fact in facts.values()})
+    invalidate_burndown("cycle", cycles.values())
+    invalidate_burndown(
+        "module", [value for _, kind, value in dimensions if kind == "module"]
+    )
+
+    with transaction.atomic():
+        IssueAnalytics.objects.filter(issue_id__in=issue_ids).delete()
+        IssueAnalytics.objects.bulk_create(facts.values(), batch_size=1000)
+        IssueAnalyticsDimension.objects.bulk_create(
+            [
+                IssueAnalyticsDimension(
+                    fact=facts[issue_id], kind=kind, value=value
+                )
+                for issue_id, kind, value in dimensions
+                if issue_id in facts
+            ],
+            batch_size=1000,
+        )
+
+
+@receiver(post_save, sender=State)
+def update_analytics_state_group(sender, instance, **kwargs):
+    IssueAnalytics.objects.filter(state_id=instance.id).exclude(
+        state_group=instance.group
+    ).update(state_group=instance.group)
+
+
+@receiver(post_delete, sender=Cycle)
+def remove_analytics_cycle(sender, instance, **kwargs):
+    IssueAnalytics.objects.filter(cycle_id=instance.id).update(cycle_id=None)
+
+
+@receiver(post_delete, sender=Label)
+@receiver(post_delete, sender=Module)
+def remove_analytics_dimension(sender, instance, **kwargs):
+    IssueAnalyticsDimension.objects.filter(
+        kind="label" if sender is Label else "module", value=instance.id
+    ).delete()
+
+
+@receiver(post_save, sender=Issue)
+def invalidate_issue_burndown(sender, instance, created, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if created or (
+        update_fields is not None
+        and not {"state", "completed_at", "estimate_point"} & update_fields
+    ):
+        return
+    invalidate_burndown(
+        "cycle",
+        CycleIssue.objects.filter(issue_id=instance.id).values_list(
+            "cycle_id", flat=True
+        ),
+    )
+    invalidate_burndown(
+        "module",
+        ModuleIssue.objects.filter(issue_id=instance.id).values_list(
+            "module_id", flat=True
+        ),
+    )
+
+
+@receiver(post_save, sender=CycleIssue)
+@receiver(post_delete, sender=CycleIssue)
+def invalidate_cycle_issue_burndown(sender, instance, **kwargs):
+    invalidate_burndown("cycle", [instance.cycle_id])
+
+
+@receiver(post_save, sender=ModuleIssue)
+@receiver(post_delete, sender=ModuleIssue)
+def invalidate_module_issue_burndown(sender, instance, **kwargs):
+    invalidate_burndown("module", [instance.module_id])
+
+
+@receiver(post_save, sender=Cycle)
+def invalidate_cycle_burndown(sender, instance, **kwargs):
+    invalidate_burndown("cycle", [instance.id])
+
+
+@receiver(post_save, sender=Module)
+def invalidate_module_burndown(sender, instance, **kwargs):
+    invalidate_burndown("module", [instance.id])
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+@receiver(post_save, sender=IssueAssignee)
+@receiver(post_delete, sender=IssueAssignee)
+@receiver(post_save, sender=IssueSubscriber)
+@receiver(post_delete, sender=IssueSubscriber)
+@receiver(post_save, sender=State)
+def invalidate_workspace_issue_stats(sender, instance, **kwargs):
+    invalidate_issue_stats([instance.workspace_id])
@@ -1,10 +1,17 @@
 # Python imports
+import hashlib
 from uuid import uuid4
 
 # Django imports
 from django.db import models
 from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
+# Third party imports
+from sentry_sdk import capture_exception
+
+from plane.settings.redis import redis_instance
 from .base import BaseModel
 
 
@@ -44,6 +51,10 @@ class APIToken(BaseModel):
         null=True,
     )
     expired_at = models.DateTimeField(blank=True, null=True)
+    # Requests per minute allowed for the token and for all the tokens of
+    # its workspace, the api defaults apply when not set
+    rate_limit = models.PositiveIntegerField(null=True, blank=True)
+    workspace_rate_limit = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta:
         verbose_name = "API Token"
@@ -81,3 +92,34 @@ class APIActivityLog(BaseModel):
 
     def __str__(self):
         return str(self.token_identifier)
+
+
+# List of API activity logs waiting to be written by
+# plane.bgtasks.api_logs_task.flush_api_activity_logs
+API_ACTIVITY_LOG_QUEUE_KEY = "api_activity_logs"
+
+# Hash of token id -> last used timestamp, flushed to the database by
+# plane.bgtasks.api_token_task.flush_api_token_last_used
+API_TOKEN_LAST_USED_KEY = "api_token:last_used"
+
+
+def api_token_cache_key(token):
+    return f"api_token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def invalidate_api_token(token):
+    """Drop the cached lookup of an API token"""
+    try:
+        redis_instance().delete(api_token_cache_key(token))
+    except Exception as e:
+        capture_exception(e)
+
+
+@receiver(post_save, sender=APIToken)
+@receiver(post_delete, sender=APIToken)
+def invalidate_api_token_cache(sender, instance, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    # Recording the last use does not change what the cache holds
+    if update_fields is not None and set(update_fields) == {"last_used"}:
+        return
+    invalidate_api_token(instance.token)
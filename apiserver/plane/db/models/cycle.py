@@ -1,9 +1,12 @@
 # Django imports
 from django.db import models
 from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 # Module imports
 from . import ProjectBaseModel
+from .issue import bump_issue_version
 
 
 def get_default_filters():
@@ -166,3 +169,9 @@ class CycleUserProperties(ProjectBaseModel):
 
     def __str__(self):
         return f"{self.cycle.name} {self.user.email}"
+
+
+@receiver(post_save, sender=CycleIssue)
+@receiver(post_delete, sender=CycleIssue)
+def bump_cycle_issue_version(sender, instance, **kwargs):
+    bump_issue_version([instance.project_id])
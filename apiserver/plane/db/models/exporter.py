@@ -54,6 +54,9 @@ class ExporterHistory(BaseModel):
         on_delete=models.CASCADE,
         related_name="workspace_exporters",
     )
+    # Export progress
+    total_issues = models.PositiveIntegerField(default=0)
+    exported_issues = models.PositiveIntegerField(default=0)
 
     class Meta:
         verbose_name = "Exporter"
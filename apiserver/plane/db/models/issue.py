@@ -3,17 +3,22 @@ from uuid import uuid4
 
 # Django imports
 from django.contrib.postgres.fields import ArrayField
-from django.db import models
+from django.db import connection, models, transaction
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models import F, Func, OuterRef
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+# Third party imports
+from sentry_sdk import capture_exception
+
 # Module imports
-from . import ProjectBaseModel
+from . import ProjectBaseModel, BaseModel
 from plane.utils.html_processor import strip_tags
+from plane.settings.redis import redis_instance
 
 
 def get_default_properties():
@@ -79,6 +84,9 @@ def get_default_display_properties():
 
 
 # TODO: Handle identifiers for Bulk Inserts - nk
+ISSUE_COUNTER_FIELDS = ["link_count", "attachment_count", "sub_issues_count"]
+
+
 class IssueManager(models.Manager):
     def get_queryset(self):
         return (
@@ -153,6 +161,14 @@ class Issue(ProjectBaseModel):
     is_draft = models.BooleanField(default=False)
     external_source = models.CharField(max_length=255, null=True, blank=True)
     external_id = models.CharField(max_length=255, blank=True, null=True)
+    # Maintained by refresh_issue_counters, sub issues count the children
+    # that are in the issue list
+    link_count = models.PositiveIntegerField(default=0, editable=False)
+    attachment_count = models.PositiveIntegerField(default=0, editable=False)
+    sub_issues_count = models.PositiveIntegerField(default=0, editable=False)
+    # Id of the last transaction that wrote the issue, set by a database
+    # trigger and ordering the changes of a delta sync
+    change_xid = models.BigIntegerField(default=0, editable=False)
 
     objects = models.Manager()
     issue_objects = IssueManager()
@@ -162,8 +178,44 @@ class Issue(ProjectBaseModel):
         verbose_name_plural = "Issues"
         db_table = "issues"
         ordering = ("-created_at",)
+        indexes = [
+            # Tail lookup of the sort order of new issues in a state
+            models.Index(
+                fields=["project", "state", "-sort_order"],
+                name="issue_state_sort_order_idx",
+            ),
+            # Seek through the issues changed since a delta sync cursor
+            models.Index(
+                fields=["project", "change_xid", "id"],
+                name="issue_project_change_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Compared on save to find the parents whose sub issues changed
+        instance._loaded_sub_issue_state = instance.sub_issue_state()
+        return instance
+
+    def sub_issue_state(self):
+        return (
+            self.__dict__.get("parent_id"),
+            self.__dict__.get("archived_at") is None,
+            self.__dict__.get("is_draft"),
+        )
 
     def save(self, *args, **kwargs):
+        # The counters are only written by refresh_issue_counters, a stale
+        # copy loaded before a link was added must not overwrite them
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in ISSUE_COUNTER_FIELDS
+            ]
+
         # This means that the model isn't saved to the database yet
         if self.state is None:
             try:
@@ -197,22 +249,10 @@ class Issue(ProjectBaseModel):
                 pass
 
         if self._state.adding:
-            # Get the maximum display_id value from the database
-            last_id = IssueSequence.objects.filter(
-                project=self.project
-            ).aggregate(largest=models.Max("sequence"))["largest"]
-            # aggregate can return None! Check it first.
-            # If it isn't none, just use the last ID specified (which should be the greatest) and add one to it
-            if last_id:
-                self.sequence_id = last_id + 1
-            else:
-                self.sequence_id = 1
-
-            largest_sort_order = Issue.objects.filter(
-                project=self.project, state=self.state
-            ).aggregate(largest=models.Max("sort_order"))["largest"]
-            if largest_sort_order is not None:
-                self.sort_order = largest_sort_order + 10000
+            self.sequence_id = allocate_sequence_ids(self.project_id)
+            self.sort_order = next_sort_order(
+                self.project_id, self.state_id, self.sort_order
+            )
 
         # Strip the html tags using html parser
         self.description_stripped = (
@@ -407,12 +447,22 @@ class IssueActivity(ProjectBaseModel):
     old_identifier = models.UUIDField(null=True)
     new_identifier = models.UUIDField(null=True)
     epoch = models.FloatField(null=True)
+    # Stream entry of the buffered event the activity was built from
+    event_id = models.CharField(max_length=64, null=True, blank=True)
 
     class Meta:
         verbose_name = "Issue Activity"
         verbose_name_plural = "Issue Activities"
         db_table = "issue_activities"
         ordering = ("-created_at",)
+        indexes = [
+            # Redelivered events whose activities are already stored
+            models.Index(
+                fields=["event_id"],
+                name="issue_activity_event_idx",
+                condition=models.Q(event_id__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         """Return issue of the comment"""
@@ -561,6 +611,86 @@ class IssueSequence(ProjectBaseModel):
         ordering = ("-created_at",)
 
 
+class IssueSequenceCounter(BaseModel):
+    """Last issue sequence id handed out in a project"""
+
+    project = models.OneToOneField(
+        "db.Project",
+        on_delete=models.CASCADE,
+        related_name="issue_sequence_counter",
+    )
+    last_sequence = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Issue Sequence Counter"
+        verbose_name_plural = "Issue Sequence Counters"
+        db_table = "issue_sequence_counters"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.project_id} {self.last_sequence}"
+
+
+def allocate_sequence_ids(project_id, count=1):
+    """
+    Reserve count consecutive sequence ids in a project with a single
+    atomic update of the project counter and return the first one
+
+    Ids reserved by a transaction that is rolled back are not reused
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {IssueSequenceCounter._meta.db_table}
+            SET last_sequence = last_sequence + %s, updated_at = now()
+            WHERE project_id = %s
+            RETURNING last_sequence
+            """,
+            [count, project_id],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            # First allocation, continue from the existing issues
+            cursor.execute(
+                f"""
+                INSERT INTO {IssueSequenceCounter._meta.db_table}
+                    (id, created_at, updated_at, project_id, last_sequence)
+                VALUES (
+                    %s, now(), now(), %s,
+                    COALESCE(
+                        (
+                            SELECT MAX(sequence)
+                            FROM {IssueSequence._meta.db_table}
+                            WHERE project_id = %s
+                        ),
+                        0
+                    ) + %s
+                )
+                ON CONFLICT (project_id) DO UPDATE
+                SET last_sequence =
+                    {IssueSequenceCounter._meta.db_table}.last_sequence + %s,
+                    updated_at = now()
+                RETURNING last_sequence
+                """,
+                [str(uuid4()), project_id, project_id, count, count],
+            )
+            row = cursor.fetchone()
+    return row[0] - count + 1
+
+
+def next_sort_order(project_id, state_id, default=65535):
+    """Sort order placing a new issue at the end of its state"""
+    largest_sort_order = (
+        Issue.objects.filter(project_id=project_id, state_id=state_id)
+        .order_by("-sort_order")
+        .values_list("sort_order", flat=True)
+        .first()
+    )
+    if largest_sort_order is None:
+        return default
+    return largest_sort_order + 10000
+
+
 class IssueSubscriber(ProjectBaseModel):
     issue = models.ForeignKey(
         Issue, on_delete=models.CASCADE, related_name="issue_subscribers"
@@ -659,6 +789,73 @@ class IssueVote(ProjectBaseModel):
         return f"{self.issue.name} {self.actor.email}"
 
 
+class IssueTombstone(ProjectBaseModel):
+    """Issue that left the issue list of its project, kept for delta syncs"""
+
+    REASON_CHOICES = (
+        ("deleted", "Deleted"),
+        ("archived", "Archived"),
+        ("draft", "Draft"),
+        ("inbox", "Inbox"),
+    )
+    # Not a foreign key as the issue may be gone
+    issue_id = models.UUIDField(unique=True)
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    # Set by a database trigger like the change_xid of the issues
+    change_xid = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        verbose_name = "Issue Tombstone"
+        verbose_name_plural = "Issue Tombstones"
+        db_table = "issue_tombstones"
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["project", "change_xid", "issue_id"],
+                name="issue_tombstone_change_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.issue_id} {self.reason}"
+
+
+def record_issue_tombstones(issues, reason):
+    """
+    Record that the issues left the issue list of their project, a later
+    removal of the same issue only moves its tombstone forward
+
+    Args:
+        issues (list): issues or (issue id, project id, workspace id) rows
+        reason (string): one of the IssueTombstone reasons
+    """
+    rows = [
+        (
+            (issue.id, issue.project_id, issue.workspace_id)
+            if isinstance(issue, Issue)
+            else issue
+        )
+        for issue in issues
+    ]
+    if not rows:
+        return
+    IssueTombstone.objects.bulk_create(
+        [
+            IssueTombstone(
+                issue_id=issue_id,
+                project_id=project_id,
+                workspace_id=workspace_id,
+                reason=reason,
+            )
+            for issue_id, project_id, workspace_id in rows
+        ],
+        update_conflicts=True,
+        unique_fields=["issue_id"],
+        update_fields=["reason", "updated_at"],
+        batch_size=1000,
+    )
+
+
 # TODO: Find a better method to save the model
 @receiver(post_save, sender=Issue)
 def create_issue_sequence(sender, instance, created, **kwargs):
@@ -668,3 +865,167 @@ def create_issue_sequence(sender, instance, created, **kwargs):
             sequence=instance.sequence_id,
             project=instance.project,
         )
+
+
+def issue_version_key(project_id):
+    return f"issue_version:{project_id}"
+
+
+def bump_issue_version(project_ids):
+    """
+    Move the issue data version of the projects forward, list responses
+    tagged with an older version are served again
+    """
+    project_ids = {project_id for project_id in project_ids if project_id}
+    if not project_ids:
+        return
+    try:
+        pipeline = redis_instance().pipeline()
+        for project_id in project_ids:
+            key = issue_version_key(project_id)
+            # Start past any version handed out before the key was lost
+            pipeline.set(key, int(timezone.now().timestamp() * 1000), nx=True)
+            pipeline.incr(key)
+        pipeline.execute()
+    except Exception as e:
+        capture_exception(e)
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+@receiver(post_save, sender=IssueAssignee)
+@receiver(post_delete, sender=IssueAssignee)
+@receiver(post_save, sender=IssueLabel)
+@receiver(post_delete, sender=IssueLabel)
+@receiver(post_save, sender=IssueLink)
+@receiver(post_delete, sender=IssueLink)
+@receiver(post_save, sender=IssueAttachment)
+@receiver(post_delete, sender=IssueAttachment)
+# Issue lists embed the label details
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+# The inbox status decides whether the issue is listed, accepting an issue
+# outside of triage does not save the issue itself
+@receiver(post_save, sender="db.InboxIssue")
+@receiver(post_delete, sender="db.InboxIssue")
+def bump_project_issue_version(sender, instance, **kwargs):
+    bump_issue_version([instance.project_id])
+
+
+@receiver(post_save, sender=Issue)
+def record_hidden_issue(sender, instance, update_fields=None, **kwargs):
+    # Touching updated_at of an archived issue does not hide it again
+    if update_fields is not None and set(update_fields) == {"updated_at"}:
+        return
+    if instance.archived_at is not None:
+        record_issue_tombstones([instance], "archived")
+    elif instance.is_draft:
+        record_issue_tombstones([instance], "draft")
+
+
+@receiver(post_delete, sender=Issue)
+def record_deleted_issue(sender, instance, origin=None, **kwargs):
+    # Nothing is left to sync once the project itself is deleted
+    origin_model = getattr(origin, "model", type(origin))
+    if getattr(origin_model, "_meta", None) is not None and (
+        origin_model._meta.model_name in ["project", "workspace"]
+    ):
+        return
+    record_issue_tombstones([instance], "deleted")
+
+
+@receiver(post_save, sender="db.InboxIssue")
+def record_inbox_issue(sender, instance, **kwargs):
+    # Pending and snoozed inbox issues are left out of the issue list
+    if instance.status in [-2, 0]:
+        record_issue_tombstones(
+            [(instance.issue_id, instance.project_id, instance.workspace_id)],
+            "inbox",
+        )
+
+
+def issue_counter_subqueries():
+    """Subqueries counting the links, attachments and sub issues of an issue"""
+    return {
+        "link_count": IssueLink.objects.filter(issue=OuterRef("id"))
+        .order_by()
+        .annotate(count=Func(F("id"), function="Count"))
+        .values("count"),
+        "attachment_count": IssueAttachment.objects.filter(
+            issue=OuterRef("id")
+        )
+        .order_by()
+        .annotate(count=Func(F("id"), function="Count"))
+        .values("count"),
+        "sub_issues_count": Issue.issue_objects.filter(parent=OuterRef("id"))
+        .order_by()
+        .annotate(count=Func(F("id"), function="Count"))
+        .values("count"),
+    }
+
+
+def refresh_issue_counters(issue_ids, fields=ISSUE_COUNTER_FIELDS):
+    """
+    Recount the given counter columns of the issues
+
+    The issue rows are locked first so that the count, taken after the
+    lock is granted, includes the rows of any transaction that held it
+    """
+    issue_ids = {issue_id for issue_id in issue_ids if issue_id}
+    if not issue_ids:
+        return
+    subqueries = issue_counter_subqueries()
+    with transaction.atomic():
+        locked = list(
+            Issue.objects.select_for_update()
+            .filter(pk__in=issue_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        if locked:
+            Issue.objects.filter(pk__in=locked).update(
+                **{field: subqueries[field] for field in fields}
+            )
+
+
+@receiver(post_save, sender=IssueLink)
+@receiver(post_delete, sender=IssueLink)
+def refresh_link_count(sender, instance, created=True, **kwargs):
+    if created:
+        refresh_issue_counters([instance.issue_id], ["link_count"])
+
+
+@receiver(post_save, sender=IssueAttachment)
+@receiver(post_delete, sender=IssueAttachment)
+def refresh_attachment_count(sender, instance, created=True, **kwargs):
+    if created:
+        refresh_issue_counters([instance.issue_id], ["attachment_count"])
+
+
+@receiver(post_save, sender=Issue)
+def refresh_parent_sub_issues_count(sender, instance, created, **kwargs):
+    # Parents whose list of sub issues the save may have changed
+    state = instance.sub_issue_state()
+    loaded = getattr(instance, "_loaded_sub_issue_state", None)
+    instance._loaded_sub_issue_state = state
+    if not created and state == loaded:
+        return
+    parent_ids = [state[0]] + ([loaded[0]] if loaded is not None else [])
+    refresh_issue_counters(parent_ids, ["sub_issues_count"])
+
+
+@receiver(post_delete, sender=Issue)
+def refresh_deleted_parent_sub_issues_count(sender, instance, **kwargs):
+    refresh_issue_counters([instance.parent_id], ["sub_issues_count"])
+
+
+@receiver(post_save, sender="db.InboxIssue")
+@receiver(post_delete, sender="db.InboxIssue")
+def refresh_inbox_parent_sub_issues_count(sender, instance, **kwargs):
+    # Pending inbox issues are not counted as sub issues
+    refresh_issue_counters(
+        Issue.objects.filter(pk=instance.issue_id).values_list(
+            "parent_id", flat=True
+        ),
+        ["sub_issues_count"],
+    )
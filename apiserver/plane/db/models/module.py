@@ -1,9 +1,12 @@
 # Django imports
 from django.db import models
 from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 # Module imports
 from . import ProjectBaseModel
+from .issue import bump_issue_version
 
 
 def get_default_filters():
@@ -219,3 +222,9 @@ class ModuleUserProperties(ProjectBaseModel):
 
     def __str__(self):
         return f"{self.module.name} {self.user.email}"
+
+
+@receiver(post_save, sender=ModuleIssue)
+@receiver(post_delete, sender=ModuleIssue)
+def bump_module_issue_version(sender, instance, **kwargs):
+    bump_issue_version([instance.project_id])
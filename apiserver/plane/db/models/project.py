@@ -5,12 +5,15 @@ from uuid import uuid4
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 # Modeule imports
 from plane.db.mixins import AuditModel
 
 # Module imports
 from . import BaseModel
+from .workspace import invalidate_memberships
 
 ROLE_CHOICES = (
     (20, "Admin"),
@@ -298,3 +301,9 @@ class ProjectPublicMember(ProjectBaseModel):
         verbose_name_plural = "Project Public Members"
         db_table = "project_public_members"
         ordering = ("-created_at",)
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def invalidate_project_member(sender, instance, **kwargs):
+    invalidate_memberships([instance.member_id])
@@ -0,0 +1,172 @@
+# Django imports
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Upper
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+# Module imports
+from . import WorkspaceBaseModel
+from .issue import Issue
+from .page import Page
+from .cycle import Cycle
+from .module import Module
+from .view import IssueView
+
+SEARCH_CONFIG = "simple"
+
+
+class SearchDocument(WorkspaceBaseModel):
+    """
+    One row per searchable entity holding the weighted tsvector of its
+    name and text content, so the global search is a single indexed query
+    """
+
+    ENTITY_TYPE_CHOICES = (
+        ("issue", "Issue"),
+        ("page", "Page"),
+        ("cycle", "Cycle"),
+        ("module", "Module"),
+        ("issue_view", "Issue View"),
+    )
+
+    entity_type = models.CharField(max_length=30, choices=ENTITY_TYPE_CHOICES)
+    entity_identifier = models.UUIDField()
+    name = models.TextField()
+    sequence_id = models.IntegerField(null=True)
+    search_vector = SearchVectorField(null=True)
+    # Archived and draft entities are kept out of the results
+    is_hidden = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ["entity_type", "entity_identifier"]
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        db_table = "search_documents"
+        ordering = ("-created_at",)
+        indexes = [
+            GinIndex(
+                fields=["search_vector"], name="search_document_vector_idx"
+            ),
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="search_document_name_trgm_idx",
+            ),
+            models.Index(
+                fields=["workspace", "entity_type"],
+                name="search_document_type_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} {self.name}"
+
+
+def build_search_vector(name, content=""):
+    return SearchVector(
+        Value(name or ""), weight="A", config=SEARCH_CONFIG
+    ) + SearchVector(Value(content or ""), weight="B", config=SEARCH_CONFIG)
+
+
+def index_search_document(entity_type, instance, content="", **fields):
+    SearchDocument.objects.update_or_create(
+        entity_type=entity_type,
+        entity_identifier=instance.id,
+        defaults={
+            "workspace_id": instance.workspace_id,
+            "project_id": instance.project_id,
+            "name": instance.name,
+            "search_vector": build_search_vector(instance.name, content),
+            **fields,
+        },
+    )
+
+
+def index_search_documents(entity_type, instances, content_field, **fields):
+    """
+    Index entities inserted with bulk_create, which skips the post_save
+    receivers, with one insert and one update that builds the vectors from
+    the stored rows
+    """
+    instances = list(instances)
+    ids = [instance.id for instance in instances]
+    if not ids:
+        return
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(
+                entity_type=entity_type,
+                entity_identifier=instance.id,
+                workspace_id=instance.workspace_id,
+                project_id=instance.project_id,
+                name=instance.name,
+                sequence_id=getattr(instance, "sequence_id", None),
+                **fields,
+            )
+            for instance in instances
+        ],
+        batch_size=100,
+        ignore_conflicts=True,
+    )
+    source = type(instances[0]).objects.filter(
+        pk=OuterRef("entity_identifier")
+    )
+    SearchDocument.objects.filter(
+        entity_type=entity_type, entity_identifier__in=ids
+    ).update(
+        search_vector=SearchVector(
+            Subquery(source.values("name")), weight="A", config=SEARCH_CONFIG
+        )
+        + SearchVector(
+            Subquery(source.values(content_field)),
+            weight="B",
+            config=SEARCH_CONFIG,
+        )
+    )
+
+
+@receiver(post_save, sender=Issue)
+def index_issue(sender, instance, **kwargs):
+    index_search_document(
+        "issue",
+        instance,
+        content=instance.description_stripped,
+        sequence_id=instance.sequence_id,
+        is_hidden=instance.archived_at is not None or instance.is_draft,
+    )
+
+
+@receiver(post_save, sender=Page)
+def index_page(sender, instance, **kwargs):
+    index_search_document(
+        "page",
+        instance,
+        content=instance.description_stripped,
+        is_hidden=instance.archived_at is not None,
+    )
+
+
+@receiver(post_save, sender=Cycle)
+def index_cycle(sender, instance, **kwargs):
+    index_search_document("cycle", instance, content=instance.description)
+
+
+@receiver(post_save, sender=Module)
+def index_module(sender, instance, **kwargs):
+    index_search_document("module", instance, content=instance.description)
+
+
+@receiver(post_save, sender=IssueView)
+def index_issue_view(sender, instance, **kwargs):
+    index_search_document("issue_view", instance, content=instance.description)
+
+
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Page)
+@receiver(post_delete, sender=Cycle)
+@receiver(post_delete, sender=Module)
+@receiver(post_delete, sender=IssueView)
+def remove_search_document(sender, instance, **kwargs):
+    SearchDocument.objects.filter(entity_identifier=instance.id).delete()
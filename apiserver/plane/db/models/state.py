@@ -1,9 +1,12 @@
 # Django imports
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.template.defaultfilters import slugify
 
 # Module imports
 from . import ProjectBaseModel
+from .issue import bump_issue_version
 
 
 class State(ProjectBaseModel):
@@ -52,3 +55,10 @@ class State(ProjectBaseModel):
                 self.sequence = last_id + 15000
 
         return super().save(*args, **kwargs)
+
+
+# Issue lists embed the state details
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+def bump_state_issue_version(sender, instance, **kwargs):
+    bump_issue_version([instance.project_id])
@@ -5,6 +5,7 @@ from urllib.parse import urlparse
 # Django imports
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
 
 # Module imports
 from plane.db.models import BaseModel
@@ -48,6 +49,12 @@ class Webhook(BaseModel):
     module = models.BooleanField(default=False)
     cycle = models.BooleanField(default=False)
     issue_comment = models.BooleanField(default=False)
+    # Deliver all the records of an event in a single request
+    batch_events = models.BooleanField(default=False)
+    # Maximum number of in flight requests to the endpoint
+    max_concurrency = models.PositiveSmallIntegerField(
+        default=4, validators=[MinValueValidator(1), MaxValueValidator(16)]
+    )
 
     def __str__(self):
         return f"{self.workspace.slug} {self.url}"
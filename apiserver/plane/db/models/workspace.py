@@ -2,9 +2,15 @@
 from django.db import models
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+# Third party imports
+from sentry_sdk import capture_exception
 
 # Module imports
 from . import BaseModel
+from plane.settings.redis import redis_instance
 
 
 ROLE_CHOICES = (
@@ -331,3 +337,38 @@ class WorkspaceUserProperties(BaseModel):
 
     def __str__(self):
         return f"{self.workspace.name} {self.user.email}"
+
+
+def membership_version_key(user_id):
+    return f"membership:version:{user_id}"
+
+
+def invalidate_memberships(user_ids):
+    """Invalidate the cached workspace and project roles of the users"""
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+    try:
+        pipeline = redis_instance().pipeline()
+        for user_id in user_ids:
+            pipeline.incr(membership_version_key(user_id))
+        pipeline.execute()
+    except Exception as e:
+        capture_exception(e)
+
+
+@receiver(post_save, sender=WorkspaceMember)
+@receiver(post_delete, sender=WorkspaceMember)
+def invalidate_workspace_member(sender, instance, **kwargs):
+    invalidate_memberships([instance.member_id])
+
+
+@receiver(post_save, sender=Workspace)
+def invalidate_workspace_members(sender, instance, created, **kwargs):
+    # Roles are cached by workspace slug
+    if not created:
+        invalidate_memberships(
+            WorkspaceMember.objects.filter(
+                workspace_id=instance.id
+            ).values_list("member_id", flat=True)
+        )
@@ -1,4 +1,30 @@
-from plane.db.models import APIToken, APIActivityLog
+# Python imports
+import json
+import random
+
+# Django imports
+from django.conf import settings
+
+# Third party imports
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.db.models import APIActivityLog
+from plane.db.models.api import API_ACTIVITY_LOG_QUEUE_KEY
+from plane.settings.redis import redis_instance
+
+# Headers that are not worth keeping with the log
+EXCLUDED_HEADERS = {"cookie", "x-api-key", "authorization"}
+
+
+def truncate(value, limit=None):
+    if not value:
+        return None
+    limit = limit or settings.API_ACTIVITY_LOG_BODY_LIMIT
+    if isinstance(value, bytes):
+        # A utf-8 character is at most 4 bytes
+        value = value[: limit * 4].decode("utf-8", errors="replace")
+    return value[:limit]
 
 
 class APITokenLogMiddleware:
@@ -11,34 +37,59 @@ class APITokenLogMiddleware:
         self.process_request(request, response, request_body)
         return response
 
+    def sampled(self, response):
+        # Failed requests are always logged
+        return (
+            response.status_code >= 400
+            or random.random() < settings.API_ACTIVITY_LOG_SAMPLE_RATE
+        )
+
     def process_request(self, request, response, request_body):
         api_key_header = "X-Api-Key"
         api_key = request.headers.get(api_key_header)
         # If the API key is present, log the request
-        if api_key:
+        if api_key and self.sampled(response):
+            log = {
+                "token_identifier": api_key,
+                "path": request.path[:255],
+                "method": request.method,
+                "query_params": request.META.get("QUERY_STRING", ""),
+                "headers": truncate(
+                    json.dumps(
+                        {
+                            header: value
+                            for header, value in request.headers.items()
+                            if header.lower() not in EXCLUDED_HEADERS
+                        }
+                    )
+                ),
+                "body": truncate(request_body),
+                "response_body": (
+                    None
+                    if getattr(response, "streaming", False)
+                    else truncate(response.content)
+                ),
+                "response_code": response.status_code,
+                "ip_address": request.META.get("REMOTE_ADDR", None),
+                "user_agent": truncate(
+                    request.META.get("HTTP_USER_AGENT", None), 512
+                ),
+            }
             try:
-                APIActivityLog.objects.create(
-                    token_identifier=api_key,
-                    path=request.path,
-                    method=request.method,
-                    query_params=request.META.get("QUERY_STRING", ""),
-                    headers=str(request.headers),
-                    body=(
-                        request_body.decode("utf-8") if request_body else None
-                    ),
-                    response_body=(
-                        response.content.decode("utf-8")
-                        if response.content
-                        else None
-                    ),
-                    response_code=response.status_code,
-                    ip_address=request.META.get("REMOTE_ADDR", None),
-                    user_agent=request.META.get("HTTP_USER_AGENT", None),
+                # Written in batches by the api logs task
+                pipeline = redis_instance().pipeline()
+                pipeline.rpush(API_ACTIVITY_LOG_QUEUE_KEY, json.dumps(log))
+                pipeline.ltrim(
+                    API_ACTIVITY_LOG_QUEUE_KEY,
+                    -settings.API_ACTIVITY_LOG_QUEUE_LIMIT,
+                    -1,
                 )
-
+                pipeline.execute()
             except Exception as e:
-                print(e)
-                # If the token does not exist, you can decide whether to log this as an invalid attempt
-                pass
+                capture_exception(e)
+                try:
+                    APIActivityLog.objects.create(**log)
+                except Exception as e:
+                    capture_exception(e)
 
         return None
@@ -176,6 +176,23 @@ else:
         }
     }
 
+# Channel layer of the websocket consumers, redis pub/sub fans the messages
+# out to every ASGI worker
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "channels_redis.pubsub.RedisPubSubChannelLayer",
+        "CONFIG": {
+            "hosts": [
+                (
+                    {"address": REDIS_URL, "ssl_cert_reqs": None}
+                    if REDIS_SSL
+                    else REDIS_URL
+                )
+            ],
+        },
+    }
+}
+
 # Password validations
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -342,3 +359,33 @@ INSTANCE_KEY = os.environ.get(
 SKIP_ENV_VAR = os.environ.get("SKIP_ENV_VAR", "1") == "1"
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = int(os.environ.get("FILE_SIZE_LIMIT", 5242880))
+
+# API activity logs
+# Request and response bodies are truncated to this many characters
+API_ACTIVITY_LOG_BODY_LIMIT = int(
+    os.environ.get("API_ACTIVITY_LOG_BODY_LIMIT", 4096)
+)
+# Fraction of the successful API requests that are logged
+API_ACTIVITY_LOG_SAMPLE_RATE = float(
+    os.environ.get("API_ACTIVITY_LOG_SAMPLE_RATE", 1)
+)
+# Logs waiting to be written, older entries are dropped past this size
+API_ACTIVITY_LOG_QUEUE_LIMIT = int(
+    os.environ.get("API_ACTIVITY_LOG_QUEUE_LIMIT", 100000)
+)
+API_ACTIVITY_LOG_RETENTION_DAYS = int(
+    os.environ.get("API_ACTIVITY_LOG_RETENTION_DAYS", 30)
+)
+
+# Requests per minute allowed for an API token and for all the tokens of a
+# workspace, unless set on the token, 0 disables the workspace limit
+API_KEY_RATE_LIMIT = int(os.environ.get("API_KEY_RATE_LIMIT", 60))
+API_KEY_WORKSPACE_RATE_LIMIT = int(
+    os.environ.get("API_KEY_WORKSPACE_RATE_LIMIT", 0)
+)
+
+# Delta syncs of issue lists
+# Removed issues are remembered this long, older cursors need a full refresh
+ISSUE_TOMBSTONE_RETENTION_DAYS = int(
+    os.environ.get("ISSUE_TOMBSTONE_RETENTION_DAYS", 30)
+)
@@ -3,7 +3,7 @@ import json
 
 # Django import
 from django.utils import timezone
-from django.db.models import Q, OuterRef, Func, F, Prefetch
+from django.db.models import Q, F, Prefetch
 from django.core.serializers.json import DjangoJSONEncoder
 
 # Third party imports
@@ -16,8 +16,6 @@ from plane.db.models import (
     InboxIssue,
     Issue,
     State,
-    IssueLink,
-    IssueAttachment,
     ProjectDeployBoard,
 )
 from plane.app.serializers import (
@@ -27,7 +25,7 @@ from plane.app.serializers import (
     IssueStateInboxSerializer,
 )
 from plane.utils.issue_filters import issue_filters
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 
 
 class InboxIssuePublicViewSet(BaseViewSet):
@@ -80,28 +78,6 @@ class InboxIssuePublicViewSet(BaseViewSet):
             .select_related("workspace", "project", "state", "parent")
             .prefetch_related("assignees", "labels")
             .order_by("issue_inbox__snoozed_till", "issue_inbox__status")
-            .annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
             .prefetch_related(
                 Prefetch(
                     "issue_inbox",
@@ -168,7 +144,7 @@ class InboxIssuePublicViewSet(BaseViewSet):
         )
 
         # Create an Issue Activity
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue.activity.created",
             requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
             actor_id=str(request.user.id),
@@ -237,7 +213,7 @@ class InboxIssuePublicViewSet(BaseViewSet):
             # Log all the updates
             requested_data = json.dumps(issue_data, cls=DjangoJSONEncoder)
             if issue is not None:
-                issue_activity.delay(
+                queue_issue_activity(
                     type="issue.activity.updated",
                     requested_data=requested_data,
                     actor_id=str(request.user.id),
@@ -5,8 +5,6 @@ import json
 from django.utils import timezone
 from django.db.models import (
     Prefetch,
-    OuterRef,
-    Func,
     F,
     Q,
     Count,
@@ -39,8 +37,6 @@ from plane.db.models import (
     Issue,
     IssueComment,
     Label,
-    IssueLink,
-    IssueAttachment,
     State,
     ProjectMember,
     IssueReaction,
@@ -49,9 +45,10 @@ from plane.db.models import (
     IssueVote,
     ProjectPublicMember,
 )
-from plane.bgtasks.issue_activites_task import issue_activity
+from plane.bgtasks.issue_activites_task import queue_issue_activity
 from plane.utils.grouper import group_results
 from plane.utils.issue_filters import issue_filters
+from plane.utils.etag import conditional_issue_list
 
 
 class IssueCommentPublicViewSet(BaseViewSet):
@@ -126,7 +123,7 @@ class IssueCommentPublicViewSet(BaseViewSet):
                 actor=request.user,
                 access="EXTERNAL",
             )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="comment.activity.created",
                 requested_data=json.dumps(
                     serializer.data, cls=DjangoJSONEncoder
@@ -169,7 +166,7 @@ class IssueCommentPublicViewSet(BaseViewSet):
         )
         if serializer.is_valid():
             serializer.save()
-            issue_activity.delay(
+            queue_issue_activity(
                 type="comment.activity.updated",
                 requested_data=json.dumps(request.data, cls=DjangoJSONEncoder),
                 actor_id=str(request.user.id),
@@ -200,7 +197,7 @@ class IssueCommentPublicViewSet(BaseViewSet):
             project_id=project_id,
             actor=request.user,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="comment.activity.deleted",
             requested_data=json.dumps({"comment_id": str(pk)}),
             actor_id=str(request.user.id),
@@ -266,7 +263,7 @@ class IssueReactionPublicViewSet(BaseViewSet):
                     project_id=project_id,
                     member=request.user,
                 )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="issue_reaction.activity.created",
                 requested_data=json.dumps(
                     self.request.data, cls=DjangoJSONEncoder
@@ -296,7 +293,7 @@ class IssueReactionPublicViewSet(BaseViewSet):
             reaction=reaction_code,
             actor=request.user,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue_reaction.activity.deleted",
             requested_data=None,
             actor_id=str(self.request.user.id),
@@ -366,7 +363,7 @@ class CommentReactionPublicViewSet(BaseViewSet):
                     project_id=project_id,
                     member=request.user,
                 )
-            issue_activity.delay(
+            queue_issue_activity(
                 type="comment_reaction.activity.created",
                 requested_data=json.dumps(
                     self.request.data, cls=DjangoJSONEncoder
@@ -397,7 +394,7 @@ class CommentReactionPublicViewSet(BaseViewSet):
             reaction=reaction_code,
             actor=request.user,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="comment_reaction.activity.deleted",
             requested_data=None,
             actor_id=str(self.request.user.id),
@@ -456,7 +453,7 @@ class IssueVotePublicViewSet(BaseViewSet):
             )
         issue_vote.vote = request.data.get("vote", 1)
         issue_vote.save()
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue_vote.activity.created",
             requested_data=json.dumps(
                 self.request.data, cls=DjangoJSONEncoder
@@ -477,7 +474,7 @@ class IssueVotePublicViewSet(BaseViewSet):
             issue_id=issue_id,
             actor_id=request.user.id,
         )
-        issue_activity.delay(
+        queue_issue_activity(
             type="issue_vote.activity.deleted",
             requested_data=None,
             actor_id=str(self.request.user.id),
@@ -508,15 +505,21 @@ class IssueRetrievePublicEndpoint(BaseAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+def get_project_deploy_board(slug, project_id):
+    return ProjectDeployBoard.objects.get(
+        workspace__slug=slug, project_id=project_id
+    )
+
+
 class ProjectIssuesPublicEndpoint(BaseAPIView):
     permission_classes = [
         AllowAny,
     ]
 
+    # Unpublished boards are not found before the ETag is compared
+    @conditional_issue_list(precondition=get_project_deploy_board)
     def get(self, request, slug, project_id):
-        project_deploy_board = ProjectDeployBoard.objects.get(
-            workspace__slug=slug, project_id=project_id
-        )
+        project_deploy_board = get_project_deploy_board(slug, project_id)
 
         filters = issue_filters(request.query_params, "GET")
 
@@ -533,15 +536,7 @@ class ProjectIssuesPublicEndpoint(BaseAPIView):
         order_by_param = request.GET.get("order_by", "-created_at")
 
         issue_queryset = (
-            Issue.issue_objects.annotate(
-                sub_issues_count=Issue.issue_objects.filter(
-                    parent=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .filter(project_id=project_id)
+            Issue.issue_objects.filter(project_id=project_id)
             .filter(workspace__slug=slug)
             .select_related("project", "workspace", "state", "parent")
             .prefetch_related("assignees", "labels")
@@ -560,20 +555,6 @@ class ProjectIssuesPublicEndpoint(BaseAPIView):
             .filter(**filters)
             .annotate(cycle_id=F("issue_cycle__cycle_id"))
             .annotate(module_id=F("issue_module__module_id"))
-            .annotate(
-                link_count=IssueLink.objects.filter(issue=OuterRef("id"))
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
-            .annotate(
-                attachment_count=IssueAttachment.objects.filter(
-                    issue=OuterRef("id")
-                )
-                .order_by()
-                .annotate(count=Func(F("id"), function="Count"))
-                .values("count")
-            )
         )
 
         # Priority Ordering
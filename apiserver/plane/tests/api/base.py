@@ -1,19 +1,19 @@
 # Third party imports
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APITransactionTestCase, APIClient
 
 # Module imports
 from plane.db.models import User
 from plane.app.views.authentication import get_tokens_for_user
 
 
-class BaseAPITest(APITestCase):
+class BaseAPITestMixin:
     def setUp(self):
         self.client = APIClient(
             HTTP_USER_AGENT="plane/test", REMOTE_ADDR="10.10.10.10"
         )
 
 
-class AuthenticatedAPITest(BaseAPITest):
+class AuthenticatedAPITestMixin(BaseAPITestMixin):
     def setUp(self):
         super().setUp()
 
@@ -34,3 +34,18 @@ class AuthenticatedAPITest(BaseAPITest):
 
         # Set Up Authentication Token
         self.client.credentials(HTTP_AUTHORIZATION="Bearer " + access_token)
+
+
+class BaseAPITest(BaseAPITestMixin, APITestCase):
+    pass
+
+
+class AuthenticatedAPITest(AuthenticatedAPITestMixin, APITestCase):
+    pass
+
+
+# Commits every write, for behaviour that depends on transaction order
+class AuthenticatedAPITransactionTest(
+    AuthenticatedAPITestMixin, APITransactionTestCase
+):
+    pass
@@ -1 +1,386 @@
-# TODO: Write Test for Issue Endpoints
+# Python imports
+import json
+import sys
+import time
+from unittest import mock
+
+# Django imports
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
+
+# Third party import
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+# Module imports
+from .base import AuthenticatedAPITest, AuthenticatedAPITransactionTest
+from plane.app.serializers import IssueSerializer
+from plane.db.models import (
+    Cycle,
+    CycleIssue,
+    Issue,
+    IssueAssignee,
+    IssueLabel,
+    IssueLink,
+    Label,
+    Module,
+    ModuleIssue,
+    Project,
+    ProjectMember,
+    State,
+    Workspace,
+    WorkspaceMember,
+)
+from plane.utils.issue_changes import changes_cursor, settled_change_xid
+from plane.utils.issue_projection import issue_rows, issue_values
+from plane.utils.paginator import KeysetCursor
+
+
+class IssueAPITestMixin:
+    def setUp(self):
+        super().setUp()
+        self.workspace = Workspace.objects.create(
+            name="Plane", slug="plane", owner=self.user
+        )
+        WorkspaceMember.objects.create(
+            workspace=self.workspace, member=self.user, role=20
+        )
+        self.project = Project.objects.create(
+            name="Plane", identifier="PLANE", workspace=self.workspace
+        )
+        ProjectMember.objects.create(
+            project=self.project, member=self.user, role=20
+        )
+        self.state = State.objects.create(
+            name="Todo",
+            color="#000000",
+            group="unstarted",
+            project=self.project,
+        )
+
+    def create_issues(self, count):
+        return Issue.objects.bulk_create(
+            [
+                Issue(
+                    name=f"Issue {sequence_id}",
+                    sequence_id=sequence_id,
+                    state=self.state,
+                    project=self.project,
+                    workspace=self.workspace,
+                )
+                for sequence_id in range(1, count + 1)
+            ],
+            batch_size=1000,
+        )
+
+
+class IssueAPITest(IssueAPITestMixin, AuthenticatedAPITest):
+    pass
+
+
+# The change sequence follows committed transactions
+class IssueChangesTest(IssueAPITestMixin, AuthenticatedAPITransactionTest):
+    def setUp(self):
+        super().setUp()
+        self.list_url = reverse(
+            "project-issue",
+            kwargs={"slug": "plane", "project_id": self.project.id},
+        )
+        self.url = reverse(
+            "project-issue-changes",
+            kwargs={"slug": "plane", "project_id": self.project.id},
+        )
+
+    def sync(self, cursor=None, per_page=None):
+        params = {}
+        if cursor is not None:
+            params["since"] = cursor
+        if per_page is not None:
+            params["per_page"] = per_page
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_full_sync_without_cursor(self):
+        issues = self.create_issues(5)
+
+        changes = self.sync()
+
+        self.assertEqual(
+            {issue["id"] for issue in changes["upserted"]},
+            {str(issue.id) for issue in issues},
+        )
+        self.assertEqual(changes["removed"], [])
+        self.assertFalse(changes["has_more"])
+
+    def test_delta_returns_upserted_and_removed_issues(self):
+        updated, archived, deleted, _ = self.create_issues(4)
+        cursor = self.sync()["cursor"]
+
+        Issue.objects.filter(pk=updated.pk).update(
+            name="Renamed", updated_at=timezone.now()
+        )
+        archived.archived_at = timezone.now().date()
+        archived.save()
+        deleted.delete()
+
+        changes = self.sync(cursor)
+
+        self.assertEqual(
+            [issue["id"] for issue in changes["upserted"]], [str(updated.id)]
+        )
+        self.assertEqual(changes["upserted"][0]["name"], "Renamed")
+        self.assertEqual(
+            set(changes["removed"]), {str(archived.id), str(deleted.id)}
+        )
+        # Nothing changed since the returned cursor
+        changes = self.sync(changes["cursor"])
+        self.assertEqual((changes["upserted"], changes["removed"]), ([], []))
+
+    def test_restored_issue_is_upserted(self):
+        issue = self.create_issues(1)[0]
+        cursor = self.sync()["cursor"]
+
+        issue.archived_at = timezone.now().date()
+        issue.save()
+        issue.archived_at = None
+        issue.save()
+
+        changes = self.sync(cursor)
+
+        self.assertEqual(
+            [change["id"] for change in changes["upserted"]], [str(issue.id)]
+        )
+        self.assertEqual(changes["removed"], [])
+
+    def test_pages_follow_the_change_sequence(self):
+        issues = self.create_issues(5)
+
+        synced, cursor, has_more = [], None, True
+        while has_more:
+            changes = self.sync(cursor, per_page=2)
+            synced.extend(issue["id"] for issue in changes["upserted"])
+            cursor, has_more = changes["cursor"], changes["has_more"]
+
+        self.assertEqual(len(synced), 5)
+        self.assertEqual(set(synced), {str(issue.id) for issue in issues})
+
+    def test_invalid_and_expired_cursors(self):
+        response = self.client.get(self.url, {"since": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            self.url,
+            {
+                "since": changes_cursor(
+                    0, issued_at=timezone.now().replace(year=2000)
+                )
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertTrue(response.data["reset"])
+
+        # Cursors of the updated_at sequence have to sync again
+        response = self.client.get(
+            self.url,
+            {"since": str(KeysetCursor([timezone.now().isoformat(), None]))},
+        )
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_changes_of_running_transactions_are_held_back(self):
+        issue = self.create_issues(1)[0]
+        cursor = self.sync()["cursor"]
+
+        Issue.objects.filter(pk=issue.pk).update(name="Renamed")
+        with mock.patch(
+            "plane.utils.issue_changes.settled_change_xid",
+            lambda: Issue.objects.get(pk=issue.pk).change_xid,
+        ):
+            # The transaction of the rename is taken as still running
+            changes = self.sync(cursor)
+        self.assertEqual(changes["upserted"], [])
+
+        changes = self.sync(changes["cursor"])
+        self.assertEqual(
+            [change["id"] for change in changes["upserted"]], [str(issue.id)]
+        )
+
+    def test_delta_refresh_is_cheaper_than_full_list(self):
+        """Benchmark: refresh of 2000 issues after 10 of them changed"""
+        issues = self.create_issues(2000)
+        cursor = changes_cursor(settled_change_xid() - 1)
+        Issue.objects.filter(
+            pk__in=[issue.pk for issue in issues[:10]]
+        ).update(updated_at=timezone.now())
+
+        started = time.perf_counter()
+        response = self.client.get(self.list_url)
+        full_time = time.perf_counter() - started
+        full_size = len(json.dumps(response.data, default=str))
+
+        started = time.perf_counter()
+        changes = self.sync(cursor)
+        delta_time = time.perf_counter() - started
+        delta_size = len(json.dumps(changes, default=str))
+
+        self.assertEqual(len(changes["upserted"]), 10)
+        self.assertLess(delta_size * 50, full_size)
+        # Timings are reported, not asserted, to keep the test stable
+        sys.stderr.write(
+            f"\nfull list: {full_time:.2f}s {full_size} bytes, "
+            f"delta: {delta_time:.2f}s {delta_size} bytes\n"
+        )
+
+
+class IssueCountersTest(IssueAPITest):
+    def test_counters_follow_links_and_sub_issues(self):
+        parent, child, other = self.create_issues(3)
+
+        link = IssueLink.objects.create(
+            url="https://plane.so", issue=parent, project=self.project
+        )
+        child.parent = parent
+        child.save()
+        parent.refresh_from_db()
+        self.assertEqual((parent.link_count, parent.sub_issues_count), (1, 1))
+
+        # Moving the sub issue recounts both parents
+        child.parent = other
+        child.save()
+        link.delete()
+        parent.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((parent.link_count, parent.sub_issues_count), (0, 0))
+        self.assertEqual(other.sub_issues_count, 1)
+
+        # Archived sub issues are not counted
+        child.archived_at = timezone.now().date()
+        child.save()
+        other.refresh_from_db()
+        self.assertEqual(other.sub_issues_count, 0)
+
+        # A stale copy does not overwrite the counters
+        stale = Issue.objects.get(pk=parent.pk)
+        IssueLink.objects.create(
+            url="https://plane.so", issue=parent, project=self.project
+        )
+        stale.name = "Renamed"
+        stale.save()
+        parent.refresh_from_db()
+        self.assertEqual(parent.link_count, 1)
+
+
+class IssueProjectionTest(IssueAPITest):
+    def setUp(self):
+        super().setUp()
+        self.issues = self.create_issues(3)
+        first, second, _ = self.issues
+        labels = [
+            Label.objects.create(name=name, project=self.project)
+            for name in ["bug", "feature"]
+        ]
+        IssueLabel.objects.bulk_create(
+            [
+                IssueLabel(issue=first, label=label, project=self.project)
+                for label in labels
+            ]
+        )
+        IssueAssignee.objects.create(
+            issue=first, assignee=self.user, project=self.project
+        )
+        module = Module.objects.create(name="Module", project=self.project)
+        ModuleIssue.objects.create(
+            issue=second, module=module, project=self.project
+        )
+        cycle = Cycle.objects.create(
+            name="Cycle", owned_by=self.user, project=self.project
+        )
+        CycleIssue.objects.create(
+            issue=first, cycle=cycle, project=self.project
+        )
+        first.parent = second
+        first.target_date = timezone.now().date()
+        first.save()
+
+    def queryset(self):
+        return (
+            Issue.issue_objects.filter(project=self.project)
+            .select_related("workspace", "project", "state", "parent")
+            .prefetch_related("assignees", "labels", "issue_module__module")
+            .annotate(cycle_id=F("issue_cycle__cycle_id"))
+            .order_by("-created_at", "id")
+            .distinct()
+        )
+
+    def test_projection_matches_the_serializer(self):
+        # Filtering on a relation does not narrow down its ids
+        for queryset in [
+            self.queryset(),
+            self.queryset().filter(labels__name="bug"),
+        ]:
+            self.assertEqual(
+                JSONRenderer().render(issue_rows(issue_values(queryset))),
+                JSONRenderer().render(
+                    IssueSerializer(queryset, many=True).data
+                ),
+            )
+
+    def test_list_endpoint_uses_the_projection(self):
+        url = reverse(
+            "project-issue",
+            kwargs={"slug": "plane", "project_id": self.project.id},
+        )
+
+        response = self.client.get(url, {"order_by": "priority"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+
+        ids, cursor = [], None
+        while True:
+            params = {"per_page": 2, "order_by": "-priority"}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(url, params)
+            ids.extend(issue["id"] for issue in response.data["results"])
+            if not response.data["next_page_results"]:
+                break
+            cursor = response.data["next_cursor"]
+        self.assertEqual(
+            sorted(ids), sorted(issue.id for issue in self.issues)
+        )
+
+    def test_picked_fields_go_through_the_serializer(self):
+        url = reverse(
+            "project-issue",
+            kwargs={"slug": "plane", "project_id": self.project.id},
+        )
+
+        with mock.patch(
+            "plane.app.views.issue.issue_values"
+        ) as issue_values_mock:
+            response = self.client.get(url, {"fields": "id,name"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        issue_values_mock.assert_not_called()
+        self.assertEqual(len(response.data), len(self.issues))
+
+    def test_projection_matches_the_serializer_at_scale(self):
+        """Benchmark: rows/sec of the projection and the serializer"""
+        self.create_issues(2000)
+        queryset = self.queryset()
+
+        started = time.perf_counter()
+        serialized = IssueSerializer(queryset, many=True).data
+        serializer_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        projected = issue_rows(issue_values(queryset))
+        projection_time = time.perf_counter() - started
+
+        self.assertEqual(len(projected), len(serialized))
+        # Timings are reported, not asserted, to keep the test stable
+        sys.stderr.write(
+            f"\nserializer: {len(serialized) / serializer_time:.0f} rows/s, "
+            f"projection: {len(projected) / projection_time:.0f} rows/s\n"
+        )
@@ -0,0 +1,191 @@
+# Python imports
+import csv
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+import zipfile
+from datetime import date
+from unittest import mock
+
+# Django imports
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+# Module imports
+from plane.bgtasks.export_task import (
+    ExportProgress,
+    export_rows,
+    generate_csv,
+    generate_json,
+    generate_xlsx,
+)
+from plane.db.models import (
+    Issue,
+    IssueAssignee,
+    IssueLabel,
+    Label,
+    Project,
+    State,
+    User,
+    Workspace,
+)
+
+HEADER = ["ID", "Project", "Name", "Assignee", "Labels"]
+
+
+def make_rows(issues, per_issue=3):
+    """Export query rows, one per module of the issue"""
+    now = timezone.now()
+    for sequence_id in range(1, issues + 1):
+        for index in range(per_issue):
+            yield {
+                "id": sequence_id,
+                "project__identifier": "PLANE",
+                "project__name": "Plane",
+                "sequence_id": sequence_id,
+                "name": f"Issue {sequence_id}",
+                "description_stripped": "Description " * 20,
+                "state__name": "Todo",
+                "priority": "high",
+                "created_by__first_name": "Jane",
+                "created_by__last_name": "Doe",
+                "assignee_names": ["User0 Doe", "User1 Doe"],
+                "label_names": ["label-0", "label-1", "label-2"],
+                "issue_cycle__cycle__name": None,
+                "issue_cycle__cycle__start_date": None,
+                "issue_cycle__cycle__end_date": None,
+                "issue_module__module__name": f"Module {index}",
+                "issue_module__module__start_date": date(2024, 1, 1),
+                "issue_module__module__target_date": None,
+                "created_at": now,
+                "updated_at": now,
+                "completed_at": None,
+                "archived_at": None,
+            }
+
+
+@mock.patch.object(ExportProgress, "save", lambda self: None)
+class StreamingExportTest(SimpleTestCase):
+    def export(self, exporter, rows):
+        progress = ExportProgress(None)
+        archive = tempfile.TemporaryFile()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            exporter(HEADER, "project", rows, zip_file, progress)
+        archive.seek(0)
+        return zipfile.ZipFile(archive), progress
+
+    def test_csv_exports_an_issue_once(self):
+        archive, progress = self.export(generate_csv, make_rows(2))
+
+        with archive.open("project.csv") as file:
+            rows = list(csv.reader(io.TextIOWrapper(file, encoding="utf-8")))
+
+        self.assertEqual(progress.exported, 2)
+        self.assertEqual(rows[0], HEADER)
+        self.assertEqual([row[0] for row in rows[1:]], ["PLANE-1", "PLANE-2"])
+        self.assertEqual(rows[1][7], "User0 Doe, User1 Doe")
+        self.assertEqual(rows[1][8], "label-0, label-1, label-2")
+        self.assertEqual(rows[1][12], "Module 0")
+
+    def test_json_is_a_single_array(self):
+        archive, _ = self.export(generate_json, make_rows(3))
+
+        rows = json.loads(archive.read("project.json"))
+
+        self.assertEqual(
+            [row["ID"] for row in rows], ["PLANE-1", "PLANE-2", "PLANE-3"]
+        )
+        self.assertEqual(rows[2]["Labels"], "label-0, label-1, label-2")
+
+    def test_xlsx_is_written(self):
+        archive, progress = self.export(generate_xlsx, make_rows(5))
+
+        self.assertIn("project.xlsx", archive.namelist())
+        self.assertEqual(progress.exported, 5)
+
+    def test_peak_memory_does_not_grow_with_issues(self):
+        """Benchmark: peak memory of a 2k and a 20k issue csv export"""
+        peaks = {}
+        for issues in (2000, 20000):
+            tracemalloc.start()
+            started = time.perf_counter()
+            self.export(generate_csv, make_rows(issues))
+            elapsed = time.perf_counter() - started
+            peaks[issues] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            sys.stderr.write(
+                f"\ncsv export of {issues} issues: "
+                f"{elapsed:.2f}s, peak {peaks[issues] / 1024 / 1024:.1f} MiB\n"
+            )
+
+        # Ten times the issues must not take ten times the memory
+        self.assertLess(peaks[20000], peaks[2000] * 2)
+
+    def test_export_time_is_linear_in_issues(self):
+        """Benchmark: a 10k and a 50k issue csv export"""
+        for issues in (10000, 50000):
+            started = time.perf_counter()
+            _, progress = self.export(generate_csv, make_rows(issues))
+            elapsed = time.perf_counter() - started
+
+            self.assertEqual(progress.exported, issues)
+            # Timings are reported, not asserted, to keep the test stable
+            sys.stderr.write(
+                f"\ncsv export of {issues} issues: {elapsed:.2f}s\n"
+            )
+
+
+class ExportRowsTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create(
+            email="owner@plane.so", username=uuid.uuid4().hex
+        )
+        self.workspace = Workspace.objects.create(
+            name="Plane", slug="plane", owner=self.owner
+        )
+        self.project = Project.objects.create(
+            name="Plane", identifier="PLA", workspace=self.workspace
+        )
+        state = State.objects.create(
+            name="Todo", project=self.project, group="unstarted"
+        )
+        self.issues = [
+            Issue.objects.create(
+                name=f"Issue {i}", project=self.project, state=state
+            )
+            for i in range(2)
+        ]
+        for first_name in ["Jane", "John"]:
+            IssueAssignee.objects.create(
+                issue=self.issues[0],
+                project=self.project,
+                assignee=User.objects.create(
+                    email=f"{first_name.lower()}@plane.so",
+                    username=uuid.uuid4().hex,
+                    first_name=first_name,
+                    last_name="Doe",
+                ),
+            )
+        for name in ["bug", "feature"]:
+            IssueLabel.objects.create(
+                issue=self.issues[0],
+                project=self.project,
+                label=Label.objects.create(name=name, project=self.project),
+            )
+
+    def test_one_row_per_issue_with_merged_names(self):
+        rows = list(export_rows(Issue.objects.filter(project=self.project)))
+
+        self.assertEqual(
+            [row["id"] for row in rows], [issue.id for issue in self.issues]
+        )
+        self.assertEqual(
+            sorted(rows[0]["assignee_names"]), ["Jane Doe", "John Doe"]
+        )
+        self.assertEqual(sorted(rows[0]["label_names"]), ["bug", "feature"])
+        self.assertIsNone(rows[1]["assignee_names"])
+        self.assertIsNone(rows[1]["label_names"])
@@ -0,0 +1,214 @@
+# Python imports
+import json
+import uuid
+from unittest import mock
+
+# Django imports
+from django.test import SimpleTestCase, TestCase
+
+# Module imports
+from plane.db.models import (
+    User,
+    Workspace,
+    Project,
+    State,
+    Label,
+    Issue,
+    IssueActivity,
+)
+from plane.bgtasks.issue_activites_task import (
+    ACTIVITY_CLAIM_IDLE_MS,
+    ACTIVITY_DEAD_LETTER,
+    ACTIVITY_MAX_DELIVERIES,
+    ActivityLookups,
+    dead_letter_activity_events,
+    read_activity_events,
+    reschedule_activity_drain,
+    store_activity_events,
+    update_issue_activity,
+)
+
+
+class IssueActivityLookupQueryCount(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create(
+            email="owner@plane.so", username=uuid.uuid4().hex
+        )
+        self.workspace = Workspace.objects.create(
+            name="Plane", slug="plane", owner=self.owner
+        )
+        self.project = Project.objects.create(
+            name="Plane", identifier="PLA", workspace=self.workspace
+        )
+        self.states = [
+            State.objects.create(
+                name=f"State {i}", project=self.project, group="backlog"
+            )
+            for i in range(2)
+        ]
+        self.issue = Issue.objects.create(
+            name="Issue", project=self.project, state=self.states[0]
+        )
+        self.labels = [
+            Label.objects.create(name=f"Label {i}", project=self.project)
+            for i in range(10)
+        ]
+        self.users = [
+            User.objects.create(
+                email=f"user{i}@plane.so", username=uuid.uuid4().hex
+            )
+            for i in range(5)
+        ]
+
+    def activity_payload(self):
+        current_instance = {
+            "state_id": str(self.states[0].id),
+            "label_ids": [],
+            "assignee_ids": [],
+        }
+        requested_data = {
+            "state_id": str(self.states[1].id),
+            "label_ids": [str(label.id) for label in self.labels],
+            "assignee_ids": [str(user.id) for user in self.users],
+        }
+        return json.dumps(requested_data), json.dumps(current_instance)
+
+    def run_update(self, lookups):
+        requested_data, current_instance = self.activity_payload()
+        issue_activities = []
+        update_issue_activity(
+            requested_data=requested_data,
+            current_instance=current_instance,
+            issue_id=self.issue.id,
+            project_id=self.project.id,
+            workspace_id=self.workspace.id,
+            actor_id=self.owner.id,
+            issue_activities=issue_activities,
+            epoch=0,
+            lookups=lookups,
+        )
+        return issue_activities
+
+    def test_prefetched_lookups(self):
+        requested_data, current_instance = self.activity_payload()
+        lookups = ActivityLookups()
+        lookups.collect(
+            "issue.activity.updated",
+            requested_data,
+            current_instance,
+            self.issue.id,
+        )
+
+        # One in_bulk each for states, labels and users
+        with self.assertNumQueries(3):
+            lookups.load()
+
+        # Only the assignee subscriber insert is left
+        with self.assertNumQueries(1):
+            issue_activities = self.run_update(lookups)
+
+        # 1 state + 10 labels + 5 assignees
+        self.assertEqual(len(issue_activities), 16)
+
+    def test_bad_event_does_not_fail_the_batch(self):
+        events = [{"entry_ids": [f"1-{i}"]} for i in range(3)]
+        batches = [
+            (
+                event,
+                [
+                    IssueActivity(
+                        # The issue of the second event was deleted
+                        issue_id=self.issue.id if i != 1 else uuid.uuid4(),
+                        project=self.project,
+                        workspace=self.workspace,
+                        event_id=event["entry_ids"][0],
+                    )
+                ],
+            )
+            for i, event in enumerate(events)
+        ]
+
+        stored, failed = store_activity_events(batches)
+
+        self.assertEqual(
+            [event for event, _ in stored], [events[0], events[2]]
+        )
+        self.assertEqual(failed, [events[1]])
+        self.assertEqual(
+            set(IssueActivity.objects.values_list("event_id", flat=True)),
+            {"1-0", "1-2"},
+        )
+
+
+class DeadLetterActivityEventsTest(SimpleTestCase):
+    def test_entries_delivered_too_often_are_moved_aside(self):
+        messages = [
+            (b"1-0", {b"event": b"{}"}),
+            (b"1-1", {b"event": b"{}"}),
+        ]
+        ri = mock.MagicMock()
+        pipeline = ri.pipeline.return_value
+        pipeline.execute.side_effect = [
+            [
+                [{"message_id": b"1-0", "times_delivered": 2}],
+                [
+                    {
+                        "message_id": b"1-1",
+                        "times_delivered": ACTIVITY_MAX_DELIVERIES + 1,
+                    }
+                ],
+            ],
+            [],
+        ]
+
+        retried = dead_letter_activity_events(ri, messages)
+
+        self.assertEqual(retried, messages[:1])
+        pipeline.rpush.assert_called_once_with(
+            ACTIVITY_DEAD_LETTER,
+            json.dumps({"entry_id": "1-1", "event": "{}"}),
+        )
+        pipeline.xack.assert_called_once_with(mock.ANY, mock.ANY, b"1-1")
+
+
+class ActivityDrainScheduleTest(SimpleTestCase):
+    @mock.patch(
+        "plane.bgtasks.issue_activites_task.dead_letter_activity_events",
+        lambda ri, messages: messages,
+    )
+    def test_new_entries_are_read_along_with_claimed_ones(self):
+        ri = mock.MagicMock()
+        ri.xautoclaim.return_value = [b"0-0", [(b"1-0", {b"event": b"{}"})]]
+        ri.xreadgroup.return_value = [
+            [b"stream", [(b"2-0", {b"event": b"{}"})]]
+        ]
+
+        entry_ids, events = read_activity_events(ri, "consumer")
+
+        self.assertEqual(entry_ids, [b"1-0", b"2-0"])
+        self.assertEqual(len(events), 2)
+
+    @mock.patch(
+        "plane.bgtasks.issue_activites_task.drain_issue_activities.apply_async"
+    )
+    def test_drain_is_rescheduled_while_entries_are_left(self, apply_async):
+        ri = mock.MagicMock()
+        ri.set.return_value = True
+        ri.xpending.return_value = {"pending": 2}
+
+        # Unread entries are drained right away
+        ri.xlen.return_value = 3
+        reschedule_activity_drain(ri)
+        apply_async.assert_called_with(countdown=0)
+
+        # Pending entries once they can be claimed
+        ri.xlen.return_value = 2
+        reschedule_activity_drain(ri)
+        apply_async.assert_called_with(
+            countdown=ACTIVITY_CLAIM_IDLE_MS // 1000
+        )
+
+        apply_async.reset_mock()
+        ri.xlen.return_value = 0
+        reschedule_activity_drain(ri)
+        apply_async.assert_not_called()
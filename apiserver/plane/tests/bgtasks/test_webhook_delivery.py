@@ -0,0 +1,161 @@
+# Python imports
+import hashlib
+import hmac
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+# Django imports
+from django.test import SimpleTestCase
+
+# Module imports
+from plane.bgtasks.webhook_task import (
+    WebhookCircuit,
+    deliver_webhook,
+    encode_event_data,
+    webhook_delivery_task,
+)
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+            self.server.requests.append((dict(self.headers), body))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class StubCircuit:
+    def acquire_slot(self, limit):
+        return "slot"
+
+    def release_slot(self, token):
+        pass
+
+
+class WebhookDeliveryTest(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhookHandler)
+        self.server.lock = threading.Lock()
+        self.server.connections = set()
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.webhook = SimpleNamespace(
+            id=uuid4(),
+            workspace_id=uuid4(),
+            url=f"http://127.0.0.1:{self.server.server_address[1]}/hook",
+            secret_key="plane_wh_secret",
+            max_concurrency=4,
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_concurrent_deliveries_reuse_connections(self):
+        deliveries = [
+            encode_event_data({"id": str(uuid4())}) for _ in range(200)
+        ]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    lambda data: deliver_webhook(
+                        self.webhook, StubCircuit(), "issue", "PATCH", data
+                    ),
+                    deliveries,
+                )
+            )
+
+        self.assertTrue(
+            all(log.response_status == "200" for log, _ in results)
+        )
+        self.assertFalse(any(retry for _, retry in results))
+        self.assertEqual(len(self.server.requests), len(deliveries))
+        # The pooled session keeps at most one connection per worker thread
+        self.assertLessEqual(len(self.server.connections), 4)
+
+    def test_signature_covers_the_sent_body(self):
+        deliver_webhook(
+            self.webhook,
+            StubCircuit(),
+            "issue",
+            "POST",
+            encode_event_data({"id": "1", "name": "Issue"}),
+        )
+        headers, body = self.server.requests[0]
+        signature = hmac.new(
+            self.webhook.secret_key.encode("utf-8"), body, hashlib.sha256
+        ).hexdigest()
+        self.assertEqual(headers["X-Plane-Signature"], signature)
+        payload = json.loads(body)
+        self.assertEqual(payload["action"], "create")
+        self.assertEqual(payload["data"], {"id": "1", "name": "Issue"})
+
+
+class OpenCircuitTest(SimpleTestCase):
+    @mock.patch("plane.bgtasks.webhook_task.webhook_delivery_task.apply_async")
+    @mock.patch("plane.bgtasks.webhook_task.WebhookCircuit")
+    @mock.patch("plane.bgtasks.webhook_task.Webhook")
+    def test_open_circuit_does_not_spend_retries(
+        self, webhook_model, circuit, apply_async
+    ):
+        webhook_model.objects.filter.return_value.first.return_value = (
+            SimpleNamespace(id=uuid4())
+        )
+        circuit.return_value.open_for.return_value = 120
+        kwargs = {
+            "webhook": uuid4(),
+            "slug": "plane",
+            "event": "issue",
+            "payload_hashes": ["digest"],
+            "action": "POST",
+            "current_site": "http://localhost",
+        }
+
+        result = webhook_delivery_task.apply(kwargs=kwargs, retries=10)
+
+        self.assertTrue(result.successful())
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args.kwargs["countdown"], 120)
+        self.assertEqual(apply_async.call_args.kwargs["retries"], 10)
+
+
+class WebhookSlotTest(SimpleTestCase):
+    def setUp(self):
+        self.ri = mock.Mock()
+        self.script = self.ri.register_script.return_value
+        self.circuit = WebhookCircuit(uuid4(), ri=self.ri)
+        patcher = mock.patch.object(WebhookCircuit, "acquire_script", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_each_holder_releases_its_own_slot(self):
+        self.script.return_value = 1
+
+        first = self.circuit.acquire_slot(2)
+        second = self.circuit.acquire_slot(2)
+        self.circuit.release_slot(first)
+
+        self.assertNotEqual(first, second)
+        self.ri.zrem.assert_called_once_with(self.circuit.slots_key, first)
+        self.ri.decr.assert_not_called()
+
+    @mock.patch("plane.bgtasks.webhook_task.WEBHOOK_SLOT_WAIT", 0)
+    def test_full_endpoint_returns_no_slot(self):
+        self.script.return_value = 0
+
+        self.assertIsNone(self.circuit.acquire_slot(1))
+        self.ri.zadd.assert_not_called()
@@ -0,0 +1,34 @@
+# Python imports
+from unittest import mock
+
+# Django imports
+from django.core.exceptions import ObjectDoesNotExist
+from django.test import RequestFactory, SimpleTestCase
+
+# Module imports
+from plane.utils.etag import conditional_issue_list
+
+
+def unpublished(slug, project_id):
+    raise ObjectDoesNotExist
+
+
+@mock.patch("plane.utils.etag.issue_list_etag", lambda *args: '"etag"')
+class ConditionalIssueListTest(SimpleTestCase):
+    def get(self, view_method):
+        request = RequestFactory().get("/", HTTP_IF_NONE_MATCH='"etag"')
+        return view_method(None, request, slug="plane", project_id="id")
+
+    def test_matching_etag_is_not_modified(self):
+        view = mock.Mock()
+
+        response = self.get(conditional_issue_list()(view))
+
+        self.assertEqual(response.status_code, 304)
+        view.assert_not_called()
+
+    def test_precondition_runs_before_the_etag_is_compared(self):
+        view = conditional_issue_list(precondition=unpublished)(mock.Mock())
+
+        with self.assertRaises(ObjectDoesNotExist):
+            self.get(view)
@@ -0,0 +1,77 @@
+# Python imports
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+# Django imports
+from django.test import SimpleTestCase
+
+# Module imports
+from plane.app.serializers import IssueSerializer
+from plane.utils.issue_projection import ISSUE_PROJECTION_FIELDS, issue_rows
+
+
+class IssueRowsTest(SimpleTestCase):
+    def row(self, **values):
+        return {
+            "id": uuid4(),
+            "name": "Issue",
+            "state_id": uuid4(),
+            "sort_order": 65535.0,
+            "estimate_point": None,
+            "priority": "none",
+            "sequence_id": 1,
+            "project_id": uuid4(),
+            "parent_id": None,
+            "sub_issues_count": 0,
+            "created_by_id": uuid4(),
+            "updated_by_id": None,
+            "attachment_count": 0,
+            "link_count": 0,
+            "is_draft": False,
+            "completed_at": None,
+            "start_date": None,
+            "target_date": None,
+            "created_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "updated_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "archived_at": None,
+            "label_ids": None,
+            "assignee_ids": None,
+            "module_ids": None,
+            **values,
+        }
+
+    def test_keys_follow_the_serializer(self):
+        self.assertEqual(ISSUE_PROJECTION_FIELDS, IssueSerializer.Meta.fields)
+
+        row = self.row(cycle_id=None, is_subscribed=True)
+        self.assertEqual(
+            list(issue_rows([row])[0]), IssueSerializer.Meta.fields
+        )
+
+        # Fields missing on the queryset are left out like the serializer
+        result = issue_rows([self.row()])[0]
+        self.assertNotIn("cycle_id", result)
+        self.assertNotIn("is_subscribed", result)
+
+    def test_values_are_rendered_like_the_serializer(self):
+        label_id, created_by_id = uuid4(), uuid4()
+
+        result = issue_rows(
+            [
+                self.row(
+                    created_by_id=created_by_id,
+                    target_date=date(2024, 2, 1),
+                    label_ids=[label_id],
+                    priority_order=2,
+                )
+            ]
+        )[0]
+
+        self.assertEqual(result["created_by"], created_by_id)
+        self.assertEqual(result["created_at"], "2024-01-02T03:04:05Z")
+        self.assertEqual(result["target_date"], "2024-02-01")
+        self.assertIsNone(result["start_date"])
+        self.assertEqual(result["label_ids"], [label_id])
+        self.assertEqual(result["assignee_ids"], [])
+        # Extra columns such as the paginator keys are not returned
+        self.assertNotIn("priority_order", result)
@@ -0,0 +1,60 @@
+# Python imports
+from unittest import mock
+
+# Django imports
+from django.test import RequestFactory, SimpleTestCase
+
+# Third party imports
+from rest_framework.exceptions import ParseError
+
+# Module imports
+from plane.utils.paginator import BasePaginator, get_count
+
+
+class GetPerPageTest(SimpleTestCase):
+    def get_per_page(self, per_page):
+        request = RequestFactory().get("/", {"per_page": per_page})
+        return BasePaginator().get_per_page(
+            request, default_per_page=50, max_per_page=100
+        )
+
+    def test_valid_page_size(self):
+        self.assertEqual(self.get_per_page("25"), 25)
+
+    def test_invalid_page_sizes_are_rejected(self):
+        for per_page in ["abc", "0", "-5", "1000"]:
+            with self.assertRaises(ParseError):
+                self.get_per_page(per_page)
+
+
+@mock.patch("plane.utils.paginator.redis_instance")
+class GetCountTest(SimpleTestCase):
+    def queryset(self, count=3):
+        queryset = mock.MagicMock()
+        queryset.query.where = True
+        queryset.model._meta.db_table = "issues"
+        queryset.count.return_value = count
+        return queryset
+
+    def test_counts_without_versions_are_not_cached(self, redis_instance):
+        self.assertEqual(get_count(self.queryset()), 3)
+        redis_instance.assert_not_called()
+
+    def test_counts_are_cached_per_version(self, redis_instance):
+        ri = redis_instance.return_value
+        ri.mget.return_value = [b"7"]
+        ri.get.return_value = None
+
+        self.assertEqual(get_count(self.queryset(), ["issue_version:1"]), 3)
+        key = ri.set.call_args.args[0]
+        self.assertTrue(key.startswith("paginator:count:issues:7:"))
+
+        ri.get.return_value = b"5"
+        self.assertEqual(get_count(self.queryset(), ["issue_version:1"]), 5)
+
+    def test_missing_version_is_not_cached(self, redis_instance):
+        ri = redis_instance.return_value
+        ri.mget.return_value = [None]
+
+        self.assertEqual(get_count(self.queryset(), ["issue_version:1"]), 3)
+        ri.set.assert_not_called()
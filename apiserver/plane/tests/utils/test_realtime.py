@@ -0,0 +1,198 @@
+# Python imports
+import json
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+# Django imports
+from django.test import SimpleTestCase
+
+# Third party imports
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from channels.routing import URLRouter
+
+# Module imports
+from plane.app.middleware.websocket_authentication import get_raw_token
+from plane.app.routing import websocket_urlpatterns
+from plane.utils.realtime import (
+    activity_changes,
+    publish_issue_changes,
+    publish_unread_counters,
+)
+
+PROJECT_ID = str(uuid4())
+OTHER_PROJECT_ID = str(uuid4())
+
+
+def memberships(user_id):
+    return {
+        "workspaces": {"plane": [20, True], "other": [20, True]},
+        "projects": {
+            PROJECT_ID: ["plane", 20, True],
+            OTHER_PROJECT_ID: ["plane", 15, False],
+        },
+    }
+
+
+@mock.patch("plane.utils.realtime.issue_versions", lambda ids: [7] * len(ids))
+@mock.patch("plane.app.consumers.changes.load_memberships", memberships)
+class ChangesConsumerTest(SimpleTestCase):
+    async def connect(self, slug="plane", anonymous=False, subprotocols=None):
+        communicator = ApplicationCommunicator(
+            URLRouter(websocket_urlpatterns),
+            {
+                "type": "websocket",
+                "path": f"/api/ws/workspaces/{slug}/",
+                "headers": [],
+                "query_string": b"",
+                "subprotocols": subprotocols or [],
+                "user": SimpleNamespace(id=uuid4(), is_anonymous=anonymous),
+            },
+        )
+        await communicator.send_input({"type": "websocket.connect"})
+        return communicator, await communicator.receive_output(timeout=1)
+
+    async def send(self, communicator, content):
+        await communicator.send_input(
+            {"type": "websocket.receive", "text": json.dumps(content)}
+        )
+        return await self.receive(communicator)
+
+    async def receive(self, communicator):
+        message = await communicator.receive_output(timeout=1)
+        return json.loads(message["text"])
+
+    def test_anonymous_users_are_rejected(self):
+        async def run():
+            _, message = await self.connect(anonymous=True)
+            self.assertEqual(message["type"], "websocket.close")
+
+            _, message = await self.connect(slug="unknown")
+            self.assertEqual(message["type"], "websocket.close")
+
+        async_to_sync(run)()
+
+    def test_token_subprotocol_is_accepted(self):
+        async def run():
+            _, message = await self.connect(subprotocols=["bearer"])
+            self.assertEqual(message["type"], "websocket.accept")
+            self.assertEqual(message["subprotocol"], "bearer")
+
+        async_to_sync(run)()
+
+    def test_subscribed_projects_receive_issue_changes(self):
+        async def run():
+            communicator, message = await self.connect()
+            self.assertEqual(message["type"], "websocket.accept")
+
+            # Inactive memberships are not subscribed
+            reply = await self.send(communicator, {"action": "subscribe"})
+            self.assertEqual(reply["project_ids"], [PROJECT_ID])
+
+            await sync_to_async(publish_issue_changes)(
+                [
+                    {
+                        "issue_id": "issue",
+                        "project_id": PROJECT_ID,
+                        "fields": ["state"],
+                        "deleted": False,
+                    }
+                ]
+            )
+            change = await self.receive(communicator)
+            self.assertEqual(change["type"], "issue.change")
+            self.assertEqual(change["fields"], ["state"])
+            self.assertEqual(change["version"], 7)
+
+            reply = await self.send(communicator, {"action": "unsubscribe"})
+            self.assertEqual(reply["project_ids"], [])
+            await communicator.send_input(
+                {"type": "websocket.disconnect", "code": 1000}
+            )
+            await communicator.wait(timeout=1)
+
+        async_to_sync(run)()
+
+    def test_unread_counters_of_the_workspace_are_pushed(self):
+        async def run():
+            communicator, _ = await self.connect()
+            user_id = communicator.scope["user"].id
+
+            counters = {"watching_issues": 1, "my_issues": 2}
+            await sync_to_async(publish_unread_counters)(
+                "other", {user_id: None}
+            )
+            await sync_to_async(publish_unread_counters)(
+                "plane", {user_id: counters}
+            )
+            message = await self.receive(communicator)
+            self.assertEqual(message["type"], "notification.unread")
+            self.assertEqual(message["counters"], counters)
+            self.assertTrue(await communicator.receive_nothing())
+
+        async_to_sync(run)()
+
+
+class GetRawTokenTest(SimpleTestCase):
+    def test_token_is_read_from_the_subprotocols(self):
+        token, subprotocols = get_raw_token(
+            {"subprotocols": ["bearer", "jwt", "json"]}
+        )
+        self.assertEqual(token, "jwt")
+        # The token is not handed over to the consumer
+        self.assertEqual(subprotocols, ["bearer", "json"])
+
+    def test_token_is_read_from_the_authorization_header(self):
+        token, _ = get_raw_token(
+            {"headers": [(b"authorization", b"Bearer jwt")]}
+        )
+        self.assertEqual(token, "jwt")
+
+    def test_query_string_token_is_ignored(self):
+        token, _ = get_raw_token({"query_string": b"token=jwt"})
+        self.assertIsNone(token)
+
+
+class ActivityChangesTest(SimpleTestCase):
+    def test_fields_are_grouped_per_issue(self):
+        issue_id, sub_issue_id = uuid4(), uuid4()
+        activities = [
+            SimpleNamespace(issue_id=issue_id, field="state"),
+            SimpleNamespace(issue_id=issue_id, field="labels"),
+            SimpleNamespace(issue_id=sub_issue_id, field="parent"),
+        ]
+
+        changes = activity_changes(
+            "issue.activity.updated", issue_id, PROJECT_ID, activities
+        )
+
+        self.assertEqual(
+            {change["issue_id"]: change["fields"] for change in changes},
+            {
+                str(issue_id): ["labels", "state"],
+                str(sub_issue_id): ["parent"],
+            },
+        )
+
+    def test_deleted_issue(self):
+        issue_id = uuid4()
+
+        changes = activity_changes(
+            "issue.activity.deleted",
+            issue_id,
+            PROJECT_ID,
+            [SimpleNamespace(issue_id=None, field="issue")],
+        )
+
+        self.assertEqual(
+            changes,
+            [
+                {
+                    "issue_id": str(issue_id),
+                    "project_id": PROJECT_ID,
+                    "fields": ["issue"],
+                    "deleted": True,
+                }
+            ],
+        )
@@ -1,42 +1,74 @@
 # Python imports
+import json
 from itertools import groupby
 from datetime import timedelta
 
 # Django import
-from django.db import models
 from django.utils import timezone
 from django.db.models.functions import TruncDate
-from django.db.models import Count, F, Sum, Value, Case, When, CharField
-from django.db.models.functions import (
-    Coalesce,
-    ExtractMonth,
-    ExtractYear,
-    Concat,
-)
+from django.db.models import Count, F, Q, Sum, FilteredRelation
+
+# Third party imports
+from sentry_sdk import capture_exception
 
 # Module imports
-from plane.db.models import Issue
+from plane.db.models import (
+    Cycle,
+    Issue,
+    IssueAnalytics,
+    Label,
+    Module,
+    State,
+    User,
+)
+from plane.db.models.analytic import burndown_version_key
+from plane.settings.redis import redis_instance
+
+BURNDOWN_CACHE_TIMEOUT = 60 * 60
 
+# Issue axes mapped to the columns of the analytics facts
+ANALYTICS_AXIS_COLUMNS = {
+    "state_id": "state_id",
+    "state__group": "state_group",
+    "estimate_point": "estimate_point",
+    "issue_cycle__cycle_id": "cycle_id",
+    "priority": "priority",
+    "created_at": "created_month",
+    "start_date": "start_month",
+    "target_date": "target_month",
+    "completed_at": "completed_month",
+}
 
-def annotate_with_monthly_dimension(queryset, field_name, attribute):
-    # Get the year and the months
-    year = ExtractYear(field_name)
-    month = ExtractMonth(field_name)
-    # Concat the year and month
-    dimension = Concat(year, Value("-"), month, output_field=CharField())
-    # Annotate the dimension
-    return queryset.annotate(**{attribute: dimension})
+# Multi valued issue axes mapped to their analytics dimension kind
+ANALYTICS_AXIS_DIMENSIONS = {
+    "labels__id": "label",
+    "assignees__id": "assignee",
+    "issue_module__module_id": "module",
+}
 
 
-def extract_axis(queryset, x_axis):
-    # Format the dimension when the axis is in date
-    if x_axis in ["created_at", "start_date", "target_date", "completed_at"]:
-        queryset = annotate_with_monthly_dimension(
-            queryset, x_axis, "dimension"
+def analytics_facts(queryset):
+    """Analytics facts of the issues of an issue queryset"""
+    if queryset.model is IssueAnalytics:
+        return queryset
+    return IssueAnalytics.objects.filter(issue_id__in=queryset.values("id"))
+
+
+def annotate_axis(queryset, axis, attribute):
+    kind = ANALYTICS_AXIS_DIMENSIONS.get(axis)
+    if kind is None:
+        return queryset.annotate(
+            **{attribute: F(ANALYTICS_AXIS_COLUMNS[axis])}
         )
-        return queryset, "dimension"
-    else:
-        return queryset.annotate(dimension=F(x_axis)), "dimension"
+    # Left join the dimension rows of the kind once per axis
+    relation = f"{attribute}_dimension"
+    return queryset.annotate(
+        **{
+            relation: FilteredRelation(
+                "dimensions", condition=Q(dimensions__kind=kind)
+            )
+        }
+    ).annotate(**{attribute: F(f"{relation}__value")})
 
 
 def sort_data(data, temp_axis):
@@ -49,57 +81,24 @@ def sort_data(data, temp_axis):
 
 
 def build_graph_plot(queryset, x_axis, y_axis, segment=None):
-    # temp x_axis
-    temp_axis = x_axis
-    # Extract the x_axis and queryset
-    queryset, x_axis = extract_axis(queryset, x_axis)
-    if x_axis == "dimension":
-        queryset = queryset.exclude(dimension__isnull=True)
-
-    #
-    if segment in ["created_at", "start_date", "target_date", "completed_at"]:
-        queryset = annotate_with_monthly_dimension(
-            queryset, segment, "segmented"
-        )
-        segment = "segmented"
+    # Group the compact analytics facts instead of the issues
+    queryset = annotate_axis(analytics_facts(queryset), x_axis, "dimension")
+    queryset = queryset.filter(dimension__isnull=False)
 
-    queryset = queryset.values(x_axis)
+    fields = ["dimension"]
+    if segment:
+        queryset = annotate_axis(queryset, segment, "segment")
+        fields.append("segment")
+    queryset = queryset.values(*fields)
 
     # Issue count
     if y_axis == "issue_count":
-        queryset = queryset.annotate(
-            is_null=Case(
-                When(dimension__isnull=True, then=Value("None")),
-                default=Value("not_null"),
-                output_field=models.CharField(max_length=8),
-            ),
-            dimension_ex=Coalesce("dimension", Value("null")),
-        ).values("dimension")
-        queryset = (
-            queryset.annotate(segment=F(segment)) if segment else queryset
-        )
-        queryset = (
-            queryset.values("dimension", "segment")
-            if segment
-            else queryset.values("dimension")
-        )
-        queryset = queryset.annotate(count=Count("*")).order_by("dimension")
-
+        queryset = queryset.annotate(count=Count("*"))
     # Estimate
     else:
-        queryset = queryset.annotate(estimate=Sum("estimate_point")).order_by(
-            x_axis
-        )
-        queryset = (
-            queryset.annotate(segment=F(segment)) if segment else queryset
-        )
-        queryset = (
-            queryset.values("dimension", "segment", "estimate")
-            if segment
-            else queryset.values("dimension", "estimate")
-        )
+        queryset = queryset.annotate(estimate=Sum("estimate_point"))
 
-    result_values = list(queryset)
+    result_values = list(queryset.order_by("dimension"))
     grouped_data = {
         str(key): list(items)
         for key, items in groupby(
@@ -107,71 +106,240 @@ def build_graph_plot(queryset, x_axis, y_axis, segment=None):
         )
     }
 
-    return sort_data(grouped_data, temp_axis)
+    return sort_data(grouped_data, x_axis)
 
 
-def burndown_plot(queryset, slug, project_id, cycle_id=None, module_id=None):
-    # Total Issues in Cycle or Module
-    total_issues = queryset.total_issues
+def axis_values(distribution, axis, x_axis, segment):
+    """Identifiers an axis takes in a graph distribution"""
+    if axis == x_axis:
+        return list(distribution.keys())
+    if axis == segment:
+        return list(
+            {
+                item["segment"]
+                for items in distribution.values()
+                for item in items
+                if item.get("segment") is not None
+            }
+        )
+    return []
 
-    if cycle_id:
-        # Get all dates between the two dates
-        date_range = [
-            queryset.start_date + timedelta(days=x)
-            for x in range((queryset.end_date - queryset.start_date).days + 1)
+
+def build_graph_details(distribution, x_axis, segment=None):
+    """
+    Names and colors of the states, labels, assignees, cycles and modules
+    plotted in a graph distribution
+    """
+    details = {
+        "state_details": {},
+        "assignee_details": {},
+        "label_details": {},
+        "cycle_details": {},
+        "module_details": {},
+    }
+
+    if "state_id" in [x_axis, segment]:
+        details["state_details"] = [
+            {
+                "state_id": state["id"],
+                "state__name": state["name"],
+                "state__color": state["color"],
+            }
+            for state in State.objects.filter(
+                pk__in=axis_values(distribution, "state_id", x_axis, segment)
+            )
+            .order_by("id")
+            .values("id", "name", "color")
         ]
 
-        chart_data = {str(date): 0 for date in date_range}
+    if "labels__id" in [x_axis, segment]:
+        details["label_details"] = [
+            {
+                "labels__id": label["id"],
+                "labels__color": label["color"],
+                "labels__name": label["name"],
+            }
+            for label in Label.objects.filter(
+                pk__in=axis_values(distribution, "labels__id", x_axis, segment)
+            )
+            .order_by("id")
+            .values("id", "color", "name")
+        ]
 
-        completed_issues_distribution = (
-            Issue.issue_objects.filter(
-                workspace__slug=slug,
-                project_id=project_id,
-                issue_cycle__cycle_id=cycle_id,
+    if "assignees__id" in [x_axis, segment]:
+        details["assignee_details"] = [
+            {
+                "assignees__avatar": user["avatar"],
+                "assignees__display_name": user["display_name"],
+                "assignees__first_name": user["first_name"],
+                "assignees__last_name": user["last_name"],
+                "assignees__id": user["id"],
+            }
+            for user in User.objects.filter(
+                pk__in=axis_values(
+                    distribution, "assignees__id", x_axis, segment
+                ),
+                avatar__isnull=False,
             )
-            .annotate(date=TruncDate("completed_at"))
-            .values("date")
-            .annotate(total_completed=Count("id"))
-            .values("date", "total_completed")
-            .order_by("date")
-        )
+            .order_by("id")
+            .values("avatar", "display_name", "first_name", "last_name", "id")
+        ]
 
-    if module_id:
-        # Get all dates between the two dates
-        date_range = [
-            queryset.start_date + timedelta(days=x)
-            for x in range(
-                (queryset.target_date - queryset.start_date).days + 1
+    if "issue_cycle__cycle_id" in [x_axis, segment]:
+        details["cycle_details"] = [
+            {
+                "issue_cycle__cycle_id": cycle["id"],
+                "issue_cycle__cycle__name": cycle["name"],
+            }
+            for cycle in Cycle.objects.filter(
+                pk__in=axis_values(
+                    distribution, "issue_cycle__cycle_id", x_axis, segment
+                )
             )
+            .order_by("id")
+            .values("id", "name")
         ]
 
-        chart_data = {str(date): 0 for date in date_range}
+    if "issue_module__module_id" in [x_axis, segment]:
+        details["module_details"] = [
+            {
+                "issue_module__module_id": module["id"],
+                "issue_module__module__name": module["name"],
+            }
+            for module in Module.objects.filter(
+                pk__in=axis_values(
+                    distribution, "issue_module__module_id", x_axis, segment
+                )
+            )
+            .order_by("id")
+            .values("id", "name")
+        ]
+
+    return details
+
+
+def burndown_cache_key(kind, entity_id, plot_type):
+    version = redis_instance().get(burndown_version_key(kind, entity_id))
+    return (
+        f"burndown:{kind}:{entity_id}:{int(version or 0)}:{plot_type}:"
+        f"{timezone.now().date()}"
+    )
+
+
+def ideal_burndown_plot(start_date, end_date, total):
+    """Linear burn from the total scope on the first day to zero"""
+    days = (end_date - start_date).days
+    return {
+        str(start_date + timedelta(days=x)): (
+            round(total * (days - x) / days, 2) if days else 0
+        )
+        for x in range(days + 1)
+    }
+
+
+def burndown_charts(
+    queryset,
+    slug,
+    project_id,
+    cycle_id=None,
+    module_id=None,
+    plot_type="issues",
+):
+    """
+    Pending issues (or estimate points with plot_type "points") at the end
+    of every day of a cycle or module along with the ideal burn, computed
+    in one pass over the daily completion totals and cached until the
+    cycle or module changes
+    """
+    if cycle_id:
+        kind, entity_id, end_date = "cycle", cycle_id, queryset.end_date
+        issues = Issue.issue_objects.filter(
+            workspace__slug=slug,
+            project_id=project_id,
+            issue_cycle__cycle_id=cycle_id,
+        )
 
-        completed_issues_distribution = (
-            Issue.issue_objects.filter(
-                workspace__slug=slug,
-                project_id=project_id,
-                issue_module__module_id=module_id,
+    if module_id:
+        kind, entity_id, end_date = "module", module_id, queryset.target_date
+        issues = Issue.issue_objects.filter(
+            workspace__slug=slug,
+            project_id=project_id,
+            issue_module__module_id=module_id,
+        )
+
+    try:
+        ri = redis_instance()
+        cache_key = burndown_cache_key(kind, entity_id, plot_type)
+        charts = ri.get(cache_key)
+        if charts is not None:
+            return json.loads(charts)
+    except Exception as e:
+        capture_exception(e)
+        ri = None
+
+    # Issues or estimate points completed per day
+    completed_issues_distribution = list(
+        issues.annotate(date=TruncDate("completed_at"))
+        .values("date")
+        .annotate(
+            total_completed=(
+                Sum("estimate_point") if plot_type == "points" else Count("id")
             )
-            .annotate(date=TruncDate("completed_at"))
-            .values("date")
-            .annotate(total_completed=Count("id"))
-            .values("date", "total_completed")
-            .order_by("date")
         )
+        .values("date", "total_completed")
+        .order_by("date")
+    )
 
-    for date in date_range:
-        cumulative_pending_issues = total_issues
-        total_completed = 0
-        total_completed = sum(
-            item["total_completed"]
+    if plot_type == "points":
+        total = sum(
+            item["total_completed"] or 0
             for item in completed_issues_distribution
-            if item["date"] is not None and item["date"] <= date
         )
-        cumulative_pending_issues -= total_completed
-        if date > timezone.now().date():
+    else:
+        total = queryset.total_issues
+
+    completed = [
+        (item["date"], item["total_completed"] or 0)
+        for item in completed_issues_distribution
+        if item["date"] is not None
+    ]
+
+    today = timezone.now().date()
+    chart_data = {}
+    index = 0
+    total_completed = 0
+    for x in range((end_date - queryset.start_date).days + 1):
+        date = queryset.start_date + timedelta(days=x)
+        # Completion dates are sorted so the running total only moves forward
+        while index < len(completed) and completed[index][0] <= date:
+            total_completed += completed[index][1]
+            index += 1
+        if date > today:
             chart_data[str(date)] = None
         else:
-            chart_data[str(date)] = cumulative_pending_issues
+            chart_data[str(date)] = total - total_completed
 
-    return chart_data
+    charts = {
+        "completion_chart": chart_data,
+        "ideal_chart": ideal_burndown_plot(
+            queryset.start_date, end_date, total
+        ),
+    }
+
+    if ri is not None:
+        try:
+            ri.set(cache_key, json.dumps(charts), ex=BURNDOWN_CACHE_TIMEOUT)
+        except Exception as e:
+            capture_exception(e)
+
+    return charts
+
+
+def burndown_plot(queryset, slug, project_id, cycle_id=None, module_id=None):
+    return burndown_charts(
+        queryset,
+        slug,
+        project_id,
+        cycle_id=cycle_id,
+        module_id=module_id,
+    )["completion_chart"]
@@ -0,0 +1,125 @@
+# Python imports
+import hashlib
+import json
+from functools import wraps
+
+# Django imports
+from django.utils import timezone
+
+# Third party imports
+from rest_framework import status
+from rest_framework.response import Response
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.app.permissions import get_memberships
+from plane.db.models.issue import issue_version_key
+from plane.settings.redis import redis_instance
+
+
+def issue_versions(project_ids):
+    """Issue data versions of the projects, started when missing"""
+    ri = redis_instance()
+    keys = [issue_version_key(project_id) for project_id in project_ids]
+    versions = ri.mget(keys) if keys else []
+    missing = [key for key, version in zip(keys, versions) if version is None]
+    if missing:
+        # Start past any version handed out before the key was lost
+        pipeline = ri.pipeline()
+        for key in missing:
+            pipeline.set(key, int(timezone.now().timestamp() * 1000), nx=True)
+        pipeline.execute()
+        versions = ri.mget(keys)
+    return [int(version) for version in versions]
+
+
+def issue_list_etag(request, scope, kwargs):
+    slug = kwargs.get("slug")
+    user_id, role = None, None
+    if scope == "workspace":
+        if request.user.is_anonymous:
+            return None
+        memberships = get_memberships(request)
+        project_ids = sorted(
+            project_id
+            for project_id, (project_slug, _, is_active) in (
+                memberships.projects.items()
+            )
+            if project_slug == slug and is_active
+        )
+        user_id = str(request.user.id)
+        role = memberships.workspace_role(slug)
+    else:
+        project_ids = [str(kwargs.get("project_id"))]
+        if not request.user.is_anonymous:
+            user_id = str(request.user.id)
+            role = get_memberships(request).project_role(
+                slug, kwargs.get("project_id")
+            )
+
+    payload = json.dumps(
+        [
+            request.path,
+            sorted(
+                (key, sorted(values))
+                for key, values in request.query_params.lists()
+            ),
+            user_id,
+            role,
+            project_ids,
+            issue_versions(project_ids),
+        ]
+    )
+    return f'"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    return any(
+        tag.strip().removeprefix("W/") in (etag, "*")
+        for tag in if_none_match.split(",")
+    )
+
+
+def conditional_issue_list(scope="project", precondition=None):
+    """
+    Tag the responses of an issue list with an ETag derived from the issue
+    data version of the listed projects, the filters, the user and their
+    role. Requests whose If-None-Match still matches are answered with
+    304 Not Modified before the database is queried
+
+    Args:
+        scope (string): "project" for the issues of the project_id url
+        argument, "workspace" for those of every project of the user
+        precondition (callable): called with the url arguments before the
+        ETag is compared, raises when the list is not available
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if precondition is not None:
+                precondition(**kwargs)
+
+            try:
+                etag = issue_list_etag(request, scope, kwargs)
+            except Exception as e:
+                capture_exception(e)
+                etag = None
+
+            if etag is not None and etag_matches(request, etag):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag},
+                )
+
+            response = view_method(self, request, *args, **kwargs)
+            if etag is not None and response.status_code == 200:
+                response["ETag"] = etag
+            return response
+
+        return wrapper
+
+    return decorator
@@ -1,3 +1,27 @@
+# Python imports
+from collections import defaultdict
+
+# Django imports
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import Count, Func, UUIDField
+
+PRIORITY_ORDER = ["urgent", "high", "medium", "low", "none"]
+
+# Group keys of the serialized issues mapped to the issue fields
+GROUP_BY_FIELDS = {
+    "state": "state_id",
+    "state_detail.group": "state__group",
+    "priority": "priority",
+    "labels": "labels__id",
+    "assignees": "assignees__id",
+    "created_by": "created_by_id",
+    "project": "project_id",
+    "cycle_id": "issue_cycle__cycle_id",
+    "module_ids": "issue_module__module_id",
+}
+
+
 def resolve_keys(group_keys, value):
     """resolve keys to a key which will be used for
     grouping
@@ -9,10 +33,49 @@ def resolve_keys(group_keys, value):
     Returns:
         string: the key which will be used for
     """
+    return compile_keys(group_keys)(value)
+
+
+def compile_keys(group_keys):
+    """compile a dotted group key into a function resolving it
+
+    Args:
+        group_keys (string): key which will be used for grouping
+
+    Returns:
+        function: resolves the key of a data value
+    """
     keys = group_keys.split(".")
-    for key in keys:
-        value = value.get(key, None)
-    return value
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda value: value.get(key, None)
+
+    def resolve(value):
+        for key in keys:
+            if value is None:
+                return None
+            value = value.get(key, None)
+        return value
+
+    return resolve
+
+
+def compile_group_names(group_keys):
+    """compile a dotted group key into a function returning the names of
+    every group a data value belongs to
+
+    List values (labels, assignees) place the value in one group per item
+    and in the "None" group when empty
+    """
+    resolve = compile_keys(group_keys)
+
+    def group_names(value):
+        attribute = resolve(value)
+        if isinstance(attribute, list):
+            return [str(attrib) for attrib in attribute] or [str(None)]
+        return [str(attribute)]
+
+    return group_names
 
 
 def group_results(results_data, group_by, sub_group_by=False):
@@ -25,216 +88,106 @@ def group_results(results_data, group_by, sub_group_by=False):
     Returns:
         obj: grouped results
     """
+    group_names = compile_group_names(group_by)
+
     if sub_group_by:
-        main_responsive_dict = dict()
+        sub_group_names = compile_group_names(sub_group_by)
+        main_responsive_dict = defaultdict(lambda: defaultdict(list))
 
         if sub_group_by == "priority":
-            main_responsive_dict = {
-                "urgent": {},
-                "high": {},
-                "medium": {},
-                "low": {},
-                "none": {},
-            }
+            main_responsive_dict.update(
+                {priority: defaultdict(list) for priority in PRIORITY_ORDER}
+            )
 
         for value in results_data:
-            main_group_attribute = resolve_keys(sub_group_by, value)
-            group_attribute = resolve_keys(group_by, value)
-            if isinstance(main_group_attribute, list) and not isinstance(
-                group_attribute, list
-            ):
-                if len(main_group_attribute):
-                    for attrib in main_group_attribute:
-                        if str(attrib) not in main_responsive_dict:
-                            main_responsive_dict[str(attrib)] = {}
-                        if (
-                            str(group_attribute)
-                            in main_responsive_dict[str(attrib)]
-                        ):
-                            main_responsive_dict[str(attrib)][
-                                str(group_attribute)
-                            ].append(value)
-                        else:
-                            main_responsive_dict[str(attrib)][
-                                str(group_attribute)
-                            ] = []
-                            main_responsive_dict[str(attrib)][
-                                str(group_attribute)
-                            ].append(value)
-                else:
-                    if str(None) not in main_responsive_dict:
-                        main_responsive_dict[str(None)] = {}
-
-                    if str(group_attribute) in main_responsive_dict[str(None)]:
-                        main_responsive_dict[str(None)][
-                            str(group_attribute)
-                        ].append(value)
-                    else:
-                        main_responsive_dict[str(None)][
-                            str(group_attribute)
-                        ] = []
-                        main_responsive_dict[str(None)][
-                            str(group_attribute)
-                        ].append(value)
-
-            elif isinstance(group_attribute, list) and not isinstance(
-                main_group_attribute, list
-            ):
-                if str(main_group_attribute) not in main_responsive_dict:
-                    main_responsive_dict[str(main_group_attribute)] = {}
-                if len(group_attribute):
-                    for attrib in group_attribute:
-                        if (
-                            str(attrib)
-                            in main_responsive_dict[str(main_group_attribute)]
-                        ):
-                            main_responsive_dict[str(main_group_attribute)][
-                                str(attrib)
-                            ].append(value)
-                        else:
-                            main_responsive_dict[str(main_group_attribute)][
-                                str(attrib)
-                            ] = []
-                            main_responsive_dict[str(main_group_attribute)][
-                                str(attrib)
-                            ].append(value)
-                else:
-                    if (
-                        str(None)
-                        in main_responsive_dict[str(main_group_attribute)]
-                    ):
-                        main_responsive_dict[str(main_group_attribute)][
-                            str(None)
-                        ].append(value)
-                    else:
-                        main_responsive_dict[str(main_group_attribute)][
-                            str(None)
-                        ] = []
-                        main_responsive_dict[str(main_group_attribute)][
-                            str(None)
-                        ].append(value)
-
-            elif isinstance(group_attribute, list) and isinstance(
-                main_group_attribute, list
-            ):
-                if len(main_group_attribute):
-                    for main_attrib in main_group_attribute:
-                        if str(main_attrib) not in main_responsive_dict:
-                            main_responsive_dict[str(main_attrib)] = {}
-                        if len(group_attribute):
-                            for attrib in group_attribute:
-                                if (
-                                    str(attrib)
-                                    in main_responsive_dict[str(main_attrib)]
-                                ):
-                                    main_responsive_dict[str(main_attrib)][
-                                        str(attrib)
-                                    ].append(value)
-                                else:
-                                    main_responsive_dict[str(main_attrib)][
-                                        str(attrib)
-                                    ] = []
-                                    main_responsive_dict[str(main_attrib)][
-                                        str(attrib)
-                                    ].append(value)
-                        else:
-                            if (
-                                str(None)
-                                in main_responsive_dict[str(main_attrib)]
-                            ):
-                                main_responsive_dict[str(main_attrib)][
-                                    str(None)
-                                ].append(value)
-                            else:
-                                main_responsive_dict[str(main_attrib)][
-                                    str(None)
-                                ] = []
-                                main_responsive_dict[str(main_attrib)][
-                                    str(None)
-                                ].append(value)
-                else:
-                    if str(None) not in main_responsive_dict:
-                        main_responsive_dict[str(None)] = {}
-                    if len(group_attribute):
-                        for attrib in group_attribute:
-                            if str(attrib) in main_responsive_dict[str(None)]:
-                                main_responsive_dict[str(None)][
-                                    str(attrib)
-                                ].append(value)
-                            else:
-                                main_responsive_dict[str(None)][
-                                    str(attrib)
-                                ] = []
-                                main_responsive_dict[str(None)][
-                                    str(attrib)
-                                ].append(value)
-                    else:
-                        if str(None) in main_responsive_dict[str(None)]:
-                            main_responsive_dict[str(None)][str(None)].append(
-                                value
-                            )
-                        else:
-                            main_responsive_dict[str(None)][str(None)] = []
-                            main_responsive_dict[str(None)][str(None)].append(
-                                value
-                            )
-            else:
-                main_group_attribute = resolve_keys(sub_group_by, value)
-                group_attribute = resolve_keys(group_by, value)
-
-                if str(main_group_attribute) not in main_responsive_dict:
-                    main_responsive_dict[str(main_group_attribute)] = {}
-
-                if (
-                    str(group_attribute)
-                    in main_responsive_dict[str(main_group_attribute)]
-                ):
-                    main_responsive_dict[str(main_group_attribute)][
-                        str(group_attribute)
-                    ].append(value)
-                else:
-                    main_responsive_dict[str(main_group_attribute)][
-                        str(group_attribute)
-                    ] = []
-                    main_responsive_dict[str(main_group_attribute)][
-                        str(group_attribute)
-                    ].append(value)
+            groups = group_names(value)
+            for sub_group in sub_group_names(value):
+                sub_group_dict = main_responsive_dict[sub_group]
+                for group in groups:
+                    sub_group_dict[group].append(value)
 
         return main_responsive_dict
 
-    else:
-        response_dict = {}
+    response_dict = defaultdict(list)
 
-        if group_by == "priority":
-            response_dict = {
-                "urgent": [],
-                "high": [],
-                "medium": [],
-                "low": [],
-                "none": [],
-            }
+    if group_by == "priority":
+        response_dict.update({priority: [] for priority in PRIORITY_ORDER})
 
-        for value in results_data:
-            group_attribute = resolve_keys(group_by, value)
-            if isinstance(group_attribute, list):
-                if len(group_attribute):
-                    for attrib in group_attribute:
-                        if str(attrib) in response_dict:
-                            response_dict[str(attrib)].append(value)
-                        else:
-                            response_dict[str(attrib)] = []
-                            response_dict[str(attrib)].append(value)
-                else:
-                    if str(None) in response_dict:
-                        response_dict[str(None)].append(value)
-                    else:
-                        response_dict[str(None)] = []
-                        response_dict[str(None)].append(value)
-            else:
-                if str(group_attribute) in response_dict:
-                    response_dict[str(group_attribute)].append(value)
-                else:
-                    response_dict[str(group_attribute)] = []
-                    response_dict[str(group_attribute)].append(value)
-
-        return response_dict
+    for value in results_data:
+        for group in group_names(value):
+            response_dict[group].append(value)
+
+    return response_dict
+
+
+def group_queryset(
+    queryset,
+    group_by,
+    sub_group_by=False,
+    per_group=50,
+    ordering="-created_at",
+):
+    """group an issue queryset in the database
+
+    Args:
+        queryset (QuerySet): issues to group
+        group_by (key): string, one of GROUP_BY_FIELDS
+        sub_group_by (key): string, one of GROUP_BY_FIELDS
+        per_group (int): number of issue ids returned for every group
+        ordering (string): order of the issue ids inside a group
+
+    Returns:
+        obj: issue count and first issue ids of every group, keyed like
+        group_results so the remaining members can be paged on demand
+    """
+    group_field = GROUP_BY_FIELDS[group_by]
+    sub_group_field = GROUP_BY_FIELDS[sub_group_by] if sub_group_by else None
+    fields = [sub_group_field, group_field] if sub_group_by else [group_field]
+
+    # Regroup over the bare issue rows so annotations, ordering and
+    # distinct of the source queryset do not leak into the grouping
+    rows = (
+        queryset.model.objects.filter(pk__in=queryset.order_by().values("id"))
+        .values(*fields)
+        .annotate(
+            count=Count("id"),
+            issue_ids=Func(
+                ArrayAgg("id", ordering=ordering),
+                template="(%(expressions)s)[1:%(per_group)s]",
+                per_group=int(per_group),
+                output_field=ArrayField(UUIDField()),
+            ),
+        )
+        .order_by()
+    )
+
+    def empty_group():
+        return {"count": 0, "issue_ids": []}
+
+    if sub_group_by:
+        grouped = defaultdict(lambda: defaultdict(empty_group))
+        if sub_group_by == "priority":
+            grouped.update(
+                {
+                    priority: defaultdict(empty_group)
+                    for priority in PRIORITY_ORDER
+                }
+            )
+        for row in rows:
+            grouped[str(row[sub_group_field])][str(row[group_field])] = {
+                "count": row["count"],
+                "issue_ids": row["issue_ids"],
+            }
+        return grouped
+
+    grouped = defaultdict(empty_group)
+    if group_by == "priority":
+        grouped.update(
+            {priority: empty_group() for priority in PRIORITY_ORDER}
+        )
+    for row in rows:
+        grouped[str(row[group_field])] = {
+            "count": row["count"],
+            "issue_ids": row["issue_ids"],
+        }
+    return grouped
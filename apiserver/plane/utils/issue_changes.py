@@ -0,0 +1,142 @@
+# Python imports
+from heapq import merge
+from itertools import islice
+from uuid import UUID
+
+# Django imports
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+# Module imports
+from plane.db.models import Issue
+from plane.utils.paginator import KeysetCursor
+
+ISSUE_CHANGES_LIMIT = 500
+ISSUE_CHANGES_MAX_LIMIT = 1000
+
+
+def parse_changes_cursor(value):
+    """
+    (change_xid, id, issued_at) position of a delta sync cursor, None
+    without one. Cursors of the former updated_at sequence can not be
+    continued and come back without an issued_at
+    """
+    if not value:
+        return None
+    values = KeysetCursor.from_string(value).values
+    if len(values) == 2:
+        return 0, None, None
+    if len(values) != 3:
+        raise ValueError("Invalid cursor format")
+    issued_at = parse_datetime(str(values[2]))
+    if issued_at is None or timezone.is_naive(issued_at):
+        raise ValueError("Invalid cursor format")
+    change_xid = int(str(values[0]))
+    return change_xid, UUID(str(values[1])) if values[1] else None, issued_at
+
+
+def changes_cursor(change_xid, pk=None, issued_at=None):
+    issued_at = issued_at or timezone.now()
+    return str(
+        KeysetCursor(
+            [change_xid, str(pk) if pk else None, issued_at.isoformat()]
+        )
+    )
+
+
+def settled_change_xid():
+    """
+    Oldest transaction still running, every transaction below it has
+    finished so no change can show up behind a cursor taken before it.
+    A long running transaction holds the delta syncs back until it ends
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+        )
+        return cursor.fetchone()[0]
+
+
+def changed_after(since, key):
+    change_xid, pk, _ = since
+    if pk is None:
+        return Q(change_xid__gt=change_xid)
+    return Q(change_xid__gt=change_xid) | Q(
+        change_xid=change_xid, **{f"{key}__gt": pk}
+    )
+
+
+def merge_changes(issues, tombstones, limit):
+    """
+    Interleave the changed issues and the tombstones, both ordered on
+    (change_xid, id), and keep the first limit changes of the sequence
+
+    Returns:
+        tuple: the kept (change_xid, id, issue) changes, issue being None
+        for tombstones, and whether more changes follow
+    """
+    changes = list(
+        islice(
+            merge(
+                ((issue.change_xid, issue.id, issue) for issue in issues),
+                (
+                    (change_xid, issue_id, None)
+                    for change_xid, issue_id in tombstones
+                ),
+                key=lambda change: change[:2],
+            ),
+            limit + 1,
+        )
+    )
+    return changes[:limit], len(changes) > limit
+
+
+def issue_changes(issues, tombstones, since=None, limit=ISSUE_CHANGES_LIMIT):
+    """
+    Issues upserted and removed after a cursor, in the order of the
+    (change_xid, id) change sequence. Only the changes of finished
+    transactions are returned, so the sequence never moves past a change
+    that commits later
+
+    Args:
+        issues (queryset): issues of the list to sync
+        tombstones (queryset): tombstones of the same project
+        since (tuple): parsed cursor, None to fetch the whole list
+        limit (int): maximum number of changes returned
+
+    Returns:
+        tuple: upserted issues, removed issue ids, the cursor to continue
+        from and whether more changes follow
+    """
+    settled = settled_change_xid()
+    issues = issues.filter(change_xid__lt=settled)
+    tombstones = tombstones.filter(change_xid__lt=settled)
+    if since is not None:
+        issues = issues.filter(changed_after(since, "id"))
+        tombstones = tombstones.filter(changed_after(since, "issue_id"))
+    else:
+        # Nothing was synced yet, so there is nothing to remove
+        tombstones = tombstones.none()
+
+    changes, has_more = merge_changes(
+        issues.order_by("change_xid", "id")[: limit + 1],
+        tombstones.order_by("change_xid", "issue_id").values_list(
+            "change_xid", "issue_id"
+        )[: limit + 1],
+        limit,
+    )
+
+    upserted = [issue for _, _, issue in changes if issue is not None]
+    removed = {issue_id for _, issue_id, issue in changes if issue is None}
+    # Issues restored after their removal are in the list again
+    removed -= set(
+        Issue.issue_objects.filter(pk__in=removed).values_list("id", flat=True)
+    )
+
+    if has_more:
+        cursor = changes_cursor(*changes[-1][:2])
+    else:
+        cursor = changes_cursor(settled - 1)
+    return upserted, [str(issue_id) for issue_id in removed], cursor, has_more
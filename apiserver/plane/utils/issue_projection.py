@@ -0,0 +1,148 @@
+# Django imports
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import OuterRef, Subquery
+
+# Third party imports
+from rest_framework import serializers
+
+# Module imports
+from plane.db.models import IssueAssignee, IssueLabel, ModuleIssue
+
+# Output name -> column of the fields read as they are
+ISSUE_PROJECTION_COLUMNS = {
+    "id": "id",
+    "name": "name",
+    "state_id": "state_id",
+    "sort_order": "sort_order",
+    "estimate_point": "estimate_point",
+    "priority": "priority",
+    "sequence_id": "sequence_id",
+    "project_id": "project_id",
+    "parent_id": "parent_id",
+    "cycle_id": "cycle_id",
+    "sub_issues_count": "sub_issues_count",
+    "created_by": "created_by_id",
+    "updated_by": "updated_by_id",
+    "attachment_count": "attachment_count",
+    "link_count": "link_count",
+    "is_draft": "is_draft",
+}
+
+# Formatted the way the IssueSerializer fields render them
+ISSUE_PROJECTION_FORMATS = {
+    "completed_at": serializers.DateTimeField().to_representation,
+    "start_date": serializers.DateField().to_representation,
+    "target_date": serializers.DateField().to_representation,
+    "created_at": serializers.DateTimeField().to_representation,
+    "updated_at": serializers.DateTimeField().to_representation,
+    "archived_at": serializers.DateField().to_representation,
+}
+
+# Keys of the IssueSerializer output, in its order
+ISSUE_PROJECTION_FIELDS = [
+    "id",
+    "name",
+    "state_id",
+    "sort_order",
+    "completed_at",
+    "estimate_point",
+    "priority",
+    "start_date",
+    "target_date",
+    "sequence_id",
+    "project_id",
+    "parent_id",
+    "cycle_id",
+    "module_ids",
+    "label_ids",
+    "assignee_ids",
+    "sub_issues_count",
+    "created_at",
+    "updated_at",
+    "created_by",
+    "updated_by",
+    "attachment_count",
+    "link_count",
+    "is_subscribed",
+    "is_draft",
+    "archived_at",
+]
+
+
+def related_ids(model, column, ordering):
+    # Aggregated in a subquery so that filters joining the same relation
+    # on the outer query do not narrow down the ids
+    return Subquery(
+        model.objects.filter(issue_id=OuterRef("id"))
+        .order_by()
+        .values("issue_id")
+        .annotate(ids=ArrayAgg(column, ordering=ordering))
+        .values("ids")
+    )
+
+
+def issue_values(queryset, *keys):
+    """
+    Rows of the issue queryset with the columns of the IssueSerializer
+    output, the label, assignee and module ids are aggregated in the same
+    statement instead of being prefetched
+
+    Args:
+        queryset (queryset): issues, cycle_id and is_subscribed are read
+        when annotated on it
+        keys (string): extra columns kept on the rows, eg: the ordering
+        keys of a keyset paginator
+
+    Returns:
+        queryset: values queryset to be passed through issue_rows
+    """
+    annotations = queryset.query.annotations
+    columns = [
+        column
+        for name, column in ISSUE_PROJECTION_COLUMNS.items()
+        if name != "cycle_id" or "cycle_id" in annotations
+    ]
+    if "is_subscribed" in annotations:
+        columns.append("is_subscribed")
+    keys = [
+        key
+        for key in keys
+        if key not in columns and key not in ISSUE_PROJECTION_FORMATS
+    ]
+    return queryset.prefetch_related(None).values(
+        *columns,
+        *ISSUE_PROJECTION_FORMATS,
+        *keys,
+        # Ordered the way the prefetched relations of the serializer are
+        label_ids=related_ids(IssueLabel, "label_id", "-label__created_at"),
+        assignee_ids=related_ids(
+            IssueAssignee, "assignee_id", "-assignee__created_at"
+        ),
+        module_ids=related_ids(ModuleIssue, "module_id", "-created_at"),
+    )
+
+
+def issue_rows(rows):
+    """Dicts in the output shape of the IssueSerializer from issue_values"""
+    results = []
+    for row in rows:
+        result = {}
+        for name in ISSUE_PROJECTION_FIELDS:
+            if name in ISSUE_PROJECTION_COLUMNS:
+                column = ISSUE_PROJECTION_COLUMNS[name]
+                if column in row:
+                    result[name] = row[column]
+            elif name in ISSUE_PROJECTION_FORMATS:
+                value = row[name]
+                result[name] = (
+                    None
+                    if value is None
+                    else ISSUE_PROJECTION_FORMATS[name](value)
+                )
+            elif name.endswith("_ids"):
+                # Issues without relations get NULL from the subqueries
+                result[name] = row[name] or []
+            elif name in row:
+                result[name] = row[name]
+        results.append(result)
+    return results
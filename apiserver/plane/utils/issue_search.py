@@ -2,10 +2,24 @@
 import re
 
 # Django imports
+from django.contrib.postgres.search import SearchQuery
 from django.db.models import Q
 
 # Module imports
-from plane.db.models import Issue
+from plane.db.models import Issue, SearchDocument
+from plane.db.models.search import SEARCH_CONFIG
+
+
+def build_search_query(query):
+    """Prefix match every word of the query for as-you-type search"""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
 
 
 def search_issues(query, queryset):
@@ -17,7 +31,15 @@ def search_issues(query, queryset):
             for sequence_id in sequences:
                 q |= Q(**{"sequence_id": sequence_id})
         else:
-            q |= Q(**{f"{field}__icontains": query})
+            documents = Q(name__icontains=query)
+            search_query = build_search_query(query)
+            if search_query is not None:
+                documents |= Q(search_vector=search_query)
+            q |= Q(
+                pk__in=SearchDocument.objects.filter(
+                    documents, entity_type="issue"
+                ).values("entity_identifier")
+            )
     return queryset.filter(
         q,
     ).distinct()
@@ -0,0 +1,130 @@
+# Python imports
+import hashlib
+import json
+
+# Django imports
+from django.db.models import Count, FilteredRelation, Q
+
+# Third party imports
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.db.models import Issue, Workspace
+from plane.db.models.analytic import issue_stats_version_key
+from plane.settings.redis import redis_instance
+
+# Stats are dropped on issue writes, the timeout bounds what bulk updates
+# that bypass the signals can leave behind
+ISSUE_STATS_CACHE_TIMEOUT = 300
+
+STATE_GROUPS = ["backlog", "unstarted", "started", "completed", "cancelled"]
+PRIORITIES = ["urgent", "high", "medium", "low", "none"]
+
+
+def compute_issue_stats(slug, user_id, member_id, filters, active_only):
+    membership = {"project__project_projectmember__member_id": member_id}
+    if active_only:
+        membership["project__project_projectmember__is_active"] = True
+
+    issues = (
+        Issue.issue_objects.filter(workspace__slug=slug, **membership).filter(
+            **filters
+        )
+        # At most one row each as the relations are unique per user
+        .annotate(
+            user_assignee=FilteredRelation(
+                "issue_assignee",
+                condition=Q(issue_assignee__assignee_id=user_id),
+            ),
+            user_subscriber=FilteredRelation(
+                "issue_subscribers",
+                condition=Q(issue_subscribers__subscriber_id=user_id),
+            ),
+        )
+    )
+    assigned = Q(user_assignee__isnull=False)
+    aggregates = {
+        "assigned": assigned,
+        "pending": assigned & ~Q(state__group__in=["completed", "cancelled"]),
+        "completed": assigned & Q(state__group="completed"),
+        "created": Q(created_by_id=user_id),
+        "subscribed": Q(user_subscriber__isnull=False),
+    }
+    aggregates.update(
+        {
+            f"state_{group}": assigned & Q(state__group=group)
+            for group in STATE_GROUPS
+        }
+    )
+    aggregates.update(
+        {
+            f"priority_{priority}": assigned & Q(priority=priority)
+            for priority in PRIORITIES
+        }
+    )
+    counts = issues.aggregate(
+        **{
+            name: Count("id", filter=condition, distinct=True)
+            for name, condition in aggregates.items()
+        }
+    )
+
+    return {
+        "assigned": counts["assigned"],
+        "pending": counts["pending"],
+        "completed": counts["completed"],
+        "created": counts["created"],
+        "subscribed": counts["subscribed"],
+        "state_groups": {
+            group: counts[f"state_{group}"] for group in STATE_GROUPS
+        },
+        "priorities": {
+            priority: counts[f"priority_{priority}"] for priority in PRIORITIES
+        },
+    }
+
+
+def get_issue_stats(slug, user_id, member_id, filters=None, active_only=False):
+    """
+    Issue counts of a user in a workspace computed in a single query
+
+    Args:
+        slug (string): workspace slug
+        user_id (uuid): user the issues are assigned to or created by
+        member_id (uuid): user whose project memberships scope the issues
+        filters (dict): issue filters from issue_filters
+        active_only (bool): only count the projects member_id is active in
+
+    Returns:
+        dict: assigned, pending, completed, created and subscribed counts
+        with the assigned issues split by state group and priority
+    """
+    filters = filters or {}
+    try:
+        workspace_id = Workspace.objects.values_list("id", flat=True).get(
+            slug=slug
+        )
+        ri = redis_instance()
+        version = int(ri.get(issue_stats_version_key(workspace_id)) or 0)
+        filter_hash = hashlib.md5(
+            json.dumps(filters, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        key = (
+            f"issue_stats:{workspace_id}:{version}:{user_id}:{member_id}:"
+            f"{int(active_only)}:{filter_hash}"
+        )
+        cached = ri.get(key)
+        if cached is not None:
+            return json.loads(cached)
+    except Exception as e:
+        capture_exception(e)
+        return compute_issue_stats(
+            slug, user_id, member_id, filters, active_only
+        )
+
+    stats = compute_issue_stats(slug, user_id, member_id, filters, active_only)
+    try:
+        ri.set(key, json.dumps(stats), ex=ISSUE_STATS_CACHE_TIMEOUT)
+    except Exception as e:
+        capture_exception(e)
+    return stats
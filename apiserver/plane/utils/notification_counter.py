@@ -0,0 +1,197 @@
+# Python imports
+from collections import defaultdict
+
+# Third party imports
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.db.models import (
+    Issue,
+    IssueAssignee,
+    IssueSubscriber,
+    Notification,
+)
+from plane.settings.redis import redis_instance
+from plane.utils.realtime import publish_unread_counters
+
+# Counters are rebuilt from the database at least this often (seconds) to
+# pick up subscription and assignment changes made after a notification
+UNREAD_COUNTER_TIMEOUT = 300
+
+UNREAD_COUNTER_FIELDS = ("watching_issues", "my_issues", "created_issues")
+
+
+def unread_counter_key(slug, user_id):
+    return f"notification:unread:{slug}:{user_id}"
+
+
+def count_unread_notifications(slug, user_id):
+    """Count the unread notifications of a user from the database"""
+    notifications = Notification.objects.filter(
+        workspace__slug=slug,
+        receiver_id=user_id,
+        read_at__isnull=True,
+        archived_at__isnull=True,
+    )
+    return {
+        "watching_issues": notifications.filter(
+            entity_identifier__in=IssueSubscriber.objects.filter(
+                workspace__slug=slug, subscriber_id=user_id
+            ).values_list("issue_id", flat=True),
+        ).count(),
+        "my_issues": notifications.filter(
+            entity_identifier__in=IssueAssignee.objects.filter(
+                workspace__slug=slug, assignee_id=user_id
+            ).values_list("issue_id", flat=True),
+        ).count(),
+        "created_issues": notifications.filter(
+            entity_identifier__in=Issue.objects.filter(
+                workspace__slug=slug, created_by_id=user_id
+            ).values_list("pk", flat=True),
+        ).count(),
+    }
+
+
+def get_unread_counters(slug, user_id):
+    """
+    Unread notification counters of a user in a workspace, served from
+    redis and rebuilt from the database on a miss
+    """
+    key = unread_counter_key(slug, user_id)
+    try:
+        ri = redis_instance()
+        counters = ri.hgetall(key)
+        # A counter incremented after the hash expired leaves it partial
+        if all(field.encode() in counters for field in UNREAD_COUNTER_FIELDS):
+            return {
+                field: max(int(counters[field.encode()]), 0)
+                for field in UNREAD_COUNTER_FIELDS
+            }
+    except Exception as e:
+        capture_exception(e)
+        return count_unread_notifications(slug, user_id)
+
+    counters = count_unread_notifications(slug, user_id)
+    try:
+        pipeline = ri.pipeline()
+        pipeline.delete(key)
+        pipeline.hset(key, mapping=counters)
+        pipeline.expire(key, UNREAD_COUNTER_TIMEOUT)
+        pipeline.execute()
+    except Exception as e:
+        capture_exception(e)
+    return counters
+
+
+def as_members(rows):
+    return {(str(user_id), str(issue_id)) for user_id, issue_id in rows}
+
+
+def update_unread_counters(slug, notifications, delta):
+    """
+    Move the unread counters of the receivers of the notifications by delta
+    for every counter the notification issue belongs to
+
+    Args:
+        slug (string): workspace slug
+        notifications (list): (receiver_id, entity_identifier) pairs
+        delta (int): 1 when the notifications became unread, -1 otherwise
+    """
+    entities = defaultdict(list)
+    for receiver_id, entity_identifier in notifications:
+        if entity_identifier is not None:
+            entities[str(receiver_id)].append(str(entity_identifier))
+    if not entities:
+        return
+
+    ri = redis_instance()
+    try:
+        keys = {
+            receiver_id: unread_counter_key(slug, receiver_id)
+            for receiver_id in entities
+        }
+        # Counters that are not cached are rebuilt on the next read
+        pipeline = ri.pipeline()
+        for key in keys.values():
+            pipeline.exists(key)
+        cached = {
+            receiver_id
+            for receiver_id, exists in zip(keys, pipeline.execute())
+            if exists
+        }
+        if not cached:
+            publish_unread_counters(slug, dict.fromkeys(entities))
+            return
+
+        issue_ids = {
+            issue_id
+            for receiver_id in cached
+            for issue_id in entities[receiver_id]
+        }
+        watching = as_members(
+            IssueSubscriber.objects.filter(
+                subscriber_id__in=cached, issue_id__in=issue_ids
+            ).values_list("subscriber_id", "issue_id")
+        )
+        assigned = as_members(
+            IssueAssignee.objects.filter(
+                assignee_id__in=cached, issue_id__in=issue_ids
+            ).values_list("assignee_id", "issue_id")
+        )
+        created = as_members(
+            Issue.objects.filter(
+                created_by_id__in=cached, pk__in=issue_ids
+            ).values_list("created_by_id", "id")
+        )
+
+        pipeline = ri.pipeline()
+        for receiver_id in cached:
+            increments = defaultdict(int)
+            for issue_id in entities[receiver_id]:
+                member = (receiver_id, issue_id)
+                if member in watching:
+                    increments["watching_issues"] += delta
+                if member in assigned:
+                    increments["my_issues"] += delta
+                if member in created:
+                    increments["created_issues"] += delta
+            for field, amount in increments.items():
+                pipeline.hincrby(keys[receiver_id], field, amount)
+        pipeline.execute()
+
+        pipeline = ri.pipeline()
+        for receiver_id in cached:
+            pipeline.hgetall(keys[receiver_id])
+        counters = dict.fromkeys(entities)
+        for receiver_id, values in zip(cached, pipeline.execute()):
+            # A hash that expired in between is rebuilt on the next read
+            if all(
+                field.encode() in values for field in UNREAD_COUNTER_FIELDS
+            ):
+                counters[receiver_id] = {
+                    field: max(int(values[field.encode()]), 0)
+                    for field in UNREAD_COUNTER_FIELDS
+                }
+        publish_unread_counters(slug, counters)
+    except Exception as e:
+        capture_exception(e)
+        # Drop the counters so they are rebuilt instead of drifting
+        try:
+            ri.delete(
+                *[
+                    unread_counter_key(slug, receiver_id)
+                    for receiver_id in entities
+                ]
+            )
+        except Exception as e:
+            capture_exception(e)
+        publish_unread_counters(slug, dict.fromkeys(entities))
+
+
+def reset_unread_counters(slug, user_id):
+    """Drop the cached counters so the next read rebuilds them"""
+    try:
+        redis_instance().delete(unread_counter_key(slug, user_id))
+    except Exception as e:
+        capture_exception(e)
+    publish_unread_counters(slug, {str(user_id): None})
@@ -1,7 +1,23 @@
+# Python imports
+import base64
+import hashlib
+import json
+import math
+from collections.abc import Sequence
+
+# Django imports
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
+
+# Third party imports
 from rest_framework.response import Response
 from rest_framework.exceptions import ParseError
-from collections.abc import Sequence
-import math
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.settings.redis import redis_instance
 
 
 class Cursor:
@@ -41,6 +57,53 @@ class Cursor:
             raise ValueError(f"Invalid cursor format: {e}")
 
 
+class KeysetCursor:
+    """
+    Opaque cursor holding the ordering values of the boundary row of a page.
+    The values are serialized as url safe base64 encoded json so the client
+    never has to know about the ordering keys.
+    """
+
+    def __init__(self, values=None, is_prev=False, has_results=None):
+        self.values = values
+        self.is_prev = bool(is_prev)
+        self.has_results = has_results
+
+    def __str__(self):
+        if self.values is None:
+            return ""
+        data = json.dumps(
+            {"v": self.values, "p": int(self.is_prev)},
+            cls=DjangoJSONEncoder,
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def __eq__(self, other):
+        return all(
+            getattr(self, attr) == getattr(other, attr)
+            for attr in ("values", "is_prev", "has_results")
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}: values={self.values} is_prev={int(self.is_prev)}"
+
+    def __bool__(self):
+        return bool(self.has_results)
+
+    @classmethod
+    def from_string(cls, value):
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = data["v"]
+            if not isinstance(values, list):
+                raise ValueError("Cursor values must be a list")
+            return cls(values, bool(int(data.get("p", 0))))
+        except (TypeError, ValueError, KeyError) as e:
+            raise ValueError(f"Invalid cursor format: {e}")
+
+
 class CursorResult(Sequence):
     def __init__(self, results, next, prev, hits=None, max_hits=None):
         self.results = results
@@ -64,6 +127,76 @@ class CursorResult(Sequence):
 
 MAX_LIMIT = 100
 
+# Total counts are cached for this many seconds, the cache is keyed on
+# versions the writes bump so it is invalidated before that
+COUNT_CACHE_TIMEOUT = 300
+
+# Unfiltered tables above this size use the planner estimate
+ESTIMATE_COUNT_THRESHOLD = 100000
+
+
+def estimate_count(queryset):
+    """Return the planner row estimate for an unfiltered table"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else -1
+
+
+def get_count(queryset, version_keys=None):
+    """
+    Return the total count of the queryset, using the table estimate for
+    large unfiltered scans
+
+    Args:
+        queryset (queryset): rows to count
+        version_keys (list): redis keys of versions bumped by every write
+        that can change the count, across all the tables the queryset
+        reads. The count is only cached with them
+    """
+    query = queryset.query
+    if not query.where and not query.distinct:
+        estimate = estimate_count(queryset)
+        if estimate >= ESTIMATE_COUNT_THRESHOLD:
+            return estimate
+
+    if not version_keys:
+        return queryset.count()
+
+    try:
+        ri = redis_instance()
+        versions = ri.mget(version_keys)
+        if None in versions:
+            # Nothing bumped the version yet, the count can not be keyed
+            return queryset.count()
+        digest = hashlib.sha1(
+            str(queryset.order_by().query).encode()
+        ).hexdigest()
+        key = ":".join(
+            [
+                "paginator:count",
+                queryset.model._meta.db_table,
+                *(version.decode() for version in versions),
+                digest,
+            ]
+        )
+        count = ri.get(key)
+        if count is not None:
+            return int(count)
+    except Exception as e:
+        capture_exception(e)
+        return queryset.count()
+
+    count = queryset.count()
+    try:
+        ri.set(key, count, ex=COUNT_CACHE_TIMEOUT)
+    except Exception as e:
+        capture_exception(e)
+    return count
+
 
 class BadPaginationError(Exception):
     pass
@@ -84,6 +217,7 @@ class OffsetPaginator:
         max_limit=MAX_LIMIT,
         max_offset=None,
         on_results=None,
+        count_version_keys=None,
     ):
         self.key = (
             order_by
@@ -94,6 +228,7 @@ class OffsetPaginator:
         self.max_limit = max_limit
         self.max_offset = max_offset
         self.on_results = on_results
+        self.count_version_keys = count_version_keys
 
     def get_result(self, limit=100, cursor=None):
         # offset is page #
@@ -123,13 +258,17 @@ class OffsetPaginator:
         next_cursor = Cursor(limit, page + 1, False, len(results) > limit)
         prev_cursor = Cursor(limit, page - 1, True, page > 0)
 
+        # The first page already tells the count when it is not full
+        if page == 0 and len(results) <= limit:
+            count = len(results)
+        else:
+            count = get_count(queryset, self.count_version_keys)
+        max_hits = math.ceil(count / limit)
+
         results = list(results[:limit])
         if self.on_results:
             results = self.on_results(results)
 
-        count = queryset.count()
-        max_hits = math.ceil(count / limit)
-
         return CursorResult(
             results=results,
             next=next_cursor,
@@ -139,6 +278,136 @@ class OffsetPaginator:
         )
 
 
+class KeysetPaginator:
+    """
+    The Keyset (seek) paginator orders the queryset on the given keys plus
+    the primary key as a tie breaker and continues from the values of the
+    boundary row instead of using an OFFSET, so every page costs the same
+    http://example.com/api/issues/?per_page=100&cursor=<opaque>
+    Keys can be model fields, related lookups or annotations already present
+    on the queryset (eg: priority_order, state_order)
+    """
+
+    def __init__(
+        self,
+        queryset,
+        order_by=None,
+        max_limit=MAX_LIMIT,
+        on_results=None,
+        count_version_keys=None,
+    ):
+        keys = (
+            list(order_by)
+            if isinstance(order_by, (list, tuple))
+            else [order_by or "-created_at"]
+        )
+        # Always end with the primary key so the ordering is total
+        if keys[-1].lstrip("-") not in ("id", "pk"):
+            keys.append("-id" if keys[-1].startswith("-") else "id")
+        self.keys = [(key.lstrip("-"), key.startswith("-")) for key in keys]
+        self.queryset = queryset
+        self.max_limit = max_limit
+        self.on_results = on_results
+        self.count_version_keys = count_version_keys
+
+    def _order_by(self, reverse=False):
+        ordering = []
+        for field, desc in self.keys:
+            desc = desc != reverse
+            ordering.append(
+                F(field).desc(nulls_first=True)
+                if desc
+                else F(field).asc(nulls_last=True)
+            )
+        return ordering
+
+    def _seek(self, values, reverse=False):
+        # Builds (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... honouring the
+        # postgres null ordering (nulls last ascending, first descending)
+        condition = Q()
+        equal = Q()
+        for (field, desc), value in zip(self.keys, values):
+            desc = desc != reverse
+            if value is None:
+                after = Q(**{f"{field}__isnull": False}) if desc else None
+                same = Q(**{f"{field}__isnull": True})
+            else:
+                lookup = "lt" if desc else "gt"
+                after = Q(**{f"{field}__{lookup}": value})
+                if not desc:
+                    after |= Q(**{f"{field}__isnull": True})
+                same = Q(**{field: value})
+
+            if after is not None:
+                condition |= equal & after
+            equal &= same
+        return condition
+
+    def _values(self, row):
+        values = []
+        for field, _ in self.keys:
+            if isinstance(row, dict):
+                # Rows of values querysets carry the keys as columns
+                value = row.get(field)
+            else:
+                value = row
+                for attr in field.split("__"):
+                    value = getattr(value, attr, None) if value is not None else None
+            values.append(getattr(value, "pk", value))
+        return json.loads(json.dumps(values, cls=DjangoJSONEncoder))
+
+    def get_result(self, limit=100, cursor=None):
+        if cursor is None:
+            cursor = KeysetCursor()
+
+        limit = min(limit, self.max_limit)
+        if cursor.values is not None and len(cursor.values) != len(self.keys):
+            raise BadPaginationError("Cursor does not match the ordering")
+
+        queryset = self.queryset.order_by(*self._order_by(cursor.is_prev))
+        if cursor.values is not None:
+            queryset = queryset.filter(
+                self._seek(cursor.values, cursor.is_prev)
+            )
+
+        results = list(queryset[: limit + 1])
+        has_more = len(results) > limit
+        results = results[:limit]
+        if cursor.is_prev:
+            results.reverse()
+
+        if results:
+            next_cursor = KeysetCursor(
+                self._values(results[-1]),
+                False,
+                has_more if not cursor.is_prev else True,
+            )
+            prev_cursor = KeysetCursor(
+                self._values(results[0]),
+                True,
+                has_more if cursor.is_prev else cursor.values is not None,
+            )
+        else:
+            next_cursor = KeysetCursor(cursor.values, False, False)
+            prev_cursor = KeysetCursor(cursor.values, True, False)
+
+        if cursor.values is None and not has_more:
+            count = len(results)
+        else:
+            count = get_count(self.queryset, self.count_version_keys)
+
+        if self.on_results:
+            results = self.on_results(results)
+
+        return CursorResult(
+            results=results,
+            next=next_cursor,
+            prev=prev_cursor,
+            hits=None,
+            max_hits=math.ceil(count / limit),
+        )
+
+
 class BasePaginator:
     """BasePaginator class can be inherited by any View to return a paginated view"""
 
@@ -152,6 +421,9 @@ class BasePaginator:
         except ValueError:
             raise ParseError(detail="Invalid per_page parameter.")
 
+        if per_page < 1:
+            raise ParseError(detail="Invalid per_page value.")
+
         max_per_page = max(max_per_page, default_per_page)
         if per_page > max_per_page:
             raise ParseError(
@@ -160,6 +432,33 @@ class BasePaginator:
 
         return per_page
 
+    def stream(
+        self,
+        queryset,
+        on_results=None,
+        chunk_size=500,
+    ):
+        """Stream the queryset as newline delimited json in chunks"""
+
+        def generate():
+            chunk = []
+            for row in queryset.iterator(chunk_size=chunk_size):
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    yield from self._stream_chunk(chunk, on_results)
+                    chunk = []
+            if chunk:
+                yield from self._stream_chunk(chunk, on_results)
+
+        return StreamingHttpResponse(
+            generate(), content_type="application/x-ndjson"
+        )
+
+    def _stream_chunk(self, chunk, on_results):
+        results = on_results(chunk) if on_results else chunk
+        for result in results:
+            yield json.dumps(result, cls=DjangoJSONEncoder) + "\n"
+
     def paginate(
         self,
         request,
@@ -0,0 +1,121 @@
+# Python imports
+from collections import defaultdict
+
+# Third party imports
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from sentry_sdk import capture_exception
+
+# Module imports
+from plane.utils.etag import issue_versions
+
+
+def issue_group(project_id):
+    return f"issues.{project_id}"
+
+
+def notification_group(user_id):
+    return f"notifications.{user_id}"
+
+
+async def send_to_groups(channel_layer, messages):
+    for group, message in messages:
+        await channel_layer.group_send(group, message)
+
+
+def publish(messages):
+    """Send (group, message) pairs to the websocket consumers"""
+    if not messages:
+        return
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is not None:
+            async_to_sync(send_to_groups)(channel_layer, messages)
+    except Exception as e:
+        capture_exception(e)
+
+
+def activity_changes(type, issue_id, project_id, issue_activities):
+    """
+    Compact change events of the issues an activity event touched
+
+    Returns:
+        list: issue id, project id, changed fields and whether the issue
+        was deleted for every issue of the activities
+    """
+    fields = defaultdict(set)
+    if issue_id is not None:
+        fields.setdefault(str(issue_id), set())
+    for issue_activity in issue_activities:
+        # The activity of a deleted issue has no issue left to point to
+        target = issue_activity.issue_id or issue_id
+        if target is None:
+            continue
+        changed = fields[str(target)]
+        if issue_activity.field:
+            changed.add(issue_activity.field)
+    return [
+        {
+            "issue_id": target,
+            "project_id": str(project_id),
+            "fields": sorted(changed),
+            "deleted": (
+                type == "issue.activity.deleted" and target == str(issue_id)
+            ),
+        }
+        for target, changed in fields.items()
+    ]
+
+
+def publish_issue_changes(changes):
+    """
+    Push issue change events to the subscribers of their projects along
+    with the new issue data version the list ETags are derived from
+    """
+    if not changes:
+        return
+    project_ids = sorted({change["project_id"] for change in changes})
+    try:
+        versions = dict(zip(project_ids, issue_versions(project_ids)))
+    except Exception as e:
+        capture_exception(e)
+        versions = {}
+    publish(
+        [
+            (
+                issue_group(change["project_id"]),
+                {
+                    "type": "issue.change",
+                    "change": {
+                        **change,
+                        "version": versions.get(change["project_id"]),
+                    },
+                },
+            )
+            for change in changes
+        ]
+    )
+
+
+def publish_unread_counters(slug, counters):
+    """
+    Push unread notification counters to their users, a user mapped to
+    None has to fetch the counters again
+
+    Args:
+        slug (string): workspace slug
+        counters (dict): user id -> counters or None
+    """
+    publish(
+        [
+            (
+                notification_group(user_id),
+                {
+                    "type": "notification.unread",
+                    "workspace": slug,
+                    "counters": user_counters,
+                },
+            )
+            for user_id, user_counters in counters.items()
+        ]
+    )